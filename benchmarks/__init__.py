@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: benchmarks/__init__.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Benchmark package: standalone scripts that measure throughput and memory.
+
+Usage:
+python -m benchmarks.bench_streaming --rows 10000 1000000
+
+Notes:
+- Not collected by pytest; run the modules directly.
+===========================================================================
+"""
+# Empty init to make benchmarks a package.
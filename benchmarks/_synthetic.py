@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: benchmarks/_synthetic.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Synthetic tweets/pages and a peak-memory helper shared by the benchmarks.
+
+Usage:
+from benchmarks._synthetic import fake_pages, measure
+
+Notes:
+- Fake tweets mimic the attributes `flatten_tweets` reads from tweepy.Tweet.
+===========================================================================
+"""
+from __future__ import annotations
+
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Callable, Iterator
+
+LANGS = ("en", "en", "en", "es", "fr", "de", "ja", "pt")
+WORDS = "python data tweepy pandas stream api search recent export batch token".split()
+
+
+def fake_tweet(i: int, rng: random.Random, base: datetime) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=10**18 + i,
+        created_at=base - timedelta(seconds=i),
+        text=" ".join(rng.choices(WORDS, k=rng.randint(5, 30))),
+        author_id=rng.randint(1, 50_000),
+        public_metrics={
+            "like_count": rng.randint(0, 500),
+            "retweet_count": rng.randint(0, 100),
+            "reply_count": rng.randint(0, 50),
+            "quote_count": rng.randint(0, 10),
+        },
+        lang=rng.choice(LANGS),
+        conversation_id=10**18 + i - rng.randint(0, 5),
+    )
+
+
+def fake_pages(total: int, page_size: int = 100, seed: int = 7) -> Iterator[SimpleNamespace]:
+    """Yield Tweepy-like pages (`.data`, `.includes`) totalling `total` tweets."""
+    rng = random.Random(seed)
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for start in range(0, total, page_size):
+        stop = min(start + page_size, total)
+        yield SimpleNamespace(
+            data=[fake_tweet(i, rng, base) for i in range(start, stop)],
+            includes={},
+            meta={},
+        )
+
+
+def measure(fn: Callable[[], object]) -> tuple[float, int]:
+    """Run `fn` and return (elapsed seconds, peak traced bytes)."""
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    try:
+        fn()
+        elapsed = time.perf_counter() - t0
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return elapsed, peak
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: benchmarks/bench_aggregate.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Streaming rollups vs. the usual post-run pass: write CSV, reload it in pandas, group by.
+
+Usage:
+python -m benchmarks.bench_aggregate --rows 1000000
+python -m benchmarks.bench_aggregate --rows 200000 --bucket minute
+
+Notes:
+- "csv + pandas" writes the rows, then reads the whole file back and computes the
+  same hourly/lang/author rollups (exact top authors and nunique).
+- "csv + --aggregate" writes the same CSV with the summary built while writing;
+  "--aggregate-only" skips the rows entirely.
+- Each method runs twice: once timed, once under tracemalloc for its peak memory.
+===========================================================================
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from twitter_extractor.aggregate import AggregatingSink, Rollup
+from twitter_extractor.io_utils import open_sink
+from twitter_extractor.utils import flatten_tweets
+
+from ._synthetic import fake_pages, measure
+
+BUCKET_FREQ = {"minute": "min", "hour": "h", "day": "D"}
+
+
+def write_csv(batches, path: Path) -> None:
+    with open_sink(path) as sink:
+        for batch in batches:
+            sink.write(batch)
+
+
+def pandas_rollups(path: Path, bucket: str) -> None:
+    df = pd.read_csv(path, parse_dates=["created_at"], dtype={"author_id": str})
+    metrics = ["like_count", "retweet_count", "reply_count", "quote_count"]
+    buckets = df.groupby(df["created_at"].dt.floor(BUCKET_FREQ[bucket]))
+    buckets[metrics].sum().join(buckets["author_id"].nunique())
+    df.groupby("lang", dropna=False)[metrics].agg(["size", "sum"])
+    df.groupby("author_id")[metrics].sum().assign(
+        tweets=df.groupby("author_id").size()
+    ).nlargest(20, "tweets")
+    df["author_id"].nunique()
+
+
+def aggregate(batches, sink, summary: Path, bucket: str) -> None:
+    with AggregatingSink(sink, summary, rollup=Rollup(bucket=bucket)) as agg:
+        for batch in batches:
+            agg.write(batch)
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Streaming aggregation vs. pandas reload benchmark")
+    p.add_argument("--rows", type=int, default=1_000_000)
+    p.add_argument("--bucket", choices=sorted(BUCKET_FREQ), default="hour")
+    args = p.parse_args()
+
+    batches = [
+        flatten_tweets(page.data, as_batch=True) for page in fake_pages(args.rows, page_size=1000)
+    ]
+
+    print(f"{args.rows:,} rows, {args.bucket} buckets")
+    print(f"{'method':<22}{'seconds':>9}{'rows/s':>12}{'peak MiB':>10}")
+
+    def report(name: str, fn) -> None:
+        t0 = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - t0
+        _, peak = measure(fn)  # a second, traced run for memory only
+        print(f"{name:<22}{elapsed:>9.2f}{args.rows / elapsed:>12,.0f}{peak / 2**20:>10.1f}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out, summary = Path(tmp) / "t.csv", Path(tmp) / "summary.json"
+        report("csv only", lambda: write_csv(batches, out))
+        report("csv + pandas", lambda: (write_csv(batches, out), pandas_rollups(out, args.bucket)))
+        report(
+            "csv + --aggregate", lambda: aggregate(batches, open_sink(out), summary, args.bucket)
+        )
+        report("--aggregate-only", lambda: aggregate(batches, None, summary, args.bucket))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
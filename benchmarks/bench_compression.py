@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: benchmarks/bench_compression.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Compressed sink benchmark: write throughput and CPU cost vs. bytes saved per gzip/zstd level.
+
+Usage:
+python -m benchmarks.bench_compression --rows 200000 --format csv
+python -m benchmarks.bench_compression --gzip-levels 1 6 --zstd-levels 1 3 10
+
+Notes:
+- Rows are flattened up front; only the sink (encode + compress + write) is timed.
+- "CPU s/MiB saved" is the extra process CPU time over the uncompressed sink divided
+  by the bytes it saved; lower is cheaper compression.
+- zstd levels are skipped when `zstandard` is not installed.
+===========================================================================
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from twitter_extractor.io_utils import open_sink
+from twitter_extractor.models import TweetBatch
+from twitter_extractor.utils import flatten_tweets
+
+from ._synthetic import fake_pages
+
+
+def write(path: Path, batch: TweetBatch, level, batch_size: int) -> tuple:
+    """(wall seconds, CPU seconds, bytes on disk) for one sink run."""
+    t0, c0 = time.perf_counter(), time.process_time()
+    with open_sink(path, batch_size=batch_size, compress_level=level) as sink:
+        sink.write(batch)
+    return time.perf_counter() - t0, time.process_time() - c0, path.stat().st_size
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Compressed sink benchmark")
+    p.add_argument("--rows", type=int, default=200_000)
+    p.add_argument("--format", choices=("csv", "jsonl"), default="csv")
+    p.add_argument("--batch-size", type=int, default=1000)
+    p.add_argument("--gzip-levels", type=int, nargs="*", default=[1, 6, 9])
+    p.add_argument("--zstd-levels", type=int, nargs="*", default=[1, 3, 10, 19])
+    args = p.parse_args()
+
+    batch = TweetBatch()
+    for page in fake_pages(args.rows):
+        batch.extend(flatten_tweets(page.data, as_batch=True))
+
+    cases = [("none", "", None)]
+    cases += [(f"gzip -{lvl}", ".gz", lvl) for lvl in args.gzip_levels]
+    try:
+        import zstandard  # noqa: F401
+
+        cases += [(f"zstd -{lvl}", ".zst", lvl) for lvl in args.zstd_levels]
+    except ImportError:
+        print("zstandard not installed; skipping zstd levels")
+
+    print(
+        f"{'codec':<10}{'seconds':>9}{'CPU s':>8}{'rows/s':>11}{'MiB':>9}{'ratio':>7}"
+        f"{'CPU s/MiB saved':>17}"
+    )
+    base_cpu = base_size = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, suffix, level in cases:
+            path = Path(tmp) / f"bench-{name.replace(' ', '')}.{args.format}{suffix}"
+            wall, cpu, size = write(path, batch, level, args.batch_size)
+            if base_size is None:
+                base_cpu, base_size = cpu, size
+            saved = (base_size - size) / 2**20
+            cost = f"{(cpu - base_cpu) / saved:.3f}" if saved > 0 else "-"
+            print(
+                f"{name:<10}{wall:>9.2f}{cpu:>8.2f}{len(batch) / wall:>11,.0f}"
+                f"{size / 2**20:>9.1f}{base_size / size:>6.1f}x{cost:>17}"
+            )
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: benchmarks/bench_enrich.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Enrichment scaling benchmark: built-in transforms inline vs. a process pool of 1..N workers.
+
+Usage:
+python -m benchmarks.bench_enrich --rows 200000 --workers 0 1 2 4 8
+python -m benchmarks.bench_enrich --transforms entities normalize lang --chunk-size 5000
+
+Notes:
+- Rows are flattened up front and written to a sink that discards them, so only
+  enrichment (plus pickling batches to and from the workers) is timed.
+- workers=0 is the inline baseline; speedup is relative to it. Small chunks pay more
+  inter-process overhead per row.
+===========================================================================
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from pathlib import Path
+
+from twitter_extractor.enrich import EnrichingSink, resolve_transforms
+from twitter_extractor.models import TweetBatch
+from twitter_extractor.utils import flatten_tweets
+
+from ._synthetic import fake_pages
+
+EXTRAS = (" #python", " @tweepy_dev", " https://t.co/AbCdEf12", " #data", "   ｆｕｌｌ")
+
+
+class NullSink:
+    path = Path(os.devnull)
+    rows_written = 0
+    byte_offsets = False
+
+    def write(self, batch: TweetBatch) -> None:
+        self.rows_written += len(batch)
+
+    def flush(self) -> None:
+        pass
+
+    def tell(self) -> int:
+        return self.rows_written
+
+    def close(self) -> None:
+        pass
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Enrichment process-pool scaling benchmark")
+    p.add_argument("--rows", type=int, default=200_000)
+    p.add_argument("--workers", type=int, nargs="+", default=[0, 1, 2, 4, os.cpu_count() or 1])
+    p.add_argument("--transforms", nargs="+", default=["entities", "normalize", "lang"])
+    p.add_argument("--chunk-size", type=int, default=1000)
+    args = p.parse_args()
+
+    batch = TweetBatch()
+    for page in fake_pages(args.rows):
+        batch.extend(flatten_tweets(page.data, as_batch=True))
+    texts = batch.raw_column("text")
+    batch.set_column("text", [t + EXTRAS[i % len(EXTRAS)] for i, t in enumerate(texts)])
+    transforms = resolve_transforms(args.transforms)
+    step = args.chunk_size
+
+    print(f"{os.cpu_count()} CPUs; transforms: {', '.join(args.transforms)}")
+    print(f"{'workers':>8}{'seconds':>10}{'rows/s':>12}{'speedup':>9}")
+    baseline = None
+    for workers in dict.fromkeys(args.workers):
+        sink = NullSink()
+        t0 = time.perf_counter()
+        with EnrichingSink(sink, transforms, workers=workers, chunk_size=step) as enriching:
+            for start in range(0, len(batch), step):
+                enriching.write(batch.take(range(start, min(start + step, len(batch)))))
+        elapsed = time.perf_counter() - t0
+        baseline = baseline or elapsed
+        print(
+            f"{workers:>8}{elapsed:>10.2f}{sink.rows_written / elapsed:>12,.0f}"
+            f"{baseline / elapsed:>8.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: benchmarks/bench_flatten.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Flattening benchmark: tweepy Response/Tweet objects + flatten_tweets vs. raw JSON flatten_payload.
+
+Usage:
+python -m benchmarks.bench_flatten --rows 10000 100000
+
+Notes:
+- Both paths start from the same decoded JSON pages (what requests hands tweepy),
+  so the tweepy path includes building Response/Tweet objects, as a real search does.
+- Output columns are identical; only the time to get there differs.
+- Timings run under tracemalloc, which inflates both paths; compare the ratio.
+===========================================================================
+"""
+from __future__ import annotations
+
+import argparse
+
+import tweepy
+
+from twitter_extractor.utils import flatten_payload, flatten_tweets
+
+from ._synthetic import measure
+from .mock_server import make_page
+
+PAGE_SIZE = 100
+DISTINCT_PAGES = 100  # larger inputs cycle through these to keep setup memory flat
+
+
+def raw_pages(rows: int) -> list:
+    n = -(-rows // PAGE_SIZE)
+    pool = [
+        make_page(i * PAGE_SIZE, PAGE_SIZE, total=DISTINCT_PAGES * PAGE_SIZE)
+        for i in range(min(n, DISTINCT_PAGES))
+    ]
+    return [pool[i % len(pool)] for i in range(n)]
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Per-Tweet vs. columnar flattening benchmark")
+    p.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    args = p.parse_args()
+    parser = tweepy.Client()
+
+    print(f"{'rows':>10}{'path':>14}{'seconds':>10}{'rows/s':>12}{'peak MiB':>10}{'speedup':>9}")
+    for rows in args.rows:
+        pages = raw_pages(rows)
+
+        def per_tweet(pages=pages):
+            for payload in pages:
+                page = parser._construct_response(payload, data_type=tweepy.Tweet)
+                flatten_tweets(page.data, includes=page.includes, as_batch=True)
+
+        def columnar(pages=pages):
+            for payload in pages:
+                flatten_payload(payload)
+
+        baseline = None
+        for name, fn in (("tweepy.Tweet", per_tweet), ("raw columnar", columnar)):
+            elapsed, peak = measure(fn)
+            baseline = baseline or elapsed
+            print(
+                f"{rows:>10}{name:>14}{elapsed:>10.2f}{rows / elapsed:>12,.0f}"
+                f"{peak / 2**20:>10.1f}{baseline / elapsed:>8.1f}x"
+            )
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
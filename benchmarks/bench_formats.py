@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: benchmarks/bench_formats.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Write size, write time and read-back time of CSV vs JSONL vs Parquet sinks.
+
+Usage:
+python -m benchmarks.bench_formats --rows 100000
+
+Notes:
+- Read-back loads into pandas with typed columns (CSV needs parse_dates).
+===========================================================================
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from twitter_extractor.io_utils import open_sink
+from twitter_extractor.utils import flatten_tweets
+
+from ._synthetic import fake_pages
+
+
+def dir_size(path: Path) -> int:
+    if path.is_file():
+        return path.stat().st_size
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+
+def read_back(path: Path, fmt: str) -> pd.DataFrame:
+    if fmt == "csv":
+        return pd.read_csv(path, parse_dates=["created_at"], dtype={"id": str})
+    if fmt == "jsonl":
+        return pd.read_json(path, lines=True, dtype={"id": str})
+    return pd.read_parquet(path)
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Output format size/speed benchmark")
+    p.add_argument("--rows", type=int, default=100_000)
+    p.add_argument("--batch-size", type=int, default=10_000)
+    args = p.parse_args()
+
+    pages = list(fake_pages(args.rows))
+    cases = [
+        ("csv", "tweets.csv", ()),
+        ("jsonl", "tweets.jsonl", ()),
+        ("parquet", "tweets.parquet", ()),
+        ("parquet", "partitioned.parquet", ("date", "lang")),
+    ]
+    print(f"{'output':<22}{'MiB':>8}{'write s':>10}{'read s':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt, name, partition_by in cases:
+            out = Path(tmp) / name
+            t0 = time.perf_counter()
+            with open_sink(out, batch_size=args.batch_size, partition_by=partition_by) as sink:
+                for page in pages:
+                    sink.write(flatten_tweets(page.data, includes=page.includes))
+            write_s = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            df = read_back(out, fmt)
+            read_s = time.perf_counter() - t0
+            assert len(df) == args.rows
+            print(f"{name:<22}{dir_size(out) / 2**20:>8.1f}{write_s:>10.2f}{read_s:>9.2f}")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: benchmarks/bench_models.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Memory benchmark: dict-backed dataclass rows vs. slotted TweetRow vs. columnar TweetBatch.
+
+Usage:
+python -m benchmarks.bench_models --rows 1000000
+
+Notes:
+- Each representation is built from the same pages; peak traced memory is reported.
+===========================================================================
+"""
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass, make_dataclass
+
+from twitter_extractor.models import TweetBatch, TweetRow
+from twitter_extractor.utils import flatten_tweets
+
+from ._synthetic import fake_pages, measure
+
+# Same fields as TweetRow but without slots, i.e. the pre-slots layout.
+DictRow = dataclass(make_dataclass("DictRow", [(name, object) for name in TweetRow.__slots__]))
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Row model memory benchmark")
+    p.add_argument("--rows", type=int, default=1_000_000)
+    args = p.parse_args()
+
+    def dict_rows():
+        return [
+            DictRow(*(getattr(r, n) for n in TweetRow.__slots__))
+            for page in fake_pages(args.rows)
+            for r in flatten_tweets(page.data)
+        ]
+
+    def slotted_rows():
+        return [r for page in fake_pages(args.rows) for r in flatten_tweets(page.data)]
+
+    def batch():
+        out = TweetBatch()
+        for page in fake_pages(args.rows):
+            out.extend(flatten_tweets(page.data, as_batch=True))
+        return out
+
+    print(f"{'model':<16}{'seconds':>10}{'peak MiB':>10}")
+    for name, fn in (("dict dataclass", dict_rows), ("slots TweetRow", slotted_rows),
+                     ("TweetBatch", batch)):
+        elapsed, peak = measure(fn)
+        print(f"{name:<16}{elapsed:>10.2f}{peak / 2**20:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: benchmarks/bench_parallel.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Wall-clock speedup of time-sliced search against a mocked search_recent_tweets.
+
+Usage:
+python -m benchmarks.bench_parallel --latency 0.2 --pages 8 --slices 1 2 4 8
+
+Notes:
+- The mock sleeps `--latency` seconds per page and runs through the real
+  tweepy.Paginator inside TwitterClient.search.
+===========================================================================
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import tweepy
+
+from twitter_extractor.api import TwitterClient
+from twitter_extractor.parallel import parse_iso, search_sliced
+from twitter_extractor.ratelimit import TokenScheduler
+
+from ._synthetic import fake_tweet
+
+
+def mocked_client(latency: float, pages: int, page_size: int) -> TwitterClient:
+    rng = random.Random(1)
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    def search_recent_tweets(
+        query, *, next_token=None, start_time=None, end_time=None, **params
+    ):
+        time.sleep(latency)
+        n = int(next_token) if next_token else 0
+        # Distinct ids per slice so de-duplication does not hide work.
+        minute = int((parse_iso(start_time) - base).total_seconds() // 60)
+        offset = minute * 1_000 + n * page_size
+        data = [fake_tweet(offset + i, rng, base) for i in range(page_size)]
+        end = parse_iso(end_time)
+        for i, tweet in enumerate(data):  # newest first, inside the slice's window
+            tweet.created_at = end - timedelta(milliseconds=n * page_size + i + 1)
+        meta = {"result_count": page_size}
+        if n + 1 < pages:
+            meta["next_token"] = str(n + 1)
+        return tweepy.Response(data, {}, [], meta)
+
+    client = TwitterClient.__new__(TwitterClient)
+    client.client = SimpleNamespace(search_recent_tweets=search_recent_tweets)
+    client.scheduler = TokenScheduler([client.client])
+    client._can_write = False
+    client.cache = None
+    return client
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Time-sliced search speedup benchmark")
+    p.add_argument("--latency", type=float, default=0.2, help="Seconds per mocked page")
+    p.add_argument("--pages", type=int, default=8, help="Pages in the whole window")
+    p.add_argument("--page-size", type=int, default=100)
+    p.add_argument("--slices", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = p.parse_args()
+
+    print(f"{'slices':>6}{'seconds':>10}{'rows':>8}{'speedup':>9}")
+    baseline = None
+    for n in args.slices:
+        # Keep total work constant: each slice pages through its share of the window.
+        per_slice = max(1, args.pages // n)
+        client = mocked_client(args.latency, per_slice, args.page_size)
+        t0 = time.perf_counter()
+        rows = sum(
+            len(chunk)
+            for chunk in search_sliced(
+                client,
+                "bench",
+                start_time="2026-01-01T00:00:00Z",
+                end_time="2026-01-02T00:00:00Z",
+                slices=n,
+                workers=n,
+            )
+        )
+        elapsed = time.perf_counter() - t0
+        baseline = baseline or elapsed
+        print(f"{n:>6}{elapsed:>10.2f}{rows:>8}{baseline / elapsed:>8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: benchmarks/bench_startup.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Startup benchmark: `python -X importtime` for the CLI module plus `--help` wall time.
+
+Usage:
+python -m benchmarks.bench_startup --repeat 5 --threshold-ms 100
+
+Notes:
+- Exits 1 when the median cumulative import time of twitter_extractor.cli exceeds
+  --threshold-ms, so it can gate CI against import-time regressions.
+===========================================================================
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+MODULE = "twitter_extractor.cli"
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+
+def _env() -> dict:
+    path = os.pathsep.join([str(SRC), os.environ.get("PYTHONPATH", "")])
+    return {**os.environ, "PYTHONPATH": path}
+
+
+def import_times(module: str = MODULE) -> dict:
+    """Cumulative import time (µs) per module from one `python -X importtime` run."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=_env(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def help_wall_time() -> float:
+    t0 = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", MODULE, "--help"], env=_env(), capture_output=True, check=True
+    )
+    return time.perf_counter() - t0
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="CLI startup benchmark")
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--threshold-ms", type=float, default=100.0)
+    p.add_argument("--top", type=int, default=8, help="Slowest imports to list")
+    args = p.parse_args()
+
+    runs = [import_times() for _ in range(args.repeat)]
+    cli_ms = statistics.median(r[MODULE] for r in runs) / 1000
+    help_s = statistics.median(help_wall_time() for _ in range(args.repeat))
+
+    print(f"{'module':<40}{'cumulative ms':>14}")
+    slowest = sorted(runs[-1].items(), key=lambda kv: kv[1], reverse=True)[: args.top]
+    for name, us in slowest:
+        print(f"{name:<40}{us / 1000:>14.1f}")
+    print(f"\nimport {MODULE}: {cli_ms:.1f} ms (median of {args.repeat})")
+    print(f"twitter-extractor --help: {help_s * 1000:.1f} ms wall")
+    if cli_ms > args.threshold_ms:
+        print(f"FAIL: import time above {args.threshold_ms:.0f} ms threshold", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: benchmarks/bench_store.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Ingest benchmark for the SQLite tweet store: rows/s by transaction (batch) size.
+
+Usage:
+python -m benchmarks.bench_store --rows 200000 --batch-sizes 1 100 1000 10000
+
+Notes:
+- Each batch is one upsert() transaction. The second pass re-ingests the same ids,
+  which is the ON CONFLICT (metrics refresh) path.
+- Batch size 1 is capped at 10k rows; it is orders of magnitude slower.
+===========================================================================
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from twitter_extractor.models import TweetBatch
+from twitter_extractor.store import TweetStore
+from twitter_extractor.utils import flatten_tweets
+
+from ._synthetic import fake_pages
+
+
+def ingest(store: TweetStore, batch: TweetBatch, batch_size: int) -> float:
+    t0 = time.perf_counter()
+    for start in range(0, len(batch), batch_size):
+        store.upsert(batch.take(range(start, min(start + batch_size, len(batch)))))
+    return time.perf_counter() - t0
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Tweet store ingest benchmark")
+    p.add_argument("--rows", type=int, default=200_000)
+    p.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 100, 1000, 10_000])
+    args = p.parse_args()
+
+    data = TweetBatch()
+    for page in fake_pages(args.rows):
+        data.extend(flatten_tweets(page.data, as_batch=True))
+
+    print(f"{'batch':>7}{'rows':>9}{'insert rows/s':>15}{'upsert rows/s':>15}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.batch_sizes:
+            rows = data if size > 1 else data.take(range(min(len(data), 10_000)))
+            with TweetStore(Path(tmp) / f"store-{size}.db") as store:
+                inserted = ingest(store, rows, size)
+                upserted = ingest(store, rows, size)
+                assert store.count() == len(rows)
+            n = len(rows)
+            print(f"{size:>7}{n:>9}{n / inserted:>15.0f}{n / upserted:>15.0f}")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
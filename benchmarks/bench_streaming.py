@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: benchmarks/bench_streaming.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Peak-memory benchmark: streaming sinks vs. accumulate-then-save_csv.
+
+Usage:
+python -m benchmarks.bench_streaming --rows 10000 1000000
+
+Notes:
+- The accumulating baseline is skipped above --baseline-max rows; it is the
+  path whose memory grows with the result set.
+===========================================================================
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+from functools import partial
+from pathlib import Path
+
+from twitter_extractor.io_utils import open_sink, save_csv, to_dataframe
+from twitter_extractor.utils import flatten_tweets
+
+from ._synthetic import fake_pages, measure
+
+
+def run_accumulate(total: int, out: Path) -> None:
+    all_rows = []
+    for page in fake_pages(total):
+        all_rows.extend(flatten_tweets(page.data, includes=page.includes))
+    save_csv(to_dataframe(all_rows), out)
+
+
+def run_streaming(total: int, out: Path, batch_size: int) -> None:
+    with open_sink(out, batch_size=batch_size) as sink:
+        for page in fake_pages(total):
+            sink.write(flatten_tweets(page.data, includes=page.includes))
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Peak-memory benchmark for streaming sinks")
+    p.add_argument("--rows", type=int, nargs="+", default=[10_000, 1_000_000])
+    p.add_argument("--format", choices=("csv", "jsonl", "parquet"), default="csv")
+    p.add_argument("--batch-size", type=int, default=1000)
+    p.add_argument("--baseline-max", type=int, default=100_000)
+    args = p.parse_args()
+
+    print(f"{'mode':<12}{'rows':>10}{'seconds':>10}{'rows/s':>12}{'peak MiB':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp) / f"bench.{args.format}"
+        for total in args.rows:
+            modes = [("streaming", partial(run_streaming, total, out, args.batch_size))]
+            if args.format == "csv" and total <= args.baseline_max:
+                modes.insert(0, ("accumulate", partial(run_accumulate, total, out)))
+            for name, fn in modes:
+                elapsed, peak = measure(fn)
+                print(
+                    f"{name:<12}{total:>10}{elapsed:>10.2f}"
+                    f"{total / elapsed:>12.0f}{peak / 2**20:>10.1f}"
+                )
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: benchmarks/bench_threads.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Thread assembly benchmark: ThreadIndex / ThreadSink vs. a pandas groupby + sort baseline.
+
+Usage:
+python -m benchmarks.bench_threads --rows 1000000
+python -m benchmarks.bench_threads --rows 200000 --max-conversations 1000 10000 --spread 5000
+
+Notes:
+- Conversations of 1..`--max-size` tweets arrive interleaved: each tweet lands within
+  `--spread` rows of its conversation's start, like replies trickling into a search.
+- Peak memory is traced with tracemalloc (which slows every run by a similar factor).
+  The pandas baseline holds every row at once; the index holds at most the bound.
+- ThreadSink runs write nested JSONL to a temporary directory; the row sink discards rows.
+===========================================================================
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+from functools import partial
+from pathlib import Path
+
+import pandas as pd
+
+from twitter_extractor.models import INT_FIELDS, MISSING_INT, TWEET_FIELDS, TweetBatch
+from twitter_extractor.threads import ThreadIndex, ThreadSink
+
+from ._synthetic import measure
+
+BATCH = 1000
+
+
+class NullSink:
+    path = Path(os.devnull)
+    rows_written = 0
+    byte_offsets = False
+
+    def write(self, batch: TweetBatch) -> None:
+        self.rows_written += len(batch)
+
+    def flush(self) -> None:
+        pass
+
+    def tell(self) -> int:
+        return self.rows_written
+
+    def close(self) -> None:
+        pass
+
+
+def thread_batch(rows: int, max_size: int, spread: int, seed: int = 7) -> TweetBatch:
+    """`rows` tweets in conversations of 1..max_size, interleaved within `spread` rows."""
+    rng = random.Random(seed)
+    keyed = []  # (arrival key, tweet id, conversation id, parent id)
+    tweet_id = 10**18
+    while len(keyed) < rows:
+        size = min(rng.randint(1, max_size), rows - len(keyed))
+        root, offset = tweet_id, len(keyed)
+        for n in range(size):
+            parent = None if n == 0 else str(rng.randint(root, tweet_id - 1))
+            keyed.append((offset + rng.random() * spread, tweet_id, root, parent))
+            tweet_id += 1
+    keyed.sort()
+    columns = {
+        name: [MISSING_INT] * rows if name in INT_FIELDS else [None] * rows
+        for name in TWEET_FIELDS
+    }
+    columns["id"] = [str(k[1]) for k in keyed]
+    columns["conversation_id"] = [str(k[2]) for k in keyed]
+    columns["in_reply_to_id"] = [k[3] for k in keyed]
+    columns["text"] = ["t"] * rows
+    return TweetBatch.from_columns(columns)
+
+
+def batches(batch: TweetBatch):
+    for start in range(0, len(batch), BATCH):
+        yield batch.take(range(start, min(start + BATCH, len(batch))))
+
+
+def run_pandas(chunks) -> None:
+    frame = pd.concat([pd.DataFrame(chunk.columns()) for chunk in chunks], ignore_index=True)
+    frame["_order"] = frame["id"].astype("int64")
+    frame = frame.sort_values(["conversation_id", "_order"])
+    for _ in frame.groupby("conversation_id", sort=False)["id"]:
+        pass
+
+
+def run_index(chunks, max_conversations: int) -> None:
+    index = ThreadIndex(max_conversations=max_conversations)
+    for chunk in chunks:
+        for conv in index.add(chunk):
+            conv.ordered_ids()
+    for conv in index.drain():
+        conv.ordered_ids()
+
+
+def run_sink(chunks, max_conversations: int, out: Path) -> None:
+    with ThreadSink(NullSink(), out, max_conversations=max_conversations) as sink:
+        for chunk in chunks:
+            sink.write(chunk)
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Conversation thread assembly benchmark")
+    p.add_argument("--rows", type=int, default=1_000_000)
+    p.add_argument("--max-size", type=int, default=20, help="largest conversation")
+    p.add_argument("--spread", type=int, default=2000, help="rows a conversation spans")
+    p.add_argument("--max-conversations", type=int, nargs="+", default=[1000, 100_000])
+    args = p.parse_args()
+
+    chunks = list(batches(thread_batch(args.rows, args.max_size, args.spread)))
+    print(f"{args.rows:,} tweets, conversations of 1..{args.max_size} over {args.spread} rows")
+    print(f"{'method':<28}{'seconds':>9}{'rows/s':>12}{'peak MiB':>10}")
+
+    def report(name: str, elapsed: float, peak: int) -> None:
+        print(f"{name:<28}{elapsed:>9.2f}{args.rows / elapsed:>12,.0f}{peak / 2**20:>10.1f}")
+
+    report("pandas groupby+sort", *measure(lambda: run_pandas(chunks)))
+    with tempfile.TemporaryDirectory() as tmp:
+        for bound in args.max_conversations:
+            report(f"ThreadIndex max={bound:,}", *measure(partial(run_index, chunks, bound)))
+            out = Path(tmp) / "threads.jsonl"
+            report(f"ThreadSink max={bound:,}", *measure(partial(run_sink, chunks, bound, out)))
+            print(f"{'':<28}{out.stat().st_size / 2**20:>31.1f} MiB of JSONL")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
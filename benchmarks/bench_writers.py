@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: benchmarks/bench_writers.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Microbenchmark: pandas to_dataframe + save_csv vs. the stdlib CSV/JSONL sinks.
+
+Usage:
+python -m benchmarks.bench_writers --rows 200000
+
+Notes:
+- Rows are flattened up front; only the write path is timed and traced.
+===========================================================================
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+from pathlib import Path
+
+from twitter_extractor.io_utils import open_sink, save_csv, to_dataframe
+from twitter_extractor.utils import flatten_tweets
+
+from ._synthetic import fake_pages, measure
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Row writer microbenchmark")
+    p.add_argument("--rows", type=int, default=200_000)
+    p.add_argument("--batch-size", type=int, default=1000)
+    args = p.parse_args()
+
+    rows = [r for page in fake_pages(args.rows) for r in flatten_tweets(page.data)]
+    to_dataframe(rows[:1])  # keep the one-off pandas import out of the timing
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+
+        def pandas_csv():
+            save_csv(to_dataframe(rows), tmp / "pandas.csv")
+
+        def sink(name: str):
+            def run():
+                with open_sink(tmp / name, batch_size=args.batch_size) as s:
+                    s.write(rows)
+            return run
+
+        print(f"{'writer':<14}{'rows/s':>12}{'peak MiB':>10}")
+        for name, fn in (
+            ("pandas csv", pandas_csv),
+            ("stdlib csv", sink("sink.csv")),
+            ("stdlib jsonl", sink("sink.jsonl")),
+        ):
+            elapsed, peak = measure(fn)
+            print(f"{name:<14}{len(rows) / elapsed:>12.0f}{peak / 2**20:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
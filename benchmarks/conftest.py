@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: benchmarks/conftest.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+pytest options and fixtures for the benchmark scenarios.
+
+Usage:
+pytest benchmarks --bench-sizes 1000,100000,1000000
+
+Notes:
+- Scenarios are parametrized by tweet count; 1M is opt-in because it takes minutes.
+===========================================================================
+"""
+from __future__ import annotations
+
+DEFAULT_SIZES = "1000,100000"
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--bench-sizes",
+        default=DEFAULT_SIZES,
+        help="Comma-separated tweet counts for the benchmark scenarios",
+    )
+
+
+def pytest_generate_tests(metafunc):
+    if "tweets" in metafunc.fixturenames:
+        sizes = metafunc.config.getoption("--bench-sizes")
+        values = [int(v) for v in sizes.split(",") if v.strip()]
+        metafunc.parametrize("tweets", values, ids=[f"{v:_}" for v in values])
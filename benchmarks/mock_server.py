@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: benchmarks/mock_server.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Local HTTP stand-in for GET /2/tweets/search/recent with rate-limit headers and 429s, and
+for the v2 filtered stream (newline-delimited JSON at a set rate) and its rules endpoints.
+
+Usage:
+with MockTwitterServer(total=10_000, latency=0.05) as server:
+    client = mock_twitter_client(server)
+    for page in client.search("python", limit_pages=None): ...
+
+with MockTwitterServer(stream_rate=2_000, stream_disconnect_after=500) as server:
+    stream = mock_stream_client(server)
+    stream.start()
+
+python -m benchmarks.mock_server --port 8765 --total 100000  # standalone
+
+Notes:
+- Pages are deterministic JSON (data, includes.users, meta) built by `make_page`.
+- Each bearer token has `limit` requests per `window` seconds; `error_rate` adds
+  random 429s on top. Headers mirror x-rate-limit-limit/remaining/reset.
+- tweepy hard-codes https://api.twitter.com; `mock_twitter_client` mounts a requests
+  adapter on each client session that rewrites that host to the mock server.
+- The stream sends `stream_rate` tweets/s per connection (created_at = now, matching
+  every active rule), then keep-alive blank lines once `stream_total` have been sent.
+  `stream_disconnect_after` closes each connection after that many tweets and
+  `stream_failures` answers the first connections with those HTTP statuses.
+===========================================================================
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Sequence
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlsplit
+
+from requests.adapters import HTTPAdapter
+
+API_HOST = "https://api.twitter.com"
+SEARCH_PATH = "/2/tweets/search/recent"
+STREAM_PATH = "/2/tweets/search/stream"
+RULES_PATH = "/2/tweets/search/stream/rules"
+
+LANGS = ("en", "en", "en", "es", "fr", "de", "ja", "pt")
+WORDS = "python data tweepy pandas stream api search recent export batch token".split()
+BASE_TIME = datetime(2026, 1, 1, tzinfo=timezone.utc)
+AUTHORS = 5_000
+
+
+def make_page(start: int, count: int, *, total: int, seed: int = 7) -> dict:
+    """Raw v2 search payload for tweets [start, start + count) of a `total`-tweet result."""
+    rng = random.Random(seed * 1_000_003 + start)
+    count = max(0, min(count, total - start))
+    data, authors = [], {}
+    for i in range(start, start + count):
+        tweet_id = str(2 * 10**18 - i)  # newest first
+        created_at = BASE_TIME - timedelta(seconds=i)
+        author = rng.randrange(AUTHORS)
+        authors[author] = {
+            "id": str(author + 1), "username": f"user{author}", "name": f"User {author}"
+        }
+        data.append(
+            {
+                "id": tweet_id,
+                "edit_history_tweet_ids": [tweet_id],
+                "text": " ".join(rng.choices(WORDS, k=rng.randint(5, 30))),
+                "author_id": str(author + 1),
+                "created_at": created_at.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+                "lang": rng.choice(LANGS),
+                "conversation_id": str(2 * 10**18 - i + rng.randint(0, 5)),
+                "public_metrics": {
+                    "like_count": rng.randint(0, 500),
+                    "retweet_count": rng.randint(0, 100),
+                    "reply_count": rng.randint(0, 50),
+                    "quote_count": rng.randint(0, 10),
+                },
+            }
+        )
+    meta: Dict[str, object] = {"result_count": count}
+    if data:
+        meta["newest_id"], meta["oldest_id"] = data[0]["id"], data[-1]["id"]
+    if start + count < total:
+        meta["next_token"] = f"p{start + count}"
+    payload = {"data": data, "meta": meta} if data else {"meta": meta}
+    if authors:
+        payload["includes"] = {"users": list(authors.values())}
+    return payload
+
+
+def make_stream_line(i: int, rules: Sequence[dict] = (), *, seed: int = 7) -> bytes:
+    """One filtered-stream message for tweet `i`, created now."""
+    page = make_page(i, 1, total=i + 1, seed=seed)
+    tweet = page["data"][0]
+    tweet["created_at"] = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+    message = {
+        "data": tweet,
+        "includes": page["includes"],
+        "matching_rules": [{"id": r["id"], "tag": r.get("tag", "")} for r in rules],
+    }
+    return json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\r\n"
+
+
+class MockTwitterServer:
+    """Threaded mock of the recent-search and filtered-stream endpoints, bound to 127.0.0.1."""
+
+    def __init__(
+        self,
+        *,
+        total: int = 1_000,
+        latency: float = 0.0,
+        limit: int = 450,
+        window: float = 900.0,
+        error_rate: float = 0.0,
+        port: int = 0,
+        seed: int = 7,
+        stream_rate: float = 1_000.0,
+        stream_total: Optional[int] = None,
+        stream_disconnect_after: Optional[int] = None,
+        stream_failures: Sequence[int] = (),
+    ):
+        self.total = total
+        self.stream_rate = stream_rate
+        self.stream_total = stream_total
+        self.stream_disconnect_after = stream_disconnect_after
+        self.stream_failures = list(stream_failures)
+        self.stream_connections = 0
+        self.streamed = 0  # tweets sent over all stream connections
+        self.rules: Dict[str, dict] = {}
+        self._rule_ids = 0
+        self._stopping = threading.Event()
+        self.latency = latency
+        self.limit = limit
+        self.window = window
+        self.error_rate = error_rate
+        self.seed = seed
+        self.requests = 0
+        self.throttled = 0
+        self._budgets: Dict[str, list] = {}  # token -> [remaining, reset_at]
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _take(self, token: str) -> tuple:
+        """Consume one request of `token`'s budget; return (status, headers)."""
+        now = time.time()
+        with self._lock:
+            self.requests += 1
+            budget = self._budgets.get(token)
+            if budget is None or now >= budget[1]:
+                budget = self._budgets[token] = [self.limit, now + self.window]
+            throttled = budget[0] <= 0 or self._rng.random() < self.error_rate
+            if not throttled:
+                budget[0] -= 1
+            else:
+                self.throttled += 1
+            headers = {
+                "x-rate-limit-limit": str(self.limit),
+                "x-rate-limit-remaining": str(max(budget[0], 0)),
+                "x-rate-limit-reset": str(int(budget[1]) + 1),
+            }
+        return (429 if throttled else 200), headers
+
+    def _stream(self, handler: BaseHTTPRequestHandler) -> None:
+        """Write NDJSON tweets at `stream_rate` until disconnect, failure or shutdown."""
+        with self._lock:
+            self.stream_connections += 1
+            status = self.stream_failures.pop(0) if self.stream_failures else None
+        if status is not None:
+            handler._reply(status, {"title": "Stream Error", "status": status}, {})
+            return
+        handler.send_response(200)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Transfer-Encoding", "chunked")  # like X: lines arrive unbuffered
+        handler.send_header("Connection", "close")
+        handler.end_headers()
+        handler.close_connection = True
+
+        def send(data: bytes) -> None:
+            handler.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            handler.wfile.flush()
+
+        t0, sent = time.monotonic(), 0
+        per_connection = self.stream_disconnect_after
+        try:
+            while not self._stopping.is_set():
+                if per_connection is not None and sent >= per_connection:
+                    handler.wfile.write(b"0\r\n\r\n")
+                    return
+                due = int((time.monotonic() - t0) * self.stream_rate) - sent
+                if per_connection is not None:
+                    due = min(due, per_connection - sent)
+                with self._lock:
+                    if self.stream_total is not None:
+                        due = min(due, self.stream_total - self.streamed)
+                    start = self.streamed
+                    self.streamed += max(due, 0)
+                    rules = list(self.rules.values())
+                if due > 0:
+                    send(b"".join(
+                        make_stream_line(start + k, rules, seed=self.seed) for k in range(due)
+                    ))
+                    sent += due
+                elif self.stream_total is not None and self.streamed >= self.stream_total:
+                    send(b"\r\n")  # keep-alive, as X sends while idle
+                    time.sleep(0.05)
+                time.sleep(0.002)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _rules(self, handler: BaseHTTPRequestHandler, body: Optional[dict]) -> None:
+        sent = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        with self._lock:
+            if body is None:  # GET
+                rules = list(self.rules.values())
+                payload: dict = {"meta": {"sent": sent, "result_count": len(rules)}}
+                if rules:
+                    payload["data"] = rules
+            elif "add" in body:
+                added = []
+                for rule in body["add"]:
+                    self._rule_ids += 1
+                    added.append({**rule, "id": str(self._rule_ids)})
+                    self.rules[added[-1]["id"]] = added[-1]
+                payload = {"data": added, "meta": {"sent": sent, "summary": {
+                    "created": len(added), "not_created": 0, "valid": len(added), "invalid": 0}}}
+            else:
+                ids = [i for i in body.get("delete", {}).get("ids", ()) if i in self.rules]
+                for i in ids:
+                    del self.rules[i]
+                payload = {"meta": {"sent": sent, "summary": {
+                    "deleted": len(ids), "not_deleted": 0}}}
+        handler._reply(200, payload, {})
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args) -> None:  # keep benchmark output clean
+                pass
+
+            def _reply(self, status: int, body: dict, headers: Dict[str, str]) -> None:
+                raw = json.dumps(body, separators=(",", ":")).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(raw)))
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(raw)
+
+            def do_POST(self) -> None:
+                if urlsplit(self.path).path != RULES_PATH:
+                    self._reply(404, {"title": "Not Found Error"}, {})
+                    return
+                length = int(self.headers.get("Content-Length") or 0)
+                server._rules(self, json.loads(self.rfile.read(length) or b"{}"))
+
+            def do_GET(self) -> None:
+                parts = urlsplit(self.path)
+                if parts.path == STREAM_PATH:
+                    server._stream(self)
+                    return
+                if parts.path == RULES_PATH:
+                    server._rules(self, None)
+                    return
+                if parts.path != SEARCH_PATH:
+                    self._reply(404, {"title": "Not Found Error"}, {})
+                    return
+                if server.latency:
+                    time.sleep(server.latency)
+                token = self.headers.get("Authorization", "")
+                status, headers = server._take(token)
+                if status == 429:
+                    self._reply(429, {"title": "Too Many Requests", "status": 429}, headers)
+                    return
+                params = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+                start = int(params.get("next_token", "p0")[1:])
+                count = int(params.get("max_results", 10))
+                page = make_page(start, count, total=server.total, seed=server.seed)
+                self._reply(200, page, headers)
+
+        return Handler
+
+    def start(self) -> "MockTwitterServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "MockTwitterServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+
+class RedirectAdapter(HTTPAdapter):
+    """requests adapter that sends https://api.twitter.com/... to `base_url` instead."""
+
+    def __init__(self, base_url: str):
+        super().__init__(pool_maxsize=32)
+        self.base_url = base_url.rstrip("/")
+
+    def send(self, request, **kwargs):
+        request.url = self.base_url + request.url[len(API_HOST):]
+        return super().send(request, **kwargs)
+
+
+def mock_twitter_client(server: MockTwitterServer, *, tokens: int = 1, **kwargs):
+    """Real TwitterClient (tweepy + TokenScheduler) whose requests hit `server`."""
+    from twitter_extractor.api import TwitterClient
+
+    env = {
+        "TW_BEARER_TOKEN": "bench-token-1",
+        "TW_BEARER_TOKENS": ",".join(f"bench-token-{i}" for i in range(1, tokens + 1)),
+    }
+    with patch.dict(os.environ, env):
+        client = TwitterClient(**kwargs)
+    adapter = RedirectAdapter(server.url)
+    for state in client.scheduler.tokens:
+        state.client.session.mount(API_HOST, adapter)
+    return client
+
+
+def mock_stream_client(server: MockTwitterServer, **kwargs):
+    """FilteredStream (tweepy StreamingClient) whose connection and rule requests hit `server`."""
+    from twitter_extractor.stream import FilteredStream
+
+    stream = FilteredStream("bench-token-1", **kwargs)
+    stream.session.mount(API_HOST, RedirectAdapter(server.url))
+    return stream
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Mock v2 recent-search server")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--total", type=int, default=100_000, help="Tweets per query")
+    p.add_argument("--latency", type=float, default=0.0, help="Seconds per request")
+    p.add_argument("--limit", type=int, default=450, help="Requests per token per window")
+    p.add_argument("--window", type=float, default=900.0, help="Rate-limit window (s)")
+    p.add_argument("--error-rate", type=float, default=0.0, help="Share of random 429s")
+    p.add_argument("--stream-rate", type=float, default=1_000.0, help="Stream tweets/s")
+    p.add_argument(
+        "--stream-disconnect-after", type=int, default=None, help="Tweets per stream connection"
+    )
+    args = p.parse_args()
+    server = MockTwitterServer(
+        total=args.total,
+        latency=args.latency,
+        limit=args.limit,
+        window=args.window,
+        error_rate=args.error_rate,
+        port=args.port,
+        stream_rate=args.stream_rate,
+        stream_disconnect_after=args.stream_disconnect_after,
+    )
+    print(f"Serving {SEARCH_PATH} and {STREAM_PATH} on {server.url} (Ctrl+C to stop)")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
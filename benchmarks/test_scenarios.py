@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: benchmarks/test_scenarios.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+pytest-benchmark scenarios: mock-server search, flatten (tweepy and raw JSON), DataFrame, CSV sink.
+
+Usage:
+pytest benchmarks --benchmark-autosave
+pytest benchmarks --benchmark-compare --benchmark-compare-fail=mean:15%
+
+Notes:
+- Each scenario stores rows/s and peak traced memory (MiB) in `extra_info`, so
+  saved runs can be compared for throughput and memory regressions.
+- Needs the bench extra: pip install -e ".[bench]".
+===========================================================================
+"""
+from __future__ import annotations
+
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+import tweepy  # noqa: E402
+
+from twitter_extractor.io_utils import open_sink, to_dataframe  # noqa: E402
+from twitter_extractor.models import TweetBatch  # noqa: E402
+from twitter_extractor.utils import flatten_payload, flatten_tweets  # noqa: E402
+
+from .mock_server import MockTwitterServer, make_page, mock_twitter_client  # noqa: E402
+
+PAGE_SIZE = 100
+DISTINCT_PAGES = 100  # larger inputs cycle through these to keep setup memory flat
+
+
+def _record(benchmark, fn: Callable[[], object], tweets: int, rounds: int = 3) -> None:
+    benchmark.pedantic(fn, rounds=rounds, iterations=1, warmup_rounds=0)
+    if benchmark.stats is None:  # --benchmark-disable: fn ran once as a plain test
+        return
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    benchmark.extra_info["rows_per_sec"] = round(tweets / benchmark.stats.stats.mean)
+    benchmark.extra_info["peak_mib"] = round(peak / 2**20, 2)
+
+
+def _pages(tweets: int) -> list:
+    parser = tweepy.Client()
+    pool = [
+        parser._construct_response(
+            make_page(i * PAGE_SIZE, PAGE_SIZE, total=DISTINCT_PAGES * PAGE_SIZE),
+            data_type=tweepy.Tweet,
+        )
+        for i in range(min(DISTINCT_PAGES, -(-tweets // PAGE_SIZE)))
+    ]
+    return [pool[i % len(pool)] for i in range(-(-tweets // PAGE_SIZE))]
+
+
+def _batch(tweets: int) -> TweetBatch:
+    batch = TweetBatch()
+    for page in _pages(tweets):
+        batch.extend(flatten_tweets(page.data, includes=page.includes, as_batch=True))
+    return batch
+
+
+def test_search(benchmark, tweets: int):
+    with MockTwitterServer(total=tweets, limit=10**9) as server:
+        client = mock_twitter_client(server)
+
+        def run():
+            return sum(len(p.data) for p in client.search("bench", limit_pages=None))
+
+        _record(benchmark, run, tweets, rounds=1)
+
+
+def test_flatten_tweets(benchmark, tweets: int):
+    pages = _pages(tweets)
+
+    def run():
+        for page in pages:
+            flatten_tweets(page.data, includes=page.includes, as_batch=True)
+
+    _record(benchmark, run, tweets)
+
+
+def test_flatten_payload(benchmark, tweets: int):
+    raw = [
+        make_page(i * PAGE_SIZE, PAGE_SIZE, total=DISTINCT_PAGES * PAGE_SIZE)
+        for i in range(min(DISTINCT_PAGES, -(-tweets // PAGE_SIZE)))
+    ]
+    pages = [raw[i % len(raw)] for i in range(-(-tweets // PAGE_SIZE))]
+
+    def run():
+        for page in pages:
+            flatten_payload(page)
+
+    _record(benchmark, run, tweets)
+
+
+def test_to_dataframe(benchmark, tweets: int):
+    batch = _batch(tweets)
+    to_dataframe(TweetBatch())  # keep the pandas import out of the timing
+    _record(benchmark, lambda: to_dataframe(batch), tweets)
+
+
+def test_csv_sink(benchmark, tweets: int, tmp_path: Path):
+    batch = _batch(tweets)
+
+    def run():
+        with open_sink(tmp_path / "bench.csv") as sink:
+            sink.write(batch)
+
+    _record(benchmark, run, tweets)
@@ -1,40 +1,48 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-"""
-===========================================================================
-Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
-File: __init__.py
-Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
-Created: 2025-10-25
-Updated: 2025-10-25
-License: MIT License (see LICENSE file for details)
-===========================================================================
-
-Description:
-Package initialization and version helper for the twitter_extractor package.
-
-Usage:
-from twitter_extractor import __version__
-
-Notes:
-- Falls back to \"0.0.0\" when distribution metadata is unavailable.
-===========================================================================
-"""
-"""twitter_extractor package.
-
-High-level utilities for extracting tweets with Tweepy v2 Client, via
-both CLI and Tkinter GUI interfaces.
-
-Author: Mobin Yousefi (github.com/mobinyousefi-cs)
-License: MIT
-"""
-from importlib.metadata import version, PackageNotFoundError
-
-__all__ = [
-    "__version__",
-]
-
-try:
-    __version__ = version("twitter-extractor")
-except PackageNotFoundError:  # pragma: no cover
-    __version__ = "0.0.0"
\ No newline at end of file
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: __init__.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-10-25
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Package initialization and version helper for the twitter_extractor package.
+
+Usage:
+from twitter_extractor import __version__
+
+Notes:
+- Falls back to \"0.0.0\" when distribution metadata is unavailable.
+- `__version__` is resolved lazily (module __getattr__) to keep `import twitter_extractor` cheap.
+===========================================================================
+"""
+"""twitter_extractor package.
+
+High-level utilities for extracting tweets with Tweepy v2 Client, via
+both CLI and Tkinter GUI interfaces.
+
+Author: Mobin Yousefi (github.com/mobinyousefi-cs)
+License: MIT
+"""
+__all__ = [
+    "__version__",
+]
+
+
+def __getattr__(name: str):
+    # Resolved on first access: importlib.metadata is slow to import.
+    if name != "__version__":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib.metadata import PackageNotFoundError, version
+
+    global __version__
+    try:
+        __version__ = version("twitter-extractor")
+    except PackageNotFoundError:  # pragma: no cover
+        __version__ = "0.0.0"
+    return __version__
\ No newline at end of file
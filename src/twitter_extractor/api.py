@@ -1,100 +1,296 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-"""
-===========================================================================
-Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
-File: api.py
-Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
-Created: 2025-10-25
-Updated: 2025-10-25
-License: MIT License (see LICENSE file for details)
-===========================================================================
-
-Description:
-Thin wrapper around Tweepy v2 Client to perform recent search and optional posting.
-
-Usage:
-from twitter_extractor.api import TwitterClient
-client = TwitterClient()
-for page in client.search("python lang:en -is:retweet", pages=1):
-    ...
-
-Notes:
-- Set wait_on_rate_limit=True to handle API rate limits gracefully.
-===========================================================================
-"""
-from __future__ import annotations
-
-from typing import Optional, Sequence
-
-import tweepy
-
-from .config import load_credentials
-
-
-DEFAULT_TWEET_FIELDS: Sequence[str] = (
-    "id",
-    "text",
-    "author_id",
-    "created_at",
-    "lang",
-    "conversation_id",
-    "public_metrics",
-)
-
-
-class TwitterClient:
-    """Thin wrapper over Tweepy v2 Client for search and (optional) posting."""
-
-    def __init__(self, *, bearer_only: bool = True):
-        creds = load_credentials()
-        if bearer_only:
-            self.client = tweepy.Client(bearer_token=creds.bearer_token, wait_on_rate_limit=True)
-            self._can_write = False
-        else:
-            # For write endpoints, you must provide full credentials.
-            self.client = tweepy.Client(
-                bearer_token=creds.bearer_token,
-                consumer_key=creds.api_key,
-                consumer_secret=creds.api_key_secret,
-                access_token=creds.access_token,
-                access_token_secret=creds.access_token_secret,
-                wait_on_rate_limit=True,
-            )
-            self._can_write = True
-
-    # --- READ ---
-    def search(
-        self,
-        query: str,
-        *,
-        max_results: int = 100,
-        start_time: Optional[str] = None,  # ISO 8601
-        end_time: Optional[str] = None,    # ISO 8601
-        tweet_fields: Sequence[str] = DEFAULT_TWEET_FIELDS,
-        expansions: Sequence[str] | None = ("author_id",),
-        user_fields: Sequence[str] | None = ("id", "name", "username"),
-        limit_pages: int | None = 10,
-    ):
-        """Generator over Tweepy Paginator pages for recent search."""
-        paginator = tweepy.Paginator(
-            self.client.search_recent_tweets,
-            query=query,
-            max_results=min(max(10, max_results), 100),
-            tweet_fields=list(tweet_fields),
-            expansions=list(expansions) if expansions else None,
-            user_fields=list(user_fields) if user_fields else None,
-            start_time=start_time,
-            end_time=end_time,
-        )
-        for i, page in enumerate(paginator):
-            yield page
-            if limit_pages and i + 1 >= limit_pages:
-                break
-
-    # --- WRITE (optional) ---
-    def post_tweet(self, text: str) -> str:
-        if not self._can_write:
-            raise RuntimeError("Client not initialized with write permissions.")
-        resp = self.client.create_tweet(text=text)
-        return str(resp.data.get("id"))
\ No newline at end of file
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: api.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-10-25
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Thin wrappers around Tweepy v2 Client/AsyncClient for recent search, id lookup and posting.
+
+Usage:
+from twitter_extractor.api import TwitterClient
+client = TwitterClient()
+for page in client.search("python lang:en -is:retweet", pages=1):
+    ...
+
+Notes:
+- Reads go through a TokenScheduler that spreads requests over every bearer token
+  and only sleeps when all of them are rate limited.
+- AsyncTwitterClient needs the async extra: pip install "tweepy[async]".
+- `lookup` hydrates up to 100 known tweet ids per request (see lookup.py for batching).
+- `counts` returns hourly tweet volume for a query (see planner.py).
+- `raw=True` yields the decoded JSON pages (dicts) instead of tweepy Responses, for
+  utils.flatten_payload; no tweepy.Tweet objects are built.
+- With a ResponseCache, search and lookup pages are served from / stored to disk; `offline=True`
+  replays cached pages only and needs no credentials.
+===========================================================================
+"""
+from __future__ import annotations
+
+import time
+from typing import AsyncIterator, Optional, Sequence
+
+import tweepy
+
+from .cache import CacheMiss, ResponseCache
+from .config import load_credentials
+from .metrics import Metrics
+from .ratelimit import TokenScheduler
+
+
+DEFAULT_TWEET_FIELDS: Sequence[str] = (
+    "id",
+    "text",
+    "author_id",
+    "created_at",
+    "lang",
+    "conversation_id",
+    "public_metrics",
+    "referenced_tweets",
+)
+
+
+class TwitterClient:
+    """Thin wrapper over Tweepy v2 Client for search and (optional) posting."""
+
+    def __init__(
+        self,
+        *,
+        bearer_only: bool = True,
+        on_rate_limit_wait=None,
+        sleep=time.sleep,
+        cache: Optional[ResponseCache] = None,
+        offline: bool = False,
+        raw: bool = False,
+        metrics: Optional[Metrics] = None,
+    ):
+        self.cache = cache
+        self.raw = raw
+        self.metrics = metrics
+        if offline:
+            if cache is None:
+                raise ValueError("Offline mode needs a response cache.")
+            self.client = tweepy.Client()  # only used to parse cached payloads
+            self.scheduler = None
+            self._can_write = False
+            return
+        if (cache is not None or raw) and not bearer_only:
+            raise ValueError(
+                "The response cache and raw mode only cover reads; use bearer_only=True."
+            )
+        creds = load_credentials()
+        # The scheduler handles 429s itself, so clients must not block on them.
+        tokens = getattr(creds, "bearer_tokens", None) or (creds.bearer_token,)
+        if bearer_only:
+            clients = [tweepy.Client(bearer_token=t, wait_on_rate_limit=False) for t in tokens]
+            self.client = clients[0]
+            self._can_write = False
+        else:
+            # For write endpoints, you must provide full credentials.
+            self.client = tweepy.Client(
+                bearer_token=creds.bearer_token,
+                consumer_key=creds.api_key,
+                consumer_secret=creds.api_key_secret,
+                access_token=creds.access_token,
+                access_token_secret=creds.access_token_secret,
+                wait_on_rate_limit=False,
+            )
+            clients = [self.client]
+            self._can_write = True
+        if cache is not None or raw:
+            for c in clients:
+                c.return_type = dict  # keep raw payloads; parsed in _read_method unless raw
+        self.scheduler = TokenScheduler(
+            clients, on_wait=on_rate_limit_wait, sleep=sleep, metrics=metrics
+        )
+
+    def _read_method(self, endpoint: str):
+        """Scheduler-routed read, going through the response cache when one is set."""
+        if self.cache is None:
+            return self.scheduler.method(endpoint)
+        cache = self.cache
+
+        def cached(**params):
+            key = cache.key(endpoint, params)
+            payload = cache.get(key)
+            if payload is None:
+                if self.scheduler is None:
+                    raise CacheMiss(f"No cached {endpoint} response for {params!r} (offline).")
+                payload = self.scheduler.call(endpoint, **params)
+                cache.put(key, endpoint, payload)
+            elif self.metrics is not None:
+                self.metrics.incr("cache_hits")
+            if self.raw:
+                return payload
+            # Tweet counts come back as plain dict buckets, not Tweet objects.
+            data_type = None if endpoint == "get_recent_tweets_count" else tweepy.Tweet
+            return self.client._construct_response(payload, data_type=data_type)
+
+        cached.__name__ = cached.__qualname__ = endpoint  # tweepy.Paginator keys on it
+        return cached
+
+    # --- READ ---
+    def search(
+        self,
+        query: str,
+        *,
+        max_results: int = 100,
+        start_time: Optional[str] = None,  # ISO 8601
+        end_time: Optional[str] = None,    # ISO 8601
+        tweet_fields: Sequence[str] = DEFAULT_TWEET_FIELDS,
+        expansions: Sequence[str] | None = ("author_id",),
+        user_fields: Sequence[str] | None = ("id", "name", "username"),
+        limit_pages: int | None = 10,
+        pagination_token: Optional[str] = None,
+        since_id: Optional[str] = None,
+        until_id: Optional[str] = None,
+    ):
+        """Generator over Tweepy Paginator pages (dicts with `raw=True`) for recent search.
+
+        Pass the `next_token` from a previous page's `meta` as `pagination_token`
+        to continue an interrupted pagination instead of starting over, and a
+        previously seen tweet id as `since_id` to fetch only newer tweets
+        (`until_id` to fetch only older ones).
+        """
+        paginator = tweepy.Paginator(
+            self._read_method("search_recent_tweets"),
+            query=query,
+            max_results=min(max(10, max_results), 100),
+            tweet_fields=list(tweet_fields),
+            expansions=list(expansions) if expansions else None,
+            user_fields=list(user_fields) if user_fields else None,
+            start_time=start_time,
+            end_time=end_time,
+            since_id=since_id,
+            until_id=until_id,
+            pagination_token=pagination_token,
+        )
+        for i, page in enumerate(paginator):
+            yield page
+            if limit_pages and i + 1 >= limit_pages:
+                break
+
+    def lookup(
+        self,
+        ids: Sequence[str],
+        *,
+        tweet_fields: Sequence[str] = DEFAULT_TWEET_FIELDS,
+        expansions: Sequence[str] | None = ("author_id",),
+        user_fields: Sequence[str] | None = ("id", "name", "username"),
+    ):
+        """Fetch up to 100 tweets by id in one GET /2/tweets request.
+
+        Ids that no longer resolve (deleted, protected) are absent from `data`
+        and reported in the response's `errors`.
+        """
+        if not 0 < len(ids) <= 100:
+            raise ValueError("lookup takes between 1 and 100 ids per request.")
+        return self._read_method("get_tweets")(
+            ids=list(ids),
+            tweet_fields=list(tweet_fields),
+            expansions=list(expansions) if expansions else None,
+            user_fields=list(user_fields) if user_fields else None,
+        )
+
+    def counts(
+        self,
+        query: str,
+        *,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        granularity: str = "hour",
+    ):
+        """Tweet volume for `query` per `granularity` bucket (GET /2/tweets/counts/recent).
+
+        One request covers the whole recent-search window; the page holds `data`
+        buckets (`start`, `end`, `tweet_count`) and `meta.total_tweet_count`.
+        """
+        return self._read_method("get_recent_tweets_count")(
+            query=query, start_time=start_time, end_time=end_time, granularity=granularity
+        )
+
+    # --- WRITE (optional) ---
+    def post_tweet(self, text: str) -> str:
+        if not self._can_write:
+            raise RuntimeError("Client not initialized with write permissions.")
+        resp = self.scheduler.call("create_tweet", text=text)
+        return str(resp.data.get("id"))
+
+
+class AsyncTwitterClient:
+    """Asyncio counterpart of TwitterClient built on tweepy.asynchronous.AsyncClient.
+
+    All searches share one aiohttp session whose connection pool is capped at
+    `connection_limit`; close it with `await client.aclose()` or `async with`.
+    """
+
+    def __init__(self, *, connection_limit: int = 100):
+        try:
+            from tweepy.asynchronous import AsyncClient
+        except ImportError as e:  # pragma: no cover - depends on environment
+            raise RuntimeError(
+                'AsyncTwitterClient requires the async extra: pip install "tweepy[async]".'
+            ) from e
+        creds = load_credentials()
+        self.client = AsyncClient(bearer_token=creds.bearer_token, wait_on_rate_limit=True)
+        self.connection_limit = connection_limit
+
+    def _ensure_session(self) -> None:
+        # AsyncClient opens and closes a session per request unless one is set.
+        if self.client.session is None or self.client.session.closed:
+            import aiohttp
+
+            self.client.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.connection_limit)
+            )
+
+    async def aclose(self) -> None:
+        if self.client.session is not None and not self.client.session.closed:
+            await self.client.session.close()
+
+    async def __aenter__(self) -> "AsyncTwitterClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    async def search(
+        self,
+        query: str,
+        *,
+        max_results: int = 100,
+        start_time: Optional[str] = None,  # ISO 8601
+        end_time: Optional[str] = None,    # ISO 8601
+        tweet_fields: Sequence[str] = DEFAULT_TWEET_FIELDS,
+        expansions: Sequence[str] | None = ("author_id",),
+        user_fields: Sequence[str] | None = ("id", "name", "username"),
+        limit_pages: int | None = 10,
+        pagination_token: Optional[str] = None,
+    ) -> AsyncIterator:
+        """Async generator over AsyncPaginator pages; same arguments as TwitterClient.search."""
+        from tweepy.asynchronous import AsyncPaginator
+
+        self._ensure_session()
+        paginator = AsyncPaginator(
+            self.client.search_recent_tweets,
+            query=query,
+            max_results=min(max(10, max_results), 100),
+            tweet_fields=list(tweet_fields),
+            expansions=list(expansions) if expansions else None,
+            user_fields=list(user_fields) if user_fields else None,
+            start_time=start_time,
+            end_time=end_time,
+            pagination_token=pagination_token,
+        )
+        i = 0
+        async for page in paginator:
+            yield page
+            i += 1
+            if limit_pages and i >= limit_pages:
+                break
\ No newline at end of file
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: batch.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Run many search queries concurrently over one AsyncTwitterClient, per-query or combined output.
+
+Usage:
+from twitter_extractor.batch import format_summary, read_query_specs, run_batch
+specs = read_query_specs(Path("queries.yaml"))
+results = asyncio.run(run_batch(client, specs, out=Path("outputs/tweets.csv")))
+print(format_summary(results))
+
+Notes:
+- An asyncio.Semaphore caps how many queries page at the same time.
+- Query files are .txt (one query per line), .json or .yaml/.yml; JSON/YAML entries
+  may set their own start_time/end_time/pages/max_results (YAML needs PyYAML).
+- With `combined=True` all queries share one output, told apart by the `query` column.
+- A failing query is reported in its result and does not stop the others.
+===========================================================================
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+import time
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import List, Optional, Sequence, Union
+
+from .io_utils import DEFAULT_BATCH_SIZE, RowSink, open_sink, split_compression
+from .metrics import Metrics, timed
+from .users import UserCache
+from .utils import flatten_tweets
+
+
+@dataclass
+class QuerySpec:
+    """One query of a batch; None fields fall back to the batch-wide defaults."""
+
+    query: str
+    start_time: Optional[str] = None
+    end_time: Optional[str] = None
+    limit_pages: Optional[int] = None
+    max_results: Optional[int] = None
+    name: Optional[str] = None  # slug for the per-query output file
+
+
+@dataclass
+class QueryResult:
+    query: str
+    path: Path
+    rows: int = 0
+    pages: int = 0
+    elapsed: float = 0.0
+    error: Optional[str] = None
+
+
+_SPEC_KEYS = frozenset(f.name for f in fields(QuerySpec))
+
+
+def read_queries(path: Path) -> List[str]:
+    """Read one query per line; blank lines and lines starting with '#' are skipped."""
+    lines = Path(path).read_text(encoding="utf-8").splitlines()
+    return [ln.strip() for ln in lines if ln.strip() and not ln.lstrip().startswith("#")]
+
+
+def _spec(entry, defaults: dict) -> QuerySpec:
+    entry = {**defaults, **({"query": entry} if isinstance(entry, str) else entry)}
+    if "pages" in entry:
+        entry["limit_pages"] = entry.pop("pages")
+    unknown = set(entry) - _SPEC_KEYS
+    if unknown or not entry.get("query"):
+        raise ValueError(f"Invalid query entry {entry!r}; unknown keys: {sorted(unknown)}")
+    for key in ("start_time", "end_time"):  # YAML turns unquoted timestamps into datetimes
+        if entry.get(key) is not None and not isinstance(entry[key], str):
+            entry[key] = entry[key].isoformat()
+    return QuerySpec(**entry)
+
+
+def read_query_specs(path: Path) -> List[QuerySpec]:
+    """Read a .txt, .json or .yaml/.yml query file.
+
+    JSON/YAML hold either a list of entries or ``{"defaults": {...}, "queries": [...]}``;
+    an entry is a query string or a mapping with `query` and optional `start_time`,
+    `end_time`, `pages`, `max_results` and `name`.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:  # pragma: no cover - depends on the environment
+            raise RuntimeError("YAML query files need PyYAML: pip install PyYAML") from None
+        doc = yaml.safe_load(path.read_text(encoding="utf-8"))
+    elif suffix == ".json":
+        doc = json.loads(path.read_text(encoding="utf-8"))
+    else:
+        return [QuerySpec(q) for q in read_queries(path)]
+    if isinstance(doc, dict):
+        defaults, entries = doc.get("defaults") or {}, doc.get("queries") or []
+    else:
+        defaults, entries = {}, doc or []
+    return [_spec(entry, defaults) for entry in entries]
+
+
+def query_output_path(out: Path, query: str, index: int) -> Path:
+    """Derive a per-query file next to `out`, e.g. outputs/tweets-003-python_lang_en.csv."""
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", query).strip("_")[:60] or "query"
+    base, compression = split_compression(out)
+    suffix = base.suffix + (out.suffix if compression else "")
+    return out.with_name(f"{base.stem}-{index:03d}-{slug}{suffix}")
+
+
+async def run_batch(
+    client,
+    queries: Sequence[Union[str, QuerySpec]],
+    *,
+    out: Path,
+    concurrency: int = 4,
+    max_results: int = 100,
+    start_time: Optional[str] = None,
+    end_time: Optional[str] = None,
+    limit_pages: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    users: Optional[UserCache] = None,
+    combined: bool = False,
+    metrics: Optional[Metrics] = None,
+) -> List[QueryResult]:
+    """Search every query with at most `concurrency` in flight; return one result per query.
+
+    QuerySpec fields override the keyword defaults. Rows go to one file per query
+    next to `out`, or all into `out` when `combined` is set.
+    """
+    specs = [q if isinstance(q, QuerySpec) else QuerySpec(q) for q in queries]
+    sem = asyncio.Semaphore(max(1, concurrency))
+    shared: Optional[RowSink] = open_sink(out, batch_size=batch_size) if combined else None
+
+    async def run_one(index: int, spec: QuerySpec) -> QueryResult:
+        path = out if combined else query_output_path(out, spec.name or spec.query, index)
+        result = QueryResult(query=spec.query, path=path)
+        async with sem:
+            t0 = time.perf_counter()
+            sink: Optional[RowSink] = None
+            try:
+                sink = shared or open_sink(path, batch_size=batch_size)
+                sink.metrics = metrics
+                async for page in client.search(
+                    spec.query,
+                    max_results=spec.max_results or max_results,
+                    start_time=spec.start_time or start_time,
+                    end_time=spec.end_time or end_time,
+                    limit_pages=limit_pages if spec.limit_pages is None else spec.limit_pages,
+                ):
+                    with timed(metrics, "flatten"):
+                        rows = flatten_tweets(
+                            page.data or [], includes=page.includes, users=users, query=spec.query
+                        )
+                    sink.write(rows)
+                    if metrics is not None:
+                        metrics.page(len(rows), query=spec.query)
+                    result.pages += 1
+                    result.rows += len(rows)
+            except Exception as e:
+                result.error = f"{type(e).__name__}: {e}"
+            finally:
+                if shared is None and sink is not None:
+                    sink.close()
+                result.elapsed = time.perf_counter() - t0
+        return result
+
+    try:
+        return list(await asyncio.gather(*(run_one(i, s) for i, s in enumerate(specs, start=1))))
+    finally:
+        if shared is not None:
+            shared.close()
+
+
+def format_summary(results: Sequence[QueryResult]) -> str:
+    """Plain-text table of rows, pages and elapsed seconds per query."""
+    width = min(max([len(r.query) for r in results] + [5]), 50)
+    lines = [f"{'query':<{width}}  {'rows':>8}  {'pages':>5}  {'seconds':>7}  status"]
+    for r in results:
+        status = "ok" if r.error is None else f"error: {r.error}"
+        lines.append(
+            f"{r.query[:width]:<{width}}  {r.rows:>8}  {r.pages:>5}  {r.elapsed:>7.2f}  {status}"
+        )
+    rows, pages = sum(r.rows for r in results), sum(r.pages for r in results)
+    lines.append(f"{'total':<{width}}  {rows:>8}  {pages:>5}")
+    return "\n".join(lines)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: cache.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+On-disk SQLite cache of raw API response pages, keyed by endpoint + request parameters.
+
+Usage:
+from twitter_extractor.cache import ResponseCache
+client = TwitterClient(cache=ResponseCache(Path(".cache/responses.sqlite")))
+offline = TwitterClient(cache=ResponseCache(path), offline=True)  # replay only
+
+Notes:
+- Payloads are the raw JSON bodies, zlib-compressed; the key includes `next_token`,
+  so every page of a pagination is cached separately.
+- Entries expire after `ttl` seconds; beyond `max_bytes` the least recently used
+  entries are evicted.
+- Searches without an explicit start/end time resolve against "now" server-side;
+  replaying them from the cache returns the window as it was when cached.
+===========================================================================
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Callable, Optional
+
+DEFAULT_TTL = 7 * 24 * 3600  # recent search never reaches further back than this
+DEFAULT_MAX_BYTES = 512 * 2**20
+
+
+class CacheMiss(LookupError):
+    """Raised in offline mode when a request has no cached response."""
+
+
+class ResponseCache:
+    """Thread-safe SQLite store of compressed response payloads."""
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        ttl: Optional[float] = DEFAULT_TTL,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            " key TEXT PRIMARY KEY, endpoint TEXT NOT NULL, stored_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL, size INTEGER NOT NULL, payload BLOB NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS pages_accessed ON pages (accessed_at)")
+
+    @staticmethod
+    def key(endpoint: str, params: dict) -> str:
+        """Stable digest of the endpoint and its request parameters (None values dropped)."""
+        canonical = {k: v for k, v in params.items() if v is not None}
+        blob = json.dumps([endpoint, canonical], sort_keys=True, default=str)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        now = self._clock()
+        with self._lock:
+            found = self._db.execute(
+                "SELECT stored_at, payload FROM pages WHERE key = ?", (key,)
+            ).fetchone()
+            if found is not None and self.ttl is not None and now - found[0] > self.ttl:
+                self._db.execute("DELETE FROM pages WHERE key = ?", (key,))
+                found = None
+            if found is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._db.execute("UPDATE pages SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(zlib.decompress(found[1]))
+
+    def put(self, key: str, endpoint: str, payload: dict) -> None:
+        blob = zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+        now = self._clock()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?)",
+                (key, endpoint, now, now, len(blob), blob),
+            )
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        if self.ttl is not None:
+            self._db.execute("DELETE FROM pages WHERE stored_at < ?", (now - self.ttl,))
+        (total,) = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()
+        if total <= self.max_bytes:
+            return
+        freed = 0
+        doomed = []
+        for key, size in self._db.execute("SELECT key, size FROM pages ORDER BY accessed_at"):
+            if total - freed <= self.max_bytes:
+                break
+            doomed.append((key,))
+            freed += size
+        self._db.executemany("DELETE FROM pages WHERE key = ?", doomed)
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "bytes": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self) -> "ResponseCache":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -1,72 +1,950 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-"""
-===========================================================================
-Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
-File: cli.py
-Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
-Created: 2025-10-25
-Updated: 2025-10-25
-License: MIT License (see LICENSE file for details)
-===========================================================================
-
-Description:
-Command-line interface to search recent tweets and export results to CSV.
-
-Usage:
-python -m twitter_extractor.cli "python lang:en -is:retweet" --pages 2 --out outputs/tweets.csv
-
-Notes:
-- Uses argparse; integrates with entry point `twitter-extractor`.
-===========================================================================
-"""
-from __future__ import annotations
-
-import argparse
-from pathlib import Path
-
-import pandas as pd
-
-from .api import TwitterClient
-from .io_utils import to_dataframe, save_csv
-from .utils import flatten_tweets
-
-
-def parse_args() -> argparse.Namespace:
-    p = argparse.ArgumentParser(
-        description="Search recent tweets and save to CSV (Tweepy v2)",
-    )
-    p.add_argument("query", help="Search query, e.g. 'python (lang:en)' ")
-    p.add_argument("--out", type=Path, default=Path("outputs/tweets.csv"), help="CSV path")
-    p.add_argument("--max-results", type=int, default=100, help="Max results per page (10..100)")
-    p.add_argument("--pages", type=int, default=2, help="How many pages to fetch (x*max-results)")
-    p.add_argument("--start-time", type=str, default=None, help="ISO8601 start time")
-    p.add_argument("--end-time", type=str, default=None, help="ISO8601 end time")
-    return p.parse_args()
-
-
-def main() -> int:
-    args = parse_args()
-    client = TwitterClient()
-
-    all_rows = []
-    for page in client.search(
-        query=args.query,
-        max_results=args.max_results,
-        start_time=args.start_time,
-        end_time=args.end_time,
-        limit_pages=args.pages,
-    ):
-        tweets = page.data or []
-        rows = flatten_tweets(tweets, includes=page.includes)
-        all_rows.extend(rows)
-
-    df = to_dataframe(all_rows)
-    save_csv(df, args.out)
-
-    print(f"Saved {len(df)} rows to {args.out}")
-    return 0
-
-
-if __name__ == "__main__":  # pragma: no cover
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: cli.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-10-25
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Command-line interface to search recent tweets and export results to CSV/JSONL/Parquet.
+
+Usage:
+python -m twitter_extractor.cli "python lang:en -is:retweet" --pages 2 --out outputs/tweets.csv
+python -m twitter_extractor.cli "python lang:en -is:retweet" --pages 50 --resume
+python -m twitter_extractor.cli --queries-file queries.txt --concurrency 8
+python -m twitter_extractor.cli "python lang:en" --follow --out outputs/python.csv
+python -m twitter_extractor.cli "python lang:en" --stream --out outputs/live.jsonl
+
+Notes:
+- Uses argparse; integrates with entry point `twitter-extractor`.
+- Pages are streamed to the output sink in batches; memory does not grow with page count.
+- Progress is checkpointed per page; `--resume` continues an interrupted run.
+- `--slices N` splits the time window and pages the slices concurrently.
+- `--queries-file` runs many queries concurrently on the asyncio client and prints a
+  per-query summary; `--combined` writes them all into one --out.
+- `--incremental`/`--follow` fetch only tweets newer than the last run (since_id).
+- `--rate-limit-stats` dumps per-token usage and rate-limit queue wait as JSON.
+- `--cache` stores raw search pages in SQLite; `--offline` replays them only.
+- A `.db` --out upserts into the de-duplicating tweet store; `--export-from` reads it back.
+- `--lookup-ids` hydrates known ids (100 per request); `--refresh-after` skips fresh ones.
+- `--plan`/`--dry-run` size the run from the tweet-counts endpoint before fetching.
+- `--metrics` exports per-stage timers/counters; `--profile` prints cProfile hot paths.
+- A .gz/.zst --out compresses on the fly; `--rotate-every`/`--rotate-mb` roll files over.
+- `--enrich` adds entity columns/normalisation in a process pool before the writers.
+- `--threads` writes conversations as nested JSONL; `--fetch-threads` fills in missing members.
+- `--aggregate` writes running per-bucket/lang totals and author sketches as a JSON summary
+  (`--aggregate-only` skips the rows).
+- `--stream` consumes the filtered stream (the query becomes a rule) through a bounded
+  queue with reconnect backoff; `--add-rule`/`--delete-rule`/`--list-rules` manage rules.
+- `--user-cache` persists the author LRU (username/name columns) across runs.
+- tweepy/asyncio and the pipeline modules are imported inside the run paths, so
+  `--help` and argument errors return without loading them.
+===========================================================================
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Sequence
+
+from .io_utils import DEFAULT_BATCH_SIZE
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .api import TwitterClient
+    from .metrics import Metrics
+    from .users import UserCache
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(
+        description="Search recent tweets and save to CSV (Tweepy v2)",
+    )
+    p.add_argument("query", nargs="?", help="Search query, e.g. 'python (lang:en)' ")
+    p.add_argument(
+        "--out",
+        type=Path,
+        default=Path("outputs/tweets.csv"),
+        help="Output path (.csv, .jsonl, .parquet or .db tweet store); format follows extension",
+    )
+    p.add_argument(
+        "--partition-by",
+        type=lambda v: tuple(k.strip() for k in v.split(",") if k.strip()),
+        default=(),
+        help="Hive-partition Parquet output by 'date', 'lang' or 'date,lang' "
+        "(--out is a directory)",
+    )
+    p.add_argument("--max-results", type=int, default=100, help="Max results per page (10..100)")
+    p.add_argument(
+        "--pages",
+        type=int,
+        default=None,
+        help="How many pages to fetch (x*max-results); default 2, unlimited with --incremental",
+    )
+    p.add_argument("--start-time", type=str, default=None, help="ISO8601 start time")
+    p.add_argument("--end-time", type=str, default=None, help="ISO8601 end time")
+    p.add_argument(
+        "--compress-level",
+        type=int,
+        default=None,
+        help="gzip (1-9, default 6) or zstd (1-22, default 3) level for a .gz/.zst --out",
+    )
+    p.add_argument(
+        "--rotate-every",
+        choices=("minute", "hour", "day"),
+        default=None,
+        help="Roll --out over to a new timestamped file every minute/hour/day (UTC)",
+    )
+    p.add_argument(
+        "--rotate-mb",
+        type=float,
+        default=None,
+        help="Roll --out over once a file reaches this size",
+    )
+    p.add_argument(
+        "--enrich",
+        action="append",
+        default=[],
+        metavar="NAMES",
+        help="Enrich rows before writing: comma-separated entities, normalize, lang or "
+        "module:function transforms (repeatable)",
+    )
+    p.add_argument(
+        "--enrich-workers",
+        type=int,
+        default=None,
+        help="Processes for --enrich (default: CPU count; 0 runs the transforms inline)",
+    )
+    p.add_argument(
+        "--threads",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help="Also assemble conversations (conversation_id) and write them as nested JSONL",
+    )
+    p.add_argument(
+        "--fetch-threads",
+        action="store_true",
+        help="With --threads, search conversation_id: for roots/parents missing from a thread",
+    )
+    p.add_argument(
+        "--thread-idle",
+        type=float,
+        default=None,
+        help="Write a conversation once it got no tweets for this many seconds (--follow)",
+    )
+    p.add_argument(
+        "--thread-max",
+        type=int,
+        default=100_000,
+        help="Conversations held in memory before the least recently updated is written",
+    )
+    p.add_argument(
+        "--aggregate",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help="Also write a JSON summary: per-bucket/per-lang totals, top and distinct authors",
+    )
+    p.add_argument(
+        "--aggregate-only",
+        action="store_true",
+        help="Write only the --aggregate summary, not the rows",
+    )
+    p.add_argument(
+        "--aggregate-bucket",
+        choices=("minute", "hour", "day"),
+        default="hour",
+        help="Time bucket of the --aggregate rollups",
+    )
+    p.add_argument(
+        "--top-authors",
+        type=int,
+        default=20,
+        help="Authors listed in the --aggregate summary (approximate top-k by tweets)",
+    )
+    p.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="Rows buffered before each write to the output file",
+    )
+    p.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=None,
+        help="Checkpoint file (default: .checkpoints.json next to --out)",
+    )
+    p.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue the last interrupted run for this query/window instead of starting over",
+    )
+    p.add_argument(
+        "--slices",
+        type=int,
+        default=1,
+        help="Split the start/end window into N slices searched concurrently (--pages per slice)",
+    )
+    p.add_argument("--workers", type=int, default=4, help="Concurrent slices when --slices > 1")
+    p.add_argument(
+        "--plan",
+        action="store_true",
+        help="Count the query's tweets per hour first, print the plan, then fetch exactly the "
+        "planned pages (volume-balanced windows with --slices)",
+    )
+    p.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print the --plan (volume, requests, estimated time) and exit without fetching",
+    )
+    p.add_argument(
+        "--search-rate-limit",
+        type=int,
+        default=450,
+        help="Search requests per 15 minutes per token assumed by --plan (API tier dependent)",
+    )
+    p.add_argument(
+        "--queries-file",
+        type=Path,
+        default=None,
+        help="Query file (.txt one per line, or .json/.yaml with per-query windows/pages), "
+        "run concurrently; writes one --out file per query",
+    )
+    p.add_argument(
+        "--combined",
+        action="store_true",
+        help="With --queries-file, write all queries into --out, told apart by a `query` column",
+    )
+    p.add_argument(
+        "--concurrency", type=int, default=4, help="Queries in flight with --queries-file"
+    )
+    p.add_argument(
+        "--rate-limit-stats",
+        type=Path,
+        default=None,
+        help="Write per-token request counts, utilisation and queue wait time to this JSON file",
+    )
+    p.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only fetch tweets newer than the last run for this query and append to --out",
+    )
+    p.add_argument(
+        "--follow",
+        action="store_true",
+        help="Keep polling incrementally at an adaptive interval until interrupted",
+    )
+    p.add_argument(
+        "--state",
+        type=Path,
+        default=None,
+        help="since_id state file for --incremental (default: .since_ids.json next to --out)",
+    )
+    p.add_argument(
+        "--stream",
+        action="store_true",
+        help="Consume the filtered stream into --out (appending) until interrupted; "
+        "a query is added as a stream rule first",
+    )
+    p.add_argument(
+        "--add-rule",
+        action="append",
+        default=[],
+        metavar="VALUE",
+        help="Add a filtered-stream rule, tagged with its value (repeatable)",
+    )
+    p.add_argument(
+        "--delete-rule",
+        action="append",
+        default=[],
+        metavar="ID",
+        help="Delete a filtered-stream rule by id, or 'all' (repeatable)",
+    )
+    p.add_argument(
+        "--list-rules", action="store_true", help="Print the active filtered-stream rules"
+    )
+    p.add_argument(
+        "--stream-limit", type=int, default=None, help="Stop --stream after this many tweets"
+    )
+    p.add_argument(
+        "--stream-seconds", type=float, default=None, help="Stop --stream after this many seconds"
+    )
+    p.add_argument(
+        "--stream-queue",
+        type=int,
+        default=10_000,
+        help="Tweets buffered between the stream and the writers; beyond it they are dropped",
+    )
+    p.add_argument(
+        "--stream-flush",
+        type=float,
+        default=1.0,
+        help="Seconds between --stream writes/flushes of the buffered tweets",
+    )
+    p.add_argument("--poll-min", type=float, default=15.0, help="Shortest --follow interval (s)")
+    p.add_argument("--poll-max", type=float, default=900.0, help="Longest --follow interval (s)")
+    p.add_argument(
+        "--user-cache",
+        type=Path,
+        default=None,
+        help="Persist the author id -> username/name LRU cache in this JSON file across runs",
+    )
+    p.add_argument(
+        "--user-cache-size", type=int, default=100_000, help="Max authors kept in the user cache"
+    )
+    p.add_argument(
+        "--cache",
+        type=Path,
+        default=None,
+        help="SQLite response cache; identical search requests are replayed from it",
+    )
+    p.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=7 * 24 * 3600,
+        help="Seconds a cached page stays valid (0 = never expires)",
+    )
+    p.add_argument("--cache-max-mb", type=float, default=512.0, help="Response cache size cap")
+    p.add_argument(
+        "--offline",
+        action="store_true",
+        help="Serve searches from --cache only; fail on a cache miss instead of calling the API",
+    )
+    p.add_argument(
+        "--export-from",
+        type=Path,
+        default=None,
+        help="Export rows from a .db tweet store to --out instead of searching "
+        "(filtered by --start-time/--end-time/--author-id/--conversation-id)",
+    )
+    p.add_argument(
+        "--lookup-ids",
+        type=Path,
+        default=None,
+        help="Hydrate the tweet ids in this file (one per line) in 100-id requests instead of "
+        "searching; --workers requests run concurrently",
+    )
+    p.add_argument(
+        "--refresh-after",
+        type=float,
+        default=None,
+        help="With --lookup-ids and a .db --out, skip ids whose metrics are newer than this (s)",
+    )
+    p.add_argument("--author-id", default=None, help="Only export this author's tweets")
+    p.add_argument(
+        "--metrics",
+        action="append",
+        default=[],
+        metavar="SPEC",
+        help="Export per-stage timers/counters: json[:PATH], prom:PATH, prom-http:[HOST:]PORT "
+        "or otel (repeatable)",
+    )
+    p.add_argument(
+        "--profile",
+        type=int,
+        nargs="?",
+        const=25,
+        default=None,
+        metavar="N",
+        help="Run under cProfile and print the N (default 25) hottest paths to stderr",
+    )
+    p.add_argument("--conversation-id", default=None, help="Only export this conversation")
+    args = p.parse_args(argv)
+    args.incremental = args.incremental or args.follow
+    args.plan = args.plan or args.dry_run
+    if args.plan and (
+        args.query is None or args.incremental or args.resume or args.search_rate_limit < 1
+    ):
+        p.error("--plan/--dry-run need a single query without --incremental/--follow/--resume")
+    if args.pages is None and not args.plan:
+        args.pages = 0 if args.incremental else 2
+    if args.incremental and (args.resume or args.slices > 1 or args.queries_file is not None):
+        p.error("--incremental/--follow cannot be combined with --resume, --slices, --queries-file")
+    if not 0 < args.poll_min <= args.poll_max:
+        p.error("--poll-min must be > 0 and <= --poll-max")
+    rules = bool(args.add_rule or args.delete_rule or args.list_rules)
+    if args.stream or rules:
+        if (
+            args.queries_file is not None or args.export_from is not None
+            or args.lookup_ids is not None or args.incremental or args.resume
+            or args.slices > 1 or args.plan or args.cache is not None or args.fetch_threads
+        ):
+            p.error(
+                "--stream and the rule flags cannot be combined with --queries-file, "
+                "--export-from, --lookup-ids, --incremental, --resume, --slices, --plan, "
+                "--cache or --fetch-threads"
+            )
+        if args.query is not None and not args.stream:
+            p.error("a query with --add-rule/--delete-rule/--list-rules needs --stream")
+        if args.stream_queue < 1 or args.stream_flush <= 0:
+            p.error("--stream-queue must be >= 1 and --stream-flush > 0")
+    else:
+        modes = (args.query, args.queries_file, args.export_from, args.lookup_ids)
+        if sum(x is not None for x in modes) != 1:
+            p.error("give exactly one of a query, --queries-file, --export-from or --lookup-ids")
+    for flag, value in (("--export-from", args.export_from), ("--lookup-ids", args.lookup_ids)):
+        if value is not None and (args.incremental or args.resume or args.slices > 1):
+            p.error(f"{flag} cannot be combined with --incremental, --resume or --slices")
+    if args.refresh_after is not None and args.lookup_ids is None:
+        p.error("--refresh-after needs --lookup-ids")
+    if args.queries_file is not None and (args.resume or args.slices > 1):
+        p.error("--resume and --slices are not supported with --queries-file")
+    if min(args.slices, args.workers, args.concurrency, args.user_cache_size) < 1:
+        p.error("--slices, --workers, --concurrency and --user-cache-size must be >= 1")
+    if args.offline and args.cache is None:
+        p.error("--offline needs --cache")
+    if args.queries_file is not None and args.cache is not None:
+        p.error("--cache is not supported with --queries-file")
+    if args.follow and args.offline:
+        p.error("--follow cannot run --offline")
+    if args.slices > 1 and args.resume:
+        p.error("--resume is not supported with --slices")
+    rotating = args.rotate_every is not None or args.rotate_mb is not None
+    if args.resume and (rotating or args.out.suffix.lower() in (".gz", ".zst")):
+        p.error("--resume needs an uncompressed, non-rotating --out")
+    if rotating and args.queries_file is not None:
+        p.error("--rotate-every/--rotate-mb are not supported with --queries-file")
+    args.enrich = [name.strip() for spec in args.enrich for name in spec.split(",") if name.strip()]
+    if args.enrich and args.queries_file is not None:
+        p.error("--enrich is not supported with --queries-file")
+    if args.enrich_workers is not None and args.enrich_workers < 0:
+        p.error("--enrich-workers must be >= 0")
+    if args.threads is not None and args.queries_file is not None:
+        p.error("--threads is not supported with --queries-file")
+    if args.fetch_threads and args.threads is None:
+        p.error("--fetch-threads needs --threads")
+    if args.thread_max < 1 or (args.thread_idle is not None and args.thread_idle <= 0):
+        p.error("--thread-max must be >= 1 and --thread-idle > 0")
+    if args.aggregate is not None and args.queries_file is not None:
+        p.error("--aggregate is not supported with --queries-file")
+    if args.aggregate_only:
+        if args.aggregate is None:
+            p.error("--aggregate-only needs --aggregate")
+        if args.resume or args.refresh_after is not None:
+            p.error("--aggregate-only cannot be combined with --resume or --refresh-after")
+        args.out = args.aggregate  # the summary is the run's only output
+    if args.top_authors < 1:
+        p.error("--top-authors must be >= 1")
+    return args
+
+
+def _make_client(
+    args: argparse.Namespace, metrics: Optional["Metrics"] = None
+) -> "TwitterClient":
+    from .api import TwitterClient
+
+    # Raw JSON pages are flattened column-wise, without building tweepy.Tweet objects.
+    if args.cache is None:
+        return TwitterClient(raw=True, metrics=metrics)
+    from .cache import ResponseCache
+
+    cache = ResponseCache(
+        args.cache, ttl=args.cache_ttl or None, max_bytes=int(args.cache_max_mb * 2**20)
+    )
+    return TwitterClient(cache=cache, offline=args.offline, raw=True, metrics=metrics)
+
+
+def _sink_options(args: argparse.Namespace) -> dict:
+    """Compression/rotation keywords for open_sink."""
+    return {
+        "compress_level": args.compress_level,
+        "rotate_bytes": int(args.rotate_mb * 2**20) if args.rotate_mb else None,
+        "rotate_every": args.rotate_every,
+    }
+
+
+def _open_out(args: argparse.Namespace, *, append: bool = False):
+    """open_sink for --out, or None with --aggregate-only (rows are only aggregated)."""
+    if args.aggregate_only:
+        return None
+    from .io_utils import open_sink
+
+    return open_sink(
+        args.out,
+        batch_size=args.batch_size,
+        append=append,
+        partition_by=args.partition_by,
+        **_sink_options(args),
+    )
+
+
+def _prepare_sink(
+    sink,
+    args: argparse.Namespace,
+    metrics: Optional["Metrics"],
+    *,
+    client: Optional["TwitterClient"] = None,
+    users: Optional["UserCache"] = None,
+):
+    """Attach `metrics` to the sink and wrap it in the --aggregate/--threads/--enrich stages."""
+    if sink is not None:
+        sink.metrics = metrics
+    if args.aggregate is not None:
+        from .aggregate import AggregatingSink, Rollup
+
+        sink = AggregatingSink(
+            sink,
+            args.aggregate,
+            rollup=Rollup(bucket=args.aggregate_bucket, top_k=args.top_authors),
+            metrics=metrics,
+        )
+        args.rollup = sink.rollup  # reported by _run once the sink is closed
+    if args.threads is not None:
+        from .threads import ThreadSink
+
+        sink = ThreadSink(
+            sink,
+            args.threads,
+            client=client if args.fetch_threads else None,
+            max_conversations=args.thread_max,
+            idle_seconds=args.thread_idle,
+            users=users,
+            metrics=metrics,
+        )
+        args.thread_stats = sink.stats  # reported by _run once the sink is closed
+    if not args.transforms:
+        return sink
+    from .enrich import EnrichingSink
+
+    return EnrichingSink(
+        sink,
+        args.transforms,
+        workers=args.enrich_workers,
+        chunk_size=args.batch_size,
+        metrics=metrics,
+    )
+
+
+def _write_rate_limit_stats(client: "TwitterClient", path: Optional[Path]) -> None:
+    if path is None or client.scheduler is None:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(client.scheduler.stats(), indent=2), encoding="utf-8")
+
+
+def _finish_client(client: "TwitterClient", args: argparse.Namespace) -> None:
+    _write_rate_limit_stats(client, args.rate_limit_stats)
+    if client.cache is not None:
+        stats = client.cache.stats()
+        print(f"Response cache: {stats['hits']} hits, {stats['misses']} misses")
+        client.cache.close()
+
+
+async def _run_queries_file(
+    args: argparse.Namespace, users: "UserCache", metrics: Optional["Metrics"]
+) -> int:
+    from .api import AsyncTwitterClient
+    from .batch import format_summary, read_query_specs, run_batch
+
+    specs = read_query_specs(args.queries_file)
+    async with AsyncTwitterClient(connection_limit=max(args.concurrency, 1) * 2) as client:
+        results = await run_batch(
+            client,
+            specs,
+            out=args.out,
+            concurrency=args.concurrency,
+            max_results=args.max_results,
+            start_time=args.start_time,
+            end_time=args.end_time,
+            limit_pages=args.pages,
+            users=users,
+            batch_size=args.batch_size,
+            combined=args.combined,
+            metrics=metrics,
+        )
+    print(format_summary(results))
+    if args.combined:
+        print(f"Saved {sum(r.rows for r in results)} rows to {args.out}")
+    return 1 if any(r.error is not None for r in results) else 0
+
+
+def _run_incremental(
+    args: argparse.Namespace, users: "UserCache", metrics: Optional["Metrics"]
+) -> int:
+    from .pipeline import extract_since, follow
+    from .state import HighWaterMarkStore
+
+    marks = HighWaterMarkStore(args.state or args.out.parent / ".since_ids.json")
+    client = _make_client(args, metrics)
+    try:
+        sink = _open_out(args, append=True)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    sink = _prepare_sink(sink, args, metrics, client=client, users=users)
+    with sink:
+        if not args.follow:
+            cp = extract_since(
+                client,
+                sink,
+                marks,
+                query=args.query,
+                max_results=args.max_results,
+                limit_pages=args.pages,
+                users=users,
+                metrics=metrics,
+            )
+            if not cp.done:
+                print("warning: page limit reached before catching up; re-run to continue")
+        else:
+            def report(cp, interval: float) -> None:
+                print(f"+{cp.rows_written} rows; next poll in {interval:.0f}s", flush=True)
+
+            try:
+                follow(
+                    client,
+                    sink,
+                    marks,
+                    query=args.query,
+                    max_results=args.max_results,
+                    limit_pages=args.pages,
+                    users=users,
+                    metrics=metrics,
+                    min_interval=args.poll_min,
+                    max_interval=args.poll_max,
+                    on_poll=report,
+                )
+            except KeyboardInterrupt:
+                pass
+
+    _finish_client(client, args)
+    print(f"Appended {sink.rows_written} new rows to {args.out}")
+    return 0
+
+
+def _run_export(args: argparse.Namespace, metrics: Optional["Metrics"]) -> int:
+    from .store import TweetStore
+
+    if not args.export_from.exists():
+        print(f"error: no tweet store at {args.export_from}", file=sys.stderr)
+        return 2
+    try:
+        sink = _open_out(args)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    client = _make_client(args, metrics) if args.fetch_threads else None
+    sink = _prepare_sink(sink, args, metrics, client=client)
+    with TweetStore(args.export_from) as store, sink:
+        for batch in store.select(
+            start_time=args.start_time,
+            end_time=args.end_time,
+            author_id=args.author_id,
+            conversation_id=args.conversation_id,
+        ):
+            sink.write(batch)
+    if client is not None:
+        _finish_client(client, args)
+    print(f"Exported {sink.rows_written} rows from {args.export_from} to {args.out}")
+    return 0
+
+
+def _run_lookup(
+    args: argparse.Namespace, users: "UserCache", metrics: Optional["Metrics"]
+) -> int:
+    from .io_utils import StoreSink
+    from .lookup import LookupStats, lookup_tweets, read_ids
+
+    if not args.lookup_ids.exists():
+        print(f"error: no id file at {args.lookup_ids}", file=sys.stderr)
+        return 2
+    try:
+        sink = _open_out(args)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    if args.refresh_after is not None and not isinstance(sink, StoreSink):
+        sink.close()
+        print("error: --refresh-after needs a .db/.sqlite --out", file=sys.stderr)
+        return 2
+
+    client = _make_client(args, metrics)
+    stats = LookupStats()
+    store = sink.store if isinstance(sink, StoreSink) else None
+    sink = _prepare_sink(sink, args, metrics, client=client, users=users)
+    with sink:
+        for rows in lookup_tweets(
+            client,
+            read_ids(args.lookup_ids),
+            workers=args.workers,
+            users=users,
+            store=store,
+            max_age=args.refresh_after,
+            stats=stats,
+            metrics=metrics,
+        ):
+            sink.write(rows)
+    _finish_client(client, args)
+    print(
+        f"Looked up {stats.requested} ids ({stats.skipped} still fresh, "
+        f"{stats.requests} requests): saved {stats.found} rows to {args.out}"
+    )
+    return 0
+
+
+def _run_search(
+    args: argparse.Namespace, users: "UserCache", metrics: Optional["Metrics"]
+) -> int:
+    from .parallel import search_sliced
+    from .pipeline import extract
+    from .state import CheckpointStore
+
+    store = CheckpointStore(args.checkpoint or args.out.parent / ".checkpoints.json")
+
+    cp = store.get(args.query, args.start_time, args.end_time) if args.resume else None
+    if cp is not None and cp.done:
+        print(f"Nothing to resume: {cp.rows_written} rows already saved to {args.out}")
+        return 0
+    if cp is not None and args.out.is_dir():
+        print("error: --resume needs a single-file CSV/JSONL output", file=sys.stderr)
+        return 2
+    if cp is not None and (cp.out is None or Path(cp.out).resolve() != args.out.resolve()):
+        print(
+            f"error: the checkpoint for this query was written to {cp.out or 'another output'}, "
+            f"not {args.out}; re-run without --resume",
+            file=sys.stderr,
+        )
+        return 2
+
+    client = _make_client(args, metrics)
+    windows = None
+    if args.plan:
+        from .planner import format_plan, plan_extraction
+
+        try:
+            plan = plan_extraction(
+                client,
+                args.query,
+                start_time=args.start_time,
+                end_time=args.end_time,
+                max_results=args.max_results,
+                slices=args.slices,
+                workers=args.workers,
+                rate_limit=args.search_rate_limit,
+            )
+        except ValueError as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 2
+        print(format_plan(plan))
+        if args.dry_run or not plan.requests:
+            _finish_client(client, args)
+            if not args.dry_run:
+                print("Nothing to fetch: no tweets match in this window")
+            return 0
+        # Pin the counted window; sliced runs page each balanced window up to its budget.
+        args.start_time, args.end_time = plan.start_time, plan.end_time
+        budget = plan.max_pages if args.slices > 1 else plan.requests
+        if args.pages and args.pages < budget:
+            print(f"warning: --pages {args.pages} covers only part of the {budget}-page plan")
+        else:
+            args.pages = budget
+        windows = plan.search_windows()
+    existed = args.out.exists()
+    try:
+        sink = _open_out(args, append=cp is not None)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    if cp is not None and existed and sink.byte_offsets:
+        # The sink accepted append mode; drop anything written after the last
+        # checkpointed page (stores upsert instead).
+        os.truncate(args.out, min(cp.out_offset, os.path.getsize(args.out)))
+
+    sink = _prepare_sink(sink, args, metrics, client=client, users=users)
+    if args.slices > 1:
+        with sink:
+            for rows in search_sliced(
+                client,
+                args.query,
+                start_time=args.start_time,
+                end_time=args.end_time,
+                slices=args.slices,
+                workers=args.workers,
+                max_results=args.max_results,
+                limit_pages=args.pages,
+                users=users,
+                metrics=metrics,
+                windows=windows,
+            ):
+                sink.write(rows)
+        _finish_client(client, args)
+        print(f"Saved {sink.rows_written} rows to {args.out}")
+        return 0
+
+    with sink:
+        cp = extract(
+            client,
+            sink,
+            query=args.query,
+            max_results=args.max_results,
+            start_time=args.start_time,
+            end_time=args.end_time,
+            limit_pages=args.pages,
+            users=users,
+            checkpoints=store,
+            resume_from=cp,
+            metrics=metrics,
+        )
+
+    _finish_client(client, args)
+    print(f"Saved {cp.rows_written} rows to {args.out}")
+    return 0
+
+
+def _make_stream(args: argparse.Namespace, metrics: Optional["Metrics"] = None):
+    from .config import load_credentials
+    from .stream import FilteredStream
+
+    return FilteredStream(
+        load_credentials().bearer_token, max_queue=args.stream_queue, metrics=metrics
+    )
+
+
+def _run_stream(
+    args: argparse.Namespace, users: "UserCache", metrics: Optional["Metrics"]
+) -> int:
+    import tweepy
+
+    from .stream import consume, delete_rules, ensure_rules, list_rules
+
+    stream = _make_stream(args, metrics)
+    try:
+        if args.delete_rule:
+            print(f"Deleted {delete_rules(stream, args.delete_rule)} stream rules")
+        added = ensure_rules(stream, args.add_rule + ([args.query] if args.query else []))
+        for rule in added:
+            print(f"Added stream rule {rule.id}: {rule.value}")
+        if args.list_rules:
+            for rule in list_rules(stream):
+                print(f"{rule.id}\t{rule.tag or ''}\t{rule.value}")
+    except (ValueError, tweepy.TweepyException) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    if not args.stream:
+        return 0
+    try:
+        sink = _open_out(args, append=True)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    def report(stats) -> None:
+        print(
+            f"+{stats.written} rows (queue {stream.queue.qsize()}, dropped {stats.dropped}, "
+            f"reconnects {stats.reconnects})",
+            flush=True,
+        )
+
+    sink = _prepare_sink(sink, args, metrics, users=users)
+    stream.start()
+    try:
+        with sink:
+            stats = consume(
+                stream,
+                sink,
+                batch_size=args.batch_size,
+                flush_seconds=args.stream_flush,
+                limit=args.stream_limit,
+                duration=args.stream_seconds,
+                users=users,
+                metrics=metrics,
+                on_flush=report,
+            )
+    finally:
+        stream.stop()
+    print(
+        f"Streamed {stats.written} rows to {args.out} (dropped {stats.dropped}, "
+        f"reconnects {stats.reconnects}, max lag {stats.max_lag:.1f}s)"
+    )
+    if stream.error is not None:
+        print(f"error: {stream.error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def _run(args: argparse.Namespace) -> int:
+    from .users import UserCache
+
+    args.transforms = []
+    if args.enrich:
+        from .enrich import resolve_transforms
+
+        try:
+            args.transforms = resolve_transforms(args.enrich)
+        except ValueError as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 2
+    metrics = None
+    if args.metrics:
+        from .metrics import build_metrics
+
+        try:
+            metrics = build_metrics(args.metrics)
+        except (ValueError, RuntimeError, OSError) as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 2
+    users = UserCache(args.user_cache_size, path=args.user_cache)
+    args.thread_stats = None
+    args.rollup = None
+    try:
+        if args.stream or args.add_rule or args.delete_rule or args.list_rules:
+            return _run_stream(args, users, metrics)
+        if args.queries_file is not None:
+            import asyncio
+
+            return asyncio.run(_run_queries_file(args, users, metrics))
+        if args.export_from is not None:
+            return _run_export(args, metrics)
+        if args.lookup_ids is not None:
+            return _run_lookup(args, users, metrics)
+        if args.incremental:
+            return _run_incremental(args, users, metrics)
+        return _run_search(args, users, metrics)
+    finally:
+        users.save()
+        if metrics is not None:
+            metrics.close()
+        if args.thread_stats is not None:
+            t = args.thread_stats
+            print(
+                f"Threads: {t.threads} conversations ({t.complete} complete, {t.tweets} tweets"
+                f"; {t.fetched} fetched in {t.requests} requests) -> {args.threads}"
+            )
+        if args.rollup is not None:
+            r = args.rollup
+            print(
+                f"Summary: {r.tweets} tweets in {len(r.buckets)} {r.bucket} buckets, "
+                f"~{r.distinct} authors -> {args.aggregate}"
+            )
+        if args.user_cache is not None:
+            stats = users.stats()
+            rate = "n/a" if stats["hit_rate"] is None else f"{stats['hit_rate']:.1%}"
+            print(f"User cache: {stats['size']} authors, hit rate {rate}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.profile is None:
+        return _run(args)
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(_run, args)
+    finally:
+        stats = pstats.Stats(profiler, stream=sys.stderr)
+        stats.sort_stats("cumulative").print_stats(args.profile)
+
+
+if __name__ == "__main__":  # pragma: no cover
     raise SystemExit(main())
\ No newline at end of file
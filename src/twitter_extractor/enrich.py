@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: enrich.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Enrichment stage between flattening and the writers: registered transforms run over row
+batches in a process pool.
+
+Usage:
+from twitter_extractor.enrich import EnrichingSink, resolve_transforms
+with EnrichingSink(open_sink(out), resolve_transforms(["entities", "normalize"])) as sink:
+    extract(client, sink, query="python")
+
+Notes:
+- A transform takes a TweetBatch and returns a TweetBatch (the same one, updated
+  with `set_column`, or a filtered `take`); it runs in a worker process, so it must
+  be a module-level function. Register one with `@register("name")`, or name it as
+  `package.module:function`.
+- Built-ins: `entities` (hashtags/mentions/urls columns), `normalize` (NFKC text,
+  collapsed whitespace) and `lang` (clears Twitter's no-language codes such as "und").
+- Backpressure: at most `max_pending` batches are in flight; `write` blocks on the
+  oldest one beyond that, so fetching never outruns enrichment. Output keeps input order.
+- `workers=0` runs the transforms inline (no pool). `tell()` drains the pool first,
+  so checkpointed runs (`--resume`) enrich one batch at a time.
+===========================================================================
+"""
+from __future__ import annotations
+
+import importlib
+import os
+import re
+import unicodedata
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence
+
+from .io_utils import Rows, RowSink, as_batch
+from .metrics import Metrics, timed
+from .models import TweetBatch
+
+Transform = Callable[[TweetBatch], TweetBatch]
+
+TRANSFORMS: Dict[str, Transform] = {}
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def register(name: str) -> Callable[[Transform], Transform]:
+    """Decorator adding a transform to `TRANSFORMS` under `name`."""
+
+    def decorator(fn: Transform) -> Transform:
+        TRANSFORMS[name] = fn
+        return fn
+
+    return decorator
+
+
+def resolve_transforms(specs: Sequence[str]) -> List[Transform]:
+    """Transforms for registered names or `module:function` paths, in order."""
+    transforms = []
+    for spec in specs:
+        if spec in TRANSFORMS:
+            transforms.append(TRANSFORMS[spec])
+            continue
+        module, _, attr = spec.partition(":")
+        if not attr:
+            raise ValueError(
+                f"Unknown transform {spec!r}; use one of {sorted(TRANSFORMS)} or module:function"
+            )
+        try:
+            transforms.append(getattr(importlib.import_module(module), attr))
+        except (ImportError, AttributeError) as e:
+            raise ValueError(f"Cannot load transform {spec!r}: {e}") from None
+    return transforms
+
+
+def apply_transforms(transforms: Sequence[Transform], batch: TweetBatch) -> TweetBatch:
+    for transform in transforms:
+        batch = transform(batch)
+    return batch
+
+
+# --- built-in transforms ---
+_HASHTAG = re.compile(r"(?<![\w&])#(\w+)")
+_MENTION = re.compile(r"(?<![\w@])@(\w{1,15})")
+_URL = re.compile(r"https?://[^\s<>\"']*[^\s<>\"'.,;:!?)\]]")  # no trailing punctuation
+_SPACE = re.compile(r"\s+")
+
+# Twitter's `lang` values that mean "no detectable language".
+UNDETERMINED_LANGS = frozenset({"und", "zxx", "qam", "qct", "qht", "qme", "qst"})
+
+
+def _joined(matches: List[str]) -> Optional[str]:
+    return " ".join(dict.fromkeys(matches)) or None  # de-duplicated, first-seen order
+
+
+@register("entities")
+def extract_entities(batch: TweetBatch) -> TweetBatch:
+    """Fill `hashtags`/`mentions` (lowercased, without #/@) and `urls` from the text."""
+    texts = [t or "" for t in batch.raw_column("text")]
+    batch.set_column("hashtags", [_joined(_HASHTAG.findall(t.lower())) for t in texts])
+    batch.set_column("mentions", [_joined(_MENTION.findall(t.lower())) for t in texts])
+    batch.set_column("urls", [_joined(_URL.findall(t)) for t in texts])
+    return batch
+
+
+@register("normalize")
+def normalize_text(batch: TweetBatch) -> TweetBatch:
+    """NFKC-normalise the text and collapse runs of whitespace."""
+    batch.set_column(
+        "text",
+        [_SPACE.sub(" ", unicodedata.normalize("NFKC", t or "")).strip()
+         for t in batch.raw_column("text")],
+    )
+    return batch
+
+
+@register("lang")
+def check_lang(batch: TweetBatch) -> TweetBatch:
+    """Lowercase `lang` and clear the codes Twitter uses for "no language"."""
+    batch.set_column(
+        "lang",
+        [None if not v or v.lower() in UNDETERMINED_LANGS else v.lower()
+         for v in batch.raw_column("lang")],
+    )
+    return batch
+
+
+class EnrichingSink:
+    """Sink wrapper that enriches rows in a process pool before writing them to `sink`.
+
+    Rows are grouped into `chunk_size` batches; each batch goes to a worker and
+    the results are written to the wrapped sink in submission order. Closing
+    the wrapper drains the pool and closes the wrapped sink.
+    """
+
+    def __init__(
+        self,
+        sink: RowSink,
+        transforms: Sequence[Transform],
+        *,
+        workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        metrics: Optional[Metrics] = None,
+    ):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be >= 1")
+        self.sink = sink
+        self.transforms = list(transforms)
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.max_pending = max_pending or 2 * max(1, self.workers)
+        self.chunk_size = chunk_size
+        self.metrics = metrics
+        self.path = sink.path
+        self._buffer = TweetBatch()
+        self._pending: deque = deque()
+        self._pool = ProcessPoolExecutor(self.workers) if self.workers > 0 else None
+        self._closed = False
+
+    @property
+    def rows_written(self) -> int:
+        return self.sink.rows_written
+
+    @property
+    def byte_offsets(self) -> bool:
+        return self.sink.byte_offsets
+
+    def write(self, rows: Rows) -> None:
+        if self._closed:
+            raise RuntimeError(f"Sink for {self.path} is closed.")
+        self._buffer.extend(as_batch(rows))
+        if len(self._buffer) >= self.chunk_size:
+            self._submit()
+
+    def _submit(self) -> None:
+        batch, self._buffer = self._buffer, TweetBatch()
+        if not len(batch):
+            return
+        if self._pool is None:
+            with timed(self.metrics, "enrich"):
+                batch = apply_transforms(self.transforms, batch)
+            self._emit(batch)
+            return
+        while len(self._pending) >= self.max_pending:
+            self._collect()  # backpressure: wait for the oldest batch
+        self._pending.append(self._pool.submit(apply_transforms, self.transforms, batch))
+        while self._pending and self._pending[0].done():
+            self._collect()
+
+    def _collect(self) -> None:
+        fut: Future = self._pending.popleft()
+        with timed(self.metrics, "enrich_wait"):
+            batch = fut.result()
+        self._emit(batch)
+
+    def _emit(self, batch: TweetBatch) -> None:
+        if self.metrics is not None:
+            self.metrics.incr("rows_enriched", len(batch))
+        self.sink.write(batch)
+
+    def flush(self) -> None:
+        """Enrich everything buffered or in flight and flush the wrapped sink."""
+        self._submit()
+        while self._pending:
+            self._collect()
+        self.sink.flush()
+
+    def tell(self) -> int:
+        self.flush()
+        return self.sink.tell()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        try:
+            self.flush()
+        finally:
+            self._shutdown()
+            self.sink.close()
+
+    def abort(self) -> None:
+        """Close after a failure: queued chunks are cancelled, not written."""
+        if self._closed:
+            return
+        self._shutdown()
+        self.sink.abort()
+
+    def _shutdown(self) -> None:
+        self._closed = True
+        for fut in self._pending:
+            fut.cancel()
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+
+    def __enter__(self) -> "EnrichingSink":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
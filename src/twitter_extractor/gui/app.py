@@ -1,115 +1,240 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-"""
-===========================================================================
-Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
-File: gui/app.py
-Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
-Created: 2025-10-25
-Updated: 2025-10-25
-License: MIT License (see LICENSE file for details)
-===========================================================================
-
-Description:
-Tkinter GUI to input search parameters and save tweets to CSV.
-
-Usage:
-from twitter_extractor.gui.app import run
-run()
-
-Notes:
-- Simple, blocking Tk mainloop; suitable for quick desktop usage.
-===========================================================================
-"""
-from __future__ import annotations
-
-import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
-from pathlib import Path
-
-from ..api import TwitterClient
-from ..io_utils import to_dataframe, save_csv
-from ..utils import flatten_tweets
-
-
-class TwitterGUI(tk.Tk):
-    def __init__(self) -> None:
-        super().__init__()
-        self.title("Twitter Extractor")
-        self.geometry("640x360")
-        self.resizable(False, False)
-        self._build()
-
-    def _build(self):
-        pad = {"padx": 10, "pady": 6}
-
-        frm = ttk.Frame(self)
-        frm.pack(fill=tk.BOTH, expand=True)
-
-        ttk.Label(frm, text="Query").grid(row=0, column=0, sticky="w", **pad)
-        self.q_var = tk.StringVar(value="python lang:en -is:retweet")
-        ttk.Entry(frm, textvariable=self.q_var, width=60).grid(row=0, column=1, columnspan=3, sticky="ew", **pad)
-
-        ttk.Label(frm, text="Max/Page").grid(row=1, column=0, sticky="w", **pad)
-        self.max_var = tk.IntVar(value=50)
-        ttk.Spinbox(frm, from_=10, to=100, textvariable=self.max_var, width=8).grid(row=1, column=1, sticky="w", **pad)
-
-        ttk.Label(frm, text="Pages").grid(row=1, column=2, sticky="w", **pad)
-        self.pages_var = tk.IntVar(value=2)
-        ttk.Spinbox(frm, from_=1, to=50, textvariable=self.pages_var, width=8).grid(row=1, column=3, sticky="w", **pad)
-
-        ttk.Label(frm, text="Start (ISO8601)").grid(row=2, column=0, sticky="w", **pad)
-        self.start_var = tk.StringVar()
-        ttk.Entry(frm, textvariable=self.start_var, width=30).grid(row=2, column=1, sticky="w", **pad)
-
-        ttk.Label(frm, text="End (ISO8601)").grid(row=2, column=2, sticky="w", **pad)
-        self.end_var = tk.StringVar()
-        ttk.Entry(frm, textvariable=self.end_var, width=30).grid(row=2, column=3, sticky="w", **pad)
-
-        ttk.Separator(frm).grid(row=3, column=0, columnspan=4, sticky="ew", pady=6)
-
-        ttk.Label(frm, text="Output CSV").grid(row=4, column=0, sticky="w", **pad)
-        self.out_var = tk.StringVar(value=str(Path("outputs/tweets.csv")))
-        ttk.Entry(frm, textvariable=self.out_var, width=50).grid(row=4, column=1, columnspan=2, sticky="ew", **pad)
-        ttk.Button(frm, text="Browse", command=self._browse).grid(row=4, column=3, sticky="w", **pad)
-
-        btns = ttk.Frame(frm)
-        btns.grid(row=5, column=0, columnspan=4, pady=12)
-        ttk.Button(btns, text="Fetch", command=self._fetch).pack(side=tk.LEFT, padx=6)
-        ttk.Button(btns, text="Quit", command=self.destroy).pack(side=tk.LEFT, padx=6)
-
-    def _browse(self):
-        path = filedialog.asksaveasfilename(
-            defaultextension=".csv", filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")]
-        )
-        if path:
-            self.out_var.set(path)
-
-    def _fetch(self):
-        try:
-            client = TwitterClient()
-            all_rows = []
-            for page in client.search(
-                query=self.q_var.get().strip(),
-                max_results=int(self.max_var.get()),
-                start_time=(self.start_var.get().strip() or None),
-                end_time=(self.end_var.get().strip() or None),
-                limit_pages=int(self.pages_var.get()),
-            ):
-                tweets = page.data or []
-                all_rows.extend(flatten_tweets(tweets, includes=page.includes))
-
-            df = to_dataframe(all_rows)
-            save_csv(df, Path(self.out_var.get()))
-            messagebox.showinfo("Done", f"Saved {len(df)} rows.")
-        except Exception as e:  # pragma: no cover - GUI surface
-            messagebox.showerror("Error", str(e))
-
-
-def run():  # pragma: no cover
-    app = TwitterGUI()
-    app.mainloop()
-
-
-if __name__ == "__main__":  # pragma: no cover
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: gui/app.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-10-25
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Tkinter GUI to input search parameters and save tweets to CSV.
+
+Usage:
+from twitter_extractor.gui.app import run
+run()
+
+Notes:
+- Fetching runs on a FetchWorker thread; the UI polls its event queue with
+  `after()`, so the window stays responsive through rate-limit waits.
+- Cancel stops after the current page and keeps the rows written so far.
+- Preview counts the query's tweets (planner.py) and fills in the window and page budget.
+===========================================================================
+"""
+from __future__ import annotations
+
+import queue
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+from pathlib import Path
+from typing import Optional
+
+from ..users import UserCache
+from .worker import FetchWorker, PlanWorker
+
+POLL_MS = 100
+
+
+class TwitterGUI(tk.Tk):
+    def __init__(self) -> None:
+        super().__init__()
+        self.title("Twitter Extractor")
+        self.geometry("640x440")
+        self.resizable(False, False)
+        self._worker: Optional[FetchWorker | PlanWorker] = None
+        self._users = UserCache()  # shared by every fetch in this window
+        self._build()
+        self.protocol("WM_DELETE_WINDOW", self._quit)
+
+    def _build(self):
+        pad = {"padx": 10, "pady": 6}
+
+        frm = ttk.Frame(self)
+        frm.pack(fill=tk.BOTH, expand=True)
+
+        ttk.Label(frm, text="Query").grid(row=0, column=0, sticky="w", **pad)
+        self.q_var = tk.StringVar(value="python lang:en -is:retweet")
+        ttk.Entry(frm, textvariable=self.q_var, width=60).grid(row=0, column=1, columnspan=3, sticky="ew", **pad)
+
+        ttk.Label(frm, text="Max/Page").grid(row=1, column=0, sticky="w", **pad)
+        self.max_var = tk.IntVar(value=50)
+        ttk.Spinbox(frm, from_=10, to=100, textvariable=self.max_var, width=8).grid(row=1, column=1, sticky="w", **pad)
+
+        ttk.Label(frm, text="Pages").grid(row=1, column=2, sticky="w", **pad)
+        self.pages_var = tk.IntVar(value=2)
+        ttk.Spinbox(frm, from_=1, to=50, textvariable=self.pages_var, width=8).grid(row=1, column=3, sticky="w", **pad)
+
+        ttk.Label(frm, text="Start (ISO8601)").grid(row=2, column=0, sticky="w", **pad)
+        self.start_var = tk.StringVar()
+        ttk.Entry(frm, textvariable=self.start_var, width=30).grid(row=2, column=1, sticky="w", **pad)
+
+        ttk.Label(frm, text="End (ISO8601)").grid(row=2, column=2, sticky="w", **pad)
+        self.end_var = tk.StringVar()
+        ttk.Entry(frm, textvariable=self.end_var, width=30).grid(row=2, column=3, sticky="w", **pad)
+
+        ttk.Label(frm, text="Slices").grid(row=3, column=0, sticky="w", **pad)
+        self.slices_var = tk.IntVar(value=1)
+        ttk.Spinbox(frm, from_=1, to=32, textvariable=self.slices_var, width=8).grid(
+            row=3, column=1, sticky="w", **pad
+        )
+
+        ttk.Label(frm, text="Workers").grid(row=3, column=2, sticky="w", **pad)
+        self.workers_var = tk.IntVar(value=4)
+        ttk.Spinbox(frm, from_=1, to=32, textvariable=self.workers_var, width=8).grid(
+            row=3, column=3, sticky="w", **pad
+        )
+
+        ttk.Separator(frm).grid(row=4, column=0, columnspan=4, sticky="ew", pady=6)
+
+        ttk.Label(frm, text="Output CSV").grid(row=5, column=0, sticky="w", **pad)
+        self.out_var = tk.StringVar(value=str(Path("outputs/tweets.csv")))
+        ttk.Entry(frm, textvariable=self.out_var, width=50).grid(row=5, column=1, columnspan=2, sticky="ew", **pad)
+        ttk.Button(frm, text="Browse", command=self._browse).grid(row=5, column=3, sticky="w", **pad)
+
+        btns = ttk.Frame(frm)
+        btns.grid(row=6, column=0, columnspan=4, pady=12)
+        self.preview_btn = ttk.Button(btns, text="Preview", command=self._preview)
+        self.preview_btn.pack(side=tk.LEFT, padx=6)
+        self.fetch_btn = ttk.Button(btns, text="Fetch", command=self._fetch)
+        self.fetch_btn.pack(side=tk.LEFT, padx=6)
+        self.cancel_btn = ttk.Button(btns, text="Cancel", command=self._cancel, state=tk.DISABLED)
+        self.cancel_btn.pack(side=tk.LEFT, padx=6)
+        ttk.Button(btns, text="Quit", command=self._quit).pack(side=tk.LEFT, padx=6)
+
+        self.progress = ttk.Progressbar(frm, mode="determinate")
+        self.progress.grid(row=7, column=0, columnspan=4, sticky="ew", **pad)
+        self.status_var = tk.StringVar(value="Idle")
+        ttk.Label(frm, textvariable=self.status_var).grid(
+            row=8, column=0, columnspan=4, sticky="w", **pad
+        )
+
+    def _browse(self):
+        path = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[
+                ("CSV Files", "*.csv"),
+                ("JSON Lines", "*.jsonl"),
+                ("Parquet", "*.parquet"),
+                ("All Files", "*.*"),
+            ],
+        )
+        if path:
+            self.out_var.set(path)
+
+    def _params(self) -> Optional[tuple]:
+        """(search params, slices, workers) from the form, or None after an error dialog."""
+        try:
+            params = dict(
+                query=self.q_var.get().strip(),
+                max_results=int(self.max_var.get()),
+                start_time=(self.start_var.get().strip() or None),
+                end_time=(self.end_var.get().strip() or None),
+                limit_pages=int(self.pages_var.get()),
+                users=self._users,
+            )
+            return params, int(self.slices_var.get()), int(self.workers_var.get())
+        except (tk.TclError, ValueError) as e:
+            messagebox.showerror("Error", str(e))
+            return None
+
+    def _preview(self):
+        if self._worker is not None:
+            return
+        form = self._params()
+        if form is None:
+            return
+        params, slices, workers = form
+        self._worker = PlanWorker(params, slices=slices, workers=workers)
+        self.status_var.set("Counting tweets...")
+        self.fetch_btn.configure(state=tk.DISABLED)
+        self.preview_btn.configure(state=tk.DISABLED)
+        self._worker.start()
+        self.after(POLL_MS, self._poll)
+
+    def _fetch(self):
+        if self._worker is not None:
+            return
+        form = self._params()
+        if form is None:
+            return
+        params, slices, workers = form
+        self._worker = FetchWorker(
+            Path(self.out_var.get()), params, slices=slices, workers=workers
+        )
+        # Every slice fetches up to `limit_pages` pages and each page is one progress event.
+        self.progress.configure(maximum=slices * params["limit_pages"], value=0)
+        self.status_var.set("Fetching...")
+        self.fetch_btn.configure(state=tk.DISABLED)
+        self.preview_btn.configure(state=tk.DISABLED)
+        self.cancel_btn.configure(state=tk.NORMAL)
+        self._worker.start()
+        self.after(POLL_MS, self._poll)
+
+    def _poll(self):
+        worker = self._worker
+        if worker is None:
+            return
+        try:
+            while True:
+                kind, data = worker.events.get_nowait()
+                if kind == "progress":
+                    self.progress.configure(value=data["pages"])
+                    self.status_var.set(f"{data['pages']} pages, {data['rows']} rows")
+                elif kind == "wait":
+                    self.status_var.set(f"Rate limited; waiting {data['seconds']:.0f}s...")
+                elif kind in ("done", "error", "plan"):
+                    self._finish(kind, data)
+                    return
+        except queue.Empty:
+            pass
+        self.after(POLL_MS, self._poll)
+
+    def _finish(self, kind: str, data: dict):
+        self._worker = None
+        self.fetch_btn.configure(state=tk.NORMAL)
+        self.preview_btn.configure(state=tk.NORMAL)
+        self.cancel_btn.configure(state=tk.DISABLED)
+        if kind == "error":
+            self.status_var.set("Failed")
+            messagebox.showerror("Error", data["message"])
+            return
+        if kind == "plan":
+            self._apply_plan(data)
+            return
+        verb = "Cancelled; kept" if data["cancelled"] else "Saved"
+        self.status_var.set(f"{verb} {data['rows']} rows")
+        messagebox.showinfo("Done", f"{verb} {data['rows']} rows.")
+
+    def _apply_plan(self, data: dict):
+        # Pin the counted window and fill in the page budget it needs.
+        plan = data["plan"]
+        slices = int(self.slices_var.get())
+        self.start_var.set(plan.start_time)
+        self.end_var.set(plan.end_time)
+        self.pages_var.set(max(1, plan.max_pages if slices > 1 else plan.requests))
+        self.status_var.set(f"{plan.total_tweets:,} tweets, {plan.requests:,} requests planned")
+        messagebox.showinfo("Plan", data["text"])
+
+    def _cancel(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            self.cancel_btn.configure(state=tk.DISABLED)
+            self.status_var.set("Cancelling after the current page...")
+
+    def _quit(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker.join(timeout=5)
+        self.destroy()
+
+
+def run():  # pragma: no cover
+    app = TwitterGUI()
+    app.mainloop()
+
+
+if __name__ == "__main__":  # pragma: no cover
     run()
\ No newline at end of file
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: gui/worker.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Background fetch and plan-preview workers for the GUI; they report to the Tk thread through a
+queue.
+
+Usage:
+worker = FetchWorker(Path("outputs/tweets.csv"), {"query": "python", "limit_pages": 2})
+worker.start()
+kind, data = worker.events.get()  # ("progress" | "wait" | "done" | "error", dict)
+
+Notes:
+- No Tk calls here: the UI polls `events` with `after()` and owns every widget.
+- cancel() stops after the current page (or interrupts a rate-limit wait); the
+  sink is closed normally, so rows fetched so far stay in the output file.
+- PlanWorker makes the single tweet-counts request behind the GUI's Preview button.
+===========================================================================
+"""
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+
+class Cancelled(Exception):
+    """Raised inside the worker when a rate-limit wait is interrupted by cancel()."""
+
+
+class FetchWorker(threading.Thread):
+    """Run one extraction (serial or sliced) off the UI thread.
+
+    Events put on `events` are ``(kind, data)`` tuples:
+
+    - ``("progress", {"pages": int, "rows": int})`` after every page; sliced runs count
+      pages across all slices
+    - ``("wait", {"seconds": float})`` when every token is rate limited
+    - ``("done", {"rows": int, "cancelled": bool})`` once the output is closed
+    - ``("error", {"message": str})`` if the run failed
+    """
+
+    def __init__(
+        self,
+        out: Path,
+        params: dict,
+        *,
+        slices: int = 1,
+        workers: int = 4,
+        client_factory: Optional[Callable[..., object]] = None,
+    ):
+        super().__init__(name="twitter-extractor-fetch", daemon=True)
+        self.out = Path(out)
+        self.params = params
+        self.slices = slices
+        self.workers = workers
+        self.events: "queue.Queue[tuple]" = queue.Queue()
+        self._cancel = threading.Event()
+        self._client_factory = client_factory
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def _sleep(self, seconds: float) -> None:
+        if self._cancel.wait(seconds):
+            raise Cancelled()
+
+    def _on_wait(self, seconds: float) -> None:
+        self.events.put(("wait", {"seconds": seconds}))
+
+    def _progress(self, pages: int, rows: int) -> None:
+        self.events.put(("progress", {"pages": pages, "rows": rows}))
+
+    def _make_client(self):
+        factory = self._client_factory
+        if factory is None:
+            from ..api import TwitterClient as factory
+        return factory(on_rate_limit_wait=self._on_wait, sleep=self._sleep)
+
+    def run(self) -> None:
+        from ..io_utils import open_sink
+        from ..parallel import search_sliced
+        from ..pipeline import extract
+
+        try:
+            client = self._make_client()
+            with open_sink(self.out) as sink:
+                try:
+                    if self.slices > 1:
+                        rows = 0
+                        for i, chunk in enumerate(
+                            search_sliced(
+                                client,
+                                slices=self.slices,
+                                workers=self.workers,
+                                should_stop=self._cancel.is_set,
+                                **self.params,
+                            ),
+                            start=1,
+                        ):
+                            sink.write(chunk)
+                            rows += len(chunk)
+                            self._progress(i, rows)
+                            if self.cancelled:
+                                break
+                    else:
+                        extract(
+                            client,
+                            sink,
+                            on_page=lambda cp: self._progress(cp.pages, cp.rows_written),
+                            should_stop=self._cancel.is_set,
+                            **self.params,
+                        )
+                except Cancelled:
+                    pass
+        except Exception as e:
+            self.events.put(("error", {"message": str(e)}))
+            return
+        self.events.put(("done", {"rows": sink.rows_written, "cancelled": self.cancelled}))
+
+
+class PlanWorker(threading.Thread):
+    """Plan an extraction (one tweet-counts request) off the UI thread.
+
+    Puts ``("plan", {"plan": ExtractionPlan, "text": str})`` or
+    ``("error", {"message": str})`` on `events`.
+    """
+
+    def __init__(
+        self,
+        params: dict,
+        *,
+        slices: int = 1,
+        workers: int = 4,
+        client_factory: Optional[Callable[..., object]] = None,
+    ):
+        super().__init__(name="twitter-extractor-plan", daemon=True)
+        self.params = params
+        self.slices = slices
+        self.workers = workers
+        self.events: "queue.Queue[tuple]" = queue.Queue()
+        self._client_factory = client_factory
+
+    def _make_client(self):
+        factory = self._client_factory
+        if factory is None:
+            from ..api import TwitterClient as factory
+        return factory(on_rate_limit_wait=self._on_wait, sleep=time.sleep)
+
+    def _on_wait(self, seconds: float) -> None:
+        self.events.put(("wait", {"seconds": seconds}))
+
+    def run(self) -> None:
+        from ..planner import format_plan, plan_extraction
+
+        try:
+            plan = plan_extraction(
+                self._make_client(),
+                self.params["query"],
+                start_time=self.params.get("start_time"),
+                end_time=self.params.get("end_time"),
+                max_results=self.params.get("max_results", 100),
+                slices=self.slices,
+                workers=self.workers,
+            )
+        except Exception as e:
+            self.events.put(("error", {"message": str(e)}))
+            return
+        self.events.put(("plan", {"plan": plan, "text": format_plan(plan)}))
@@ -1,43 +1,738 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-"""
-===========================================================================
-Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
-File: io_utils.py
-Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
-Created: 2025-10-25
-Updated: 2025-10-25
-License: MIT License (see LICENSE file for details)
-===========================================================================
-
-Description:
-DataFrame helpers and CSV persistence utilities for tweet rows.
-
-Usage:
-from twitter_extractor.io_utils import to_dataframe, save_csv
-
-Notes:
-- Ensures datetime columns are parsed to pandas datetime.
-===========================================================================
-"""
-from __future__ import annotations
-
-import pandas as pd
-from pathlib import Path
-from typing import Iterable
-
-from .models import TweetRow
-
-
-def to_dataframe(rows: Iterable[TweetRow]) -> pd.DataFrame:
-    df = pd.DataFrame([r.__dict__ for r in rows])
-    # Ensure datetime columns are serializable
-    if "created_at" in df.columns:
-        df["created_at"] = pd.to_datetime(df["created_at"], errors="coerce")
-    return df
-
-
-def save_csv(df: pd.DataFrame, path: Path, index: bool = False) -> Path:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(path, index=index)
-    return path
\ No newline at end of file
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: io_utils.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-10-25
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+DataFrame helpers, CSV persistence utilities and streaming row sinks for tweet rows.
+
+Usage:
+from twitter_extractor.io_utils import to_dataframe, save_csv, open_sink
+with open_sink(Path("outputs/tweets.csv")) as sink:
+    sink.write(rows)
+
+Notes:
+- Ensures datetime columns are parsed to pandas datetime.
+- CSV/JSONL sinks write with the stdlib (no pandas import); pandas is only
+  loaded when a DataFrame is explicitly requested via to_dataframe/save_csv.
+- Sinks buffer rows column-wise in a TweetBatch and write batches column by column.
+- Sinks buffer at most `batch_size` rows, so memory stays flat for long runs.
+- CSV/JSONL sinks can append to an existing file (used by --resume); a CSV whose header
+  differs from the current columns is refused rather than appended to misaligned.
+- Parquet uses a typed Arrow schema derived from TweetRow, optionally Hive-partitioned.
+- `.db`/`.sqlite` upsert into a TweetStore, which de-duplicates by tweet id.
+- A trailing `.gz`/`.zst` compresses CSV/JSONL on the fly (zstd needs `zstandard`);
+  compressed and rotated files are written as `<name>.part` and renamed on close.
+- `rotate_bytes`/`rotate_every` roll the output over to `tweets-YYYYMMDDHH.csv.zst`-style
+  files (RotatingSink).
+===========================================================================
+"""
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import json
+import os
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+    Union,
+    get_args,
+    get_type_hints,
+)
+
+from .models import TWEET_FIELDS, TweetBatch, TweetRow
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pandas as pd
+
+    from .metrics import Metrics
+
+
+ROW_FIELDS = TWEET_FIELDS
+
+Rows = Union[Iterable[TweetRow], TweetBatch]
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Write buffer for the stdlib sinks; each batch is a handful of large writes.
+WRITE_BUFFER_BYTES = 1 << 20
+
+COMPRESSIONS = {".gz": "gzip", ".zst": "zstd"}
+DEFAULT_COMPRESS_LEVELS = {"gzip": 6, "zstd": 3}
+
+PART_SUFFIX = ".part"
+
+
+def format_timestamp(value) -> str:
+    """ISO 8601 text for a datetime (UTC when tz-aware); '' for missing values."""
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value.isoformat()
+    return str(value)
+
+
+def as_batch(rows: Rows) -> TweetBatch:
+    """`rows` as a TweetBatch, converting a list of row dicts if needed."""
+    return rows if isinstance(rows, TweetBatch) else TweetBatch.from_rows(rows)
+
+
+def batch_records(batch: TweetBatch) -> Iterable[tuple]:
+    """Row tuples in ROW_FIELDS order with `created_at` preformatted as ISO text."""
+    columns = [batch.column(name) for name in ROW_FIELDS]
+    i = ROW_FIELDS.index("created_at")
+    columns[i] = [format_timestamp(v) or None for v in columns[i]]
+    return zip(*columns, strict=True)
+
+
+def to_dataframe(rows: Rows) -> "pd.DataFrame":
+    import pandas as pd
+
+    df = pd.DataFrame(as_batch(rows).columns(), columns=list(ROW_FIELDS))
+    # Ensure datetime columns are serializable
+    if "created_at" in df.columns:
+        df["created_at"] = pd.to_datetime(df["created_at"], errors="coerce")
+    return df
+
+
+def split_compression(path: Path) -> Tuple[Path, Optional[str]]:
+    """(`path` without a .gz/.zst suffix, "gzip"/"zstd" or None)."""
+    path = Path(path)
+    compression = COMPRESSIONS.get(path.suffix.lower())
+    return (path.with_suffix(""), compression) if compression else (path, None)
+
+
+def _import_zstandard():
+    try:
+        import zstandard
+    except ImportError as e:  # pragma: no cover - depends on environment
+        raise RuntimeError("zstd output requires zstandard (pip install zstandard).") from e
+    return zstandard
+
+
+def open_text(
+    path: Path, mode: str, *, compression: Optional[str] = None, level: Optional[int] = None
+) -> TextIO:
+    """Open `path` for text writing ("w" or "a"), optionally through gzip/zstd.
+
+    Appending to a compressed file adds a new gzip member / zstd frame, which
+    standard readers decompress as one continuous stream.
+    """
+    if compression is None:
+        return Path(path).open(mode, encoding="utf-8", newline="", buffering=WRITE_BUFFER_BYTES)
+    if level is None:
+        level = DEFAULT_COMPRESS_LEVELS[compression]
+    if compression == "gzip":
+        return gzip.open(path, mode + "t", compresslevel=level, encoding="utf-8", newline="")
+    zstd = _import_zstandard()
+    raw = Path(path).open(mode + "b")
+    writer = zstd.ZstdCompressor(level=level).stream_writer(raw, closefd=True)
+    return io.TextIOWrapper(writer, encoding="utf-8", newline="")
+
+
+def read_csv_header(path: Path, compression: Optional[str] = None) -> List[str]:
+    """The first CSV record of `path` (decompressed on the fly), or [] for an empty file."""
+    if compression is None:
+        fh = Path(path).open("r", encoding="utf-8", newline="")
+    elif compression == "gzip":
+        fh = gzip.open(path, "rt", encoding="utf-8", newline="")
+    else:
+        reader = _import_zstandard().ZstdDecompressor().stream_reader(Path(path).open("rb"))
+        fh = io.TextIOWrapper(reader, encoding="utf-8", newline="")
+    with fh:
+        return next(csv.reader(fh), [])
+
+
+def save_csv(df: "pd.DataFrame", path: Path, index: bool = False) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(path, index=index)
+    return path
+
+
+class RowSink:
+    """Append-only writer that flushes tweet rows to disk in fixed-size batches.
+
+    Subclasses implement `_write_batch`; the base class owns buffering so that
+    at most `batch_size` rows are held in memory at any time. Sinks with
+    `appendable = True` accept `append=True` to continue an existing file.
+    With `atomic=True` subclasses write to `write_path` (`<path>.part`), which is
+    renamed to `path` on close; a `with` block that raises calls `abort()`
+    instead, so a failed run never publishes a partial file. Set `metrics` to a
+    Metrics instance to time every flush as the `write` stage.
+    """
+
+    appendable = False
+    metrics: Optional["Metrics"] = None
+    # tell() is a byte offset the output can be truncated back to on --resume.
+    byte_offsets = True
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        append: bool = False,
+        atomic: bool = False,
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        if append and not self.appendable:
+            raise ValueError(f"{type(self).__name__} does not support appending.")
+        if append and atomic:
+            raise ValueError("atomic output cannot append; it always writes a new file.")
+        self.path = Path(path)
+        self.write_path = self.path.with_name(self.path.name + PART_SUFFIX) if atomic else self.path
+        self.atomic = atomic
+        self.append = append
+        self.batch_size = batch_size
+        self.rows_written = 0
+        self._buffer = TweetBatch()
+        self._closed = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def write(self, rows: Rows) -> None:
+        """Buffer TweetRows or a whole TweetBatch; flush once `batch_size` is reached."""
+        if self._closed:
+            raise RuntimeError(f"Sink for {self.path} is closed.")
+        if isinstance(rows, TweetBatch):
+            self._buffer.extend(rows)
+            if len(self._buffer) >= self.batch_size:
+                self.flush()
+            return
+        for row in rows:
+            self._buffer.append(row)
+            if len(self._buffer) >= self.batch_size:
+                self.flush()
+
+    def flush(self) -> None:
+        if not len(self._buffer):
+            return
+        batch, self._buffer = self._buffer, TweetBatch()
+        if self.metrics is None:
+            self._write_batch(batch)
+        else:
+            with self.metrics.timer("write"):
+                self._write_batch(batch)
+            self.metrics.incr("rows_written", len(batch))
+        self.rows_written += len(batch)
+
+    def tell(self) -> int:
+        """Flush buffered rows and return the output size in bytes."""
+        self.flush()
+        return os.path.getsize(self.write_path)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self.flush()
+        self._close()
+        self._closed = True
+        if self.atomic:
+            os.replace(self.write_path, self.path)  # readers never see a partial file
+
+    def abort(self) -> None:
+        """Close after a failure: an atomic sink drops its buffer and `.part` file
+        instead of publishing them (other sinks keep what they wrote and close)."""
+        if self._closed:
+            return
+        if not self.atomic:
+            self.close()
+            return
+        self._closed = True
+        self._buffer = TweetBatch()
+        try:
+            self._close()
+        finally:
+            if os.path.exists(self.write_path):
+                os.remove(self.write_path)
+
+    def _write_batch(self, batch: TweetBatch) -> None:  # pragma: no cover - abstract
+        raise NotImplementedError
+
+    def _close(self) -> None:  # pragma: no cover - overridden where needed
+        pass
+
+    def __enter__(self) -> "RowSink":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class CsvSink(RowSink):
+    """Streaming CSV writer (stdlib `csv`); the header is written once, up front.
+
+    `compression` ("gzip"/"zstd") compresses on the fly; `tell()` is then no
+    longer a truncatable offset.
+    """
+
+    appendable = True
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        append: bool = False,
+        atomic: bool = False,
+        compression: Optional[str] = None,
+        compress_level: Optional[int] = None,
+    ):
+        super().__init__(path, batch_size=batch_size, append=append, atomic=atomic)
+        self.byte_offsets = compression is None
+        has_header = append and self.path.exists() and self.path.stat().st_size > 0
+        if has_header:
+            header = read_csv_header(self.path, compression)
+            if header != list(ROW_FIELDS):
+                # Rows would land under the wrong columns (e.g. a file from an older version).
+                missing = [f for f in ROW_FIELDS if f not in header]
+                extra = [f for f in header if f not in ROW_FIELDS]
+                raise ValueError(
+                    f"Cannot append to {self.path}: its header does not match the current "
+                    f"columns (missing {missing}, unexpected {extra}, or in another order); "
+                    "write to a new file."
+                )
+        self._fh = open_text(
+            self.write_path,
+            "a" if append else "w",
+            compression=compression,
+            level=compress_level,
+        )
+        self._csv = csv.writer(self._fh)
+        if not has_header:
+            self._csv.writerow(ROW_FIELDS)
+            self._fh.flush()
+
+    def _write_batch(self, batch: TweetBatch) -> None:
+        self._csv.writerows(batch_records(batch))
+        self._fh.flush()
+
+    def _close(self) -> None:
+        self._fh.close()
+
+
+class JsonlSink(RowSink):
+    """Streaming JSON Lines writer (one tweet object per line); compresses like CsvSink."""
+
+    appendable = True
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        append: bool = False,
+        atomic: bool = False,
+        compression: Optional[str] = None,
+        compress_level: Optional[int] = None,
+    ):
+        super().__init__(path, batch_size=batch_size, append=append, atomic=atomic)
+        self.byte_offsets = compression is None
+        self._fh = open_text(
+            self.write_path,
+            "a" if append else "w",
+            compression=compression,
+            level=compress_level,
+        )
+        self._encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+    def _write_batch(self, batch: TweetBatch) -> None:
+        encode = self._encode
+        self._fh.write(
+            "".join(
+                encode(dict(zip(ROW_FIELDS, rec, strict=True))) + "\n"
+                for rec in batch_records(batch)
+            )
+        )
+        self._fh.flush()
+
+    def _close(self) -> None:
+        self._fh.close()
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:  # pragma: no cover - depends on environment
+        raise RuntimeError("Parquet output requires pyarrow (pip install pyarrow).") from e
+    return pa, pq
+
+
+# Low-cardinality string columns stored dictionary-encoded in Arrow/Parquet.
+DICTIONARY_FIELDS = frozenset({"lang", "query"})
+
+PARTITION_KEYS = ("date", "lang")
+
+HIVE_NULL = "__HIVE_DEFAULT_PARTITION__"
+
+
+def tweet_arrow_schema(exclude: Iterable[str] = ()):
+    """Arrow schema derived from the `TweetRow` type hints.
+
+    ints become int64, datetimes UTC timestamps and `DICTIONARY_FIELDS`
+    dictionary-encoded strings; every column is nullable.
+    """
+    pa, _ = _import_pyarrow()
+    mapping = {
+        str: pa.string(),
+        int: pa.int64(),
+        datetime: pa.timestamp("us", tz="UTC"),
+    }
+    hints = get_type_hints(TweetRow)
+    skip = set(exclude)
+    schema = []
+    for name in ROW_FIELDS:
+        if name in skip:
+            continue
+        hint = hints[name]
+        base = next((a for a in get_args(hint) if a is not type(None)), hint)
+        arrow_type = mapping[base]
+        if name in DICTIONARY_FIELDS:
+            arrow_type = pa.dictionary(pa.int32(), arrow_type)
+        schema.append(pa.field(name, arrow_type, nullable=True))
+    return pa.schema(schema)
+
+
+def _partition_values(batch: TweetBatch, key: str) -> list:
+    if key == "date":
+        return [v.strftime("%Y-%m-%d") if v else HIVE_NULL for v in batch.raw_column("created_at")]
+    return [str(v) if v not in (None, "") else HIVE_NULL for v in batch.column(key)]
+
+
+def _partition_files(path: Path) -> List[Path]:
+    """Part files of the Hive dataset at `path`; refuses anything that is not one.
+
+    A missing directory has no parts. Any other file, or a directory that is not a
+    ``key=value`` partition of PARTITION_KEYS, raises ValueError so a mistyped
+    `--out` never has its contents replaced or mixed with tweets.
+    """
+    if not path.exists():
+        return []
+    if not path.is_dir():
+        raise ValueError(f"{path} is a file; partitioned Parquet output needs a directory.")
+    parts = []
+    for root, dirs, files in os.walk(path):
+        for name in dirs:
+            key, eq, _ = name.partition("=")
+            if not eq or key not in PARTITION_KEYS:
+                raise ValueError(
+                    f"{path} is not a partitioned Parquet dataset ({Path(root, name)} "
+                    "is not a partition directory); choose an empty or new --out."
+                )
+        for name in files:
+            if root == str(path) or not name.endswith(".parquet"):
+                raise ValueError(
+                    f"{path} is not a partitioned Parquet dataset (found {Path(root, name)}); "
+                    "choose an empty or new --out."
+                )
+            parts.append(Path(root, name))
+    return parts
+
+
+class ParquetSink(RowSink):
+    """Streaming Parquet writer; every flushed batch becomes one row group.
+
+    With `partition_by` (any of "date", "lang") `path` is a Hive-style dataset
+    directory, e.g. ``tweets.parquet/date=2025-10-25/lang=en/part-<run>.parquet``,
+    with one open writer per partition. Partitioned sinks can append: each run
+    adds new part files; without `append` the existing part files are removed.
+    A `path` holding anything other than partition directories and part files
+    is refused. Requires the optional `pyarrow` dependency.
+    """
+
+    byte_offsets = False  # the footer is written on close; a file cannot be cut back
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        append: bool = False,
+        atomic: bool = False,
+        partition_by: Sequence[str] = (),
+    ):
+        unknown = set(partition_by) - set(PARTITION_KEYS)
+        if unknown:
+            raise ValueError(f"Cannot partition by {sorted(unknown)}; use {PARTITION_KEYS}.")
+        if atomic and partition_by:
+            raise ValueError("Partitioned Parquet output cannot be written atomically.")
+        self.partition_by = tuple(partition_by)
+        stale = _partition_files(Path(path)) if self.partition_by else []
+        super().__init__(path, batch_size=batch_size, append=append, atomic=atomic)
+        self._pa, self._pq = _import_pyarrow()
+        self._schema = tweet_arrow_schema(exclude=self.partition_by)
+        self._writers: dict = {}
+        if self.partition_by:
+            self._run_id = uuid.uuid4().hex[:12]
+            if not append:
+                for part in stale:
+                    part.unlink()
+                for root, _, _ in os.walk(self.path, topdown=False):
+                    if root != str(self.path) and not os.listdir(root):
+                        os.rmdir(root)
+        else:
+            self._writers[()] = self._pq.ParquetWriter(self.write_path, self._schema)
+
+    @property
+    def appendable(self) -> bool:  # type: ignore[override]
+        return bool(self.partition_by)
+
+    def _writer_for(self, key: tuple):
+        writer = self._writers.get(key)
+        if writer is None:
+            parts = zip(self.partition_by, key, strict=True)
+            part_dir = self.path.joinpath(*(f"{k}={v}" for k, v in parts))
+            part_dir.mkdir(parents=True, exist_ok=True)
+            writer = self._pq.ParquetWriter(part_dir / f"part-{self._run_id}.parquet", self._schema)
+            self._writers[key] = writer
+        return writer
+
+    def _table(self, batch: TweetBatch):
+        columns = {name: batch.column(name) for name in self._schema.names}
+        return self._pa.Table.from_pydict(columns, schema=self._schema)
+
+    def _write_batch(self, batch: TweetBatch) -> None:
+        if not self.partition_by:
+            self._writers[()].write_table(self._table(batch))
+            return
+        groups: dict = {}
+        keys = zip(*(_partition_values(batch, k) for k in self.partition_by), strict=True)
+        for i, key in enumerate(keys):
+            groups.setdefault(key, []).append(i)
+        for key, indices in groups.items():
+            self._writer_for(key).write_table(self._table(batch.take(indices)))
+
+    def tell(self) -> int:
+        if self.partition_by:
+            self.flush()
+            return self.rows_written
+        return super().tell()
+
+    def _close(self) -> None:
+        for writer in self._writers.values():
+            writer.close()
+
+
+class StoreSink(RowSink):
+    """Upserts each batch into a TweetStore (SQLite); one transaction per batch.
+
+    The store de-duplicates by tweet id, so appending and re-running overlapping
+    queries is always safe; `tell()` reports rows rather than bytes.
+    """
+
+    appendable = True
+    byte_offsets = False
+
+    def __init__(
+        self, path: Path, *, batch_size: int = DEFAULT_BATCH_SIZE, append: bool = False
+    ):
+        super().__init__(path, batch_size=batch_size, append=append)
+        from .store import TweetStore
+
+        self.store = TweetStore(self.path)
+
+    def _write_batch(self, batch: TweetBatch) -> None:
+        self.store.upsert(batch)
+
+    def tell(self) -> int:
+        self.flush()
+        return self.rows_written
+
+    def _close(self) -> None:
+        self.store.close()
+
+
+ROTATE_FORMATS = {"minute": "%Y%m%d%H%M", "hour": "%Y%m%d%H", "day": "%Y%m%d"}
+
+
+class RotatingSink(RowSink):
+    """Rolls the output over to a new file per wall-clock period and/or size.
+
+    Files are named after `path` with a UTC stamp before the suffixes, e.g.
+    ``tweets.csv.zst`` -> ``tweets-2026101812.csv.zst`` with ``rotate_every="hour"``;
+    a size rollover within one period (or an existing file) adds ``-1``, ``-2``, ...
+    Each file is written as `.part` and renamed once it is complete, so readers
+    only ever see finished files. `rotate_bytes` is checked before each batch,
+    so a file can overshoot it by one batch.
+    """
+
+    appendable = True  # every run starts new files; existing ones are never touched
+    byte_offsets = False
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        append: bool = False,
+        rotate_bytes: Optional[int] = None,
+        rotate_every: Optional[str] = None,
+        compress_level: Optional[int] = None,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ):
+        if rotate_every is not None and rotate_every not in ROTATE_FORMATS:
+            raise ValueError(f"rotate_every must be one of {sorted(ROTATE_FORMATS)}.")
+        if not rotate_bytes and rotate_every is None:
+            raise ValueError("RotatingSink needs rotate_bytes and/or rotate_every.")
+        super().__init__(path, batch_size=batch_size, append=append)
+        self._inner_cls = sink_class(self.path)
+        if self._inner_cls is StoreSink:
+            raise ValueError("The tweet store is a single database; it cannot be rotated.")
+        self._base, compression = split_compression(self.path)
+        self._options = (
+            {"compression": compression, "compress_level": compress_level} if compression else {}
+        )
+        self.rotate_bytes = rotate_bytes
+        self.rotate_every = rotate_every
+        self._clock = clock
+        self._current: Optional[RowSink] = None
+        self._stamp: Optional[str] = None
+        self.files: list = []  # completed files, in order
+
+    def _target(self, stamp: str, seq: int) -> Path:
+        name = f"{self._base.stem}-{stamp}{f'-{seq}' if seq else ''}{self._base.suffix}"
+        if self._options:
+            name += self.path.suffix
+        return self.path.with_name(name)
+
+    def _open(self, stamp: str) -> None:
+        seq = 0
+        target = self._target(stamp, seq)
+        while target.exists() or target.with_name(target.name + PART_SUFFIX).exists():
+            seq += 1
+            target = self._target(stamp, seq)
+        self._current = self._inner_cls(
+            target, batch_size=self.batch_size, atomic=True, **self._options
+        )
+        self._stamp = stamp
+
+    def _roll(self) -> None:
+        if self._current is not None:
+            self._current.close()
+            self.files.append(self._current.path)
+            self._current = None
+
+    def _write_batch(self, batch: TweetBatch) -> None:
+        now = self._clock()
+        stamp = now.strftime(ROTATE_FORMATS[self.rotate_every or "minute"])
+        current = self._current
+        if current is not None:
+            new_period = self.rotate_every is not None and stamp != self._stamp
+            full = self.rotate_bytes and os.path.getsize(current.write_path) >= self.rotate_bytes
+            if new_period or full:
+                self._roll()
+        if self._current is None:
+            self._open(stamp if self.rotate_every else now.strftime("%Y%m%d%H%M%S"))
+        self._current.write(batch)
+        self._current.flush()
+
+    def tell(self) -> int:
+        self.flush()
+        return self.rows_written
+
+    def _close(self) -> None:
+        self._roll()
+
+    def abort(self) -> None:
+        """Keep the completed files; drop the one still being written."""
+        if self._closed:
+            return
+        self._closed = True
+        self._buffer = TweetBatch()
+        if self._current is not None:
+            self._current.abort()
+            self._current = None
+
+
+SINKS = {
+    ".csv": CsvSink,
+    ".jsonl": JsonlSink,
+    ".ndjson": JsonlSink,
+    ".parquet": ParquetSink,
+    ".db": StoreSink,
+    ".sqlite": StoreSink,
+}
+
+
+def sink_class(path: Path) -> type:
+    """The RowSink subclass `open_sink` would use for `path` (ignoring rotation)."""
+    base, compression = split_compression(path)
+    try:
+        sink_cls = SINKS[base.suffix.lower()]
+    except KeyError:
+        raise ValueError(
+            f"Unsupported output format {base.suffix!r}; expected one of {sorted(SINKS)}."
+        ) from None
+    if compression is not None and sink_cls not in (CsvSink, JsonlSink):
+        raise ValueError(f"{compression} compression is only supported for CSV/JSONL output.")
+    return sink_cls
+
+
+def open_sink(
+    path: Path,
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    append: bool = False,
+    partition_by: Sequence[str] = (),
+    compress_level: Optional[int] = None,
+    rotate_bytes: Optional[int] = None,
+    rotate_every: Optional[str] = None,
+) -> RowSink:
+    """Return a streaming sink for `path`, chosen by file extension.
+
+    A trailing .gz/.zst compresses CSV/JSONL output (at `compress_level`);
+    `rotate_bytes`/`rotate_every` return a RotatingSink.
+    """
+    path = Path(path)
+    sink_cls = sink_class(path)
+    _, compression = split_compression(path)
+    if rotate_bytes or rotate_every:
+        if partition_by:
+            raise ValueError("Partitioned output cannot be rotated.")
+        return RotatingSink(
+            path,
+            batch_size=batch_size,
+            append=append,
+            rotate_bytes=rotate_bytes,
+            rotate_every=rotate_every,
+            compress_level=compress_level,
+        )
+    if partition_by and sink_cls is not ParquetSink:
+        raise ValueError("Partitioned output is only supported for .parquet.")
+    if compression is not None:
+        # A fresh compressed file is only renamed into place once complete.
+        return sink_cls(
+            path,
+            batch_size=batch_size,
+            append=append,
+            atomic=not append,
+            compression=compression,
+            compress_level=compress_level,
+        )
+    if partition_by:
+        return ParquetSink(path, batch_size=batch_size, append=append, partition_by=partition_by)
+    return sink_cls(path, batch_size=batch_size, append=append)
\ No newline at end of file
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: lookup.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Hydrate known tweet ids: stream them from a file and fetch them 100 at a time via GET /2/tweets.
+
+Usage:
+from twitter_extractor.lookup import lookup_tweets, read_ids
+for rows in lookup_tweets(client, read_ids(Path("ids.txt")), workers=4):
+    sink.write(rows)
+
+Notes:
+- Batches run on a thread pool; the client's TokenScheduler keeps them within rate limits.
+- At most `2 * workers` batches are in flight, so arbitrarily long id files stream.
+- With a TweetStore and `max_age`, ids refreshed more recently than `max_age` seconds
+  ago are skipped; everything else (including unseen ids) is fetched.
+===========================================================================
+"""
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+from .metrics import Metrics, timed
+from .models import TweetBatch
+from .users import UserCache
+from .utils import flatten_page
+
+LOOKUP_BATCH = 100  # GET /2/tweets accepts at most 100 ids per request
+
+
+@dataclass
+class LookupStats:
+    requested: int = 0  # ids read from the input
+    skipped: int = 0    # still fresh in the store
+    found: int = 0      # returned by the API (the rest are deleted, protected or invalid)
+    requests: int = 0
+
+
+def read_ids(path: Path) -> Iterator[str]:
+    """Yield tweet ids from a file, one per line (or the first CSV column).
+
+    Lines that do not start with a numeric id (headers, '#' comments) are skipped.
+    """
+    with Path(path).open("r", encoding="utf-8") as f:
+        for line in f:
+            value = line.split(",", 1)[0].strip().strip('"')
+            if value.isdigit():
+                yield value
+
+
+def chunked(ids: Iterable[str], size: int = LOOKUP_BATCH) -> Iterator[List[str]]:
+    it = iter(ids)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def lookup_tweets(
+    client,
+    ids: Iterable[str],
+    *,
+    workers: int = 4,
+    users: Optional[UserCache] = None,
+    store=None,
+    max_age: Optional[float] = None,
+    stats: Optional[LookupStats] = None,
+    metrics: Optional[Metrics] = None,
+) -> Iterator[TweetBatch]:
+    """Fetch `ids` in 100-id batches concurrently; yield each batch's rows in input order.
+
+    With `store` (a TweetStore) and `max_age`, ids fetched less than `max_age` seconds
+    ago are not requested again. `stats`, if given, is updated as batches complete.
+    """
+    stats = stats if stats is not None else LookupStats()
+
+    def fetch(batch: List[str]) -> TweetBatch:
+        page = client.lookup(batch)
+        with timed(metrics, "flatten"):
+            rows = flatten_page(page, users=users)
+        if metrics is not None:
+            metrics.page(len(rows), requested=len(batch))
+        return rows
+
+    def stale(batches: Iterator[List[str]]) -> Iterator[List[str]]:
+        for batch in batches:
+            stats.requested += len(batch)
+            if store is not None and max_age is not None:
+                fresh = store.fresh_ids(batch, max_age)
+                stats.skipped += len(fresh)
+                batch = [i for i in batch if i not in fresh]
+            if batch:
+                yield batch
+
+    # Regroup after skipping fresh ids so every request carries a full 100 ids.
+    batches = chunked(i for b in stale(chunked(ids)) for i in b)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        pending: deque = deque()
+        try:
+            for batch in batches:
+                pending.append(pool.submit(fetch, batch))
+                if len(pending) >= 2 * max(1, workers):
+                    yield _collect(pending.popleft(), stats)
+            while pending:
+                yield _collect(pending.popleft(), stats)
+        finally:
+            for fut in pending:
+                fut.cancel()
+
+
+def _collect(fut, stats: LookupStats) -> TweetBatch:
+    rows = fut.result()
+    stats.requests += 1
+    stats.found += len(rows)
+    return rows
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: metrics.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Per-stage timers and counters for a run, with JSON-lines, Prometheus and OpenTelemetry exporters.
+
+Usage:
+from twitter_extractor.metrics import build_metrics
+metrics = build_metrics(["json:outputs/metrics.jsonl", "prom:outputs/extractor.prom"])
+client = TwitterClient(metrics=metrics)
+extract(client, sink, query="python", metrics=metrics)
+metrics.close()
+
+Notes:
+- Stages: `api` (request incl. retries), `rate_limit_sleep`, `flatten`, `write`
+  (sink flushes: CSV/JSONL encoding, DataFrame/Arrow building, SQLite upserts).
+- Counters: pages, tweets, requests, retries (429s), rate_limit_sleeps,
+  bytes_received, rows_written, cache_hits.
+- Exporter specs: `json[:PATH]` (a line per page, stderr by default), `prom:PATH`
+  (node-exporter text file), `prom-http:[HOST:]PORT` (/metrics endpoint) and
+  `otel` (a span per stage; needs opentelemetry-api).
+- Components take `metrics=None` and skip all bookkeeping without it.
+===========================================================================
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, TextIO
+
+PROM_PREFIX = "twitter_extractor"
+
+
+class Metrics:
+    """Thread-safe counters and cumulative stage timers for one run."""
+
+    def __init__(self, exporters: Sequence = (), *, tracer=None):
+        self.exporters: List = list(exporters)
+        self.tracer = tracer  # OpenTelemetry tracer; one span per timed stage
+        self.counters: Dict[str, float] = {}
+        self.stages: Dict[str, List[float]] = {}  # stage -> [calls, seconds]
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._closed = False
+        for exporter in self.exporters:
+            bind = getattr(exporter, "bind", None)  # exporters that read snapshots on demand
+            if bind is not None:
+                bind(self)
+
+    def incr(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            entry = self.stages.setdefault(stage, [0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        span = self.tracer.start_as_current_span(stage) if self.tracer else nullcontext()
+        t0 = time.perf_counter()
+        with span:
+            try:
+                yield
+            finally:
+                self.observe(stage, time.perf_counter() - t0)
+
+    def page(self, tweets: int, **fields) -> None:
+        """Count one fetched page and emit a page event to every exporter."""
+        self.incr("pages")
+        self.incr("tweets", tweets)
+        snap = self.snapshot()
+        event = {
+            "event": "page",
+            "time": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "page": int(snap["counters"]["pages"]),
+            "tweets": tweets,
+            **fields,
+            "totals": snap["counters"],
+            "stage_seconds": {k: v["seconds"] for k, v in snap["stages"].items()},
+        }
+        for exporter in self.exporters:
+            exporter.on_page(event, self)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "elapsed": round(time.perf_counter() - self.started, 6),
+                "counters": dict(self.counters),
+                "stages": {
+                    stage: {"calls": int(calls), "seconds": round(seconds, 6)}
+                    for stage, (calls, seconds) in self.stages.items()
+                },
+            }
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        for exporter in self.exporters:
+            exporter.close(self)
+
+
+def timed(metrics: Optional[Metrics], stage: str):
+    """`metrics.timer(stage)`, or a no-op context without metrics."""
+    return metrics.timer(stage) if metrics is not None else nullcontext()
+
+
+# --- exporters ---
+class JsonLinesExporter:
+    """One JSON object per page, plus a final `summary` line, to a file or stderr."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path is not None else None
+        self._stream: TextIO = sys.stderr
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._stream = self.path.open("a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def _emit(self, record: dict) -> None:
+        with self._lock:
+            self._stream.write(json.dumps(record, separators=(",", ":")) + "\n")
+            self._stream.flush()
+
+    def on_page(self, event: dict, metrics: Metrics) -> None:
+        self._emit(event)
+
+    def close(self, metrics: Metrics) -> None:
+        self._emit({"event": "summary", **metrics.snapshot()})
+        if self.path is not None:
+            self._stream.close()
+
+
+def _prom_name(name: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+def prometheus_text(snapshot: dict, prefix: str = PROM_PREFIX) -> str:
+    """Render a snapshot in the Prometheus text exposition format."""
+    lines = []
+    for name, value in sorted(snapshot["counters"].items()):
+        metric = f"{prefix}_{_prom_name(name)}_total"
+        lines += [f"# TYPE {metric} counter", f"{metric} {value:g}"]
+    for suffix, key in (("stage_seconds_total", "seconds"), ("stage_calls_total", "calls")):
+        metric = f"{prefix}_{suffix}"
+        lines.append(f"# TYPE {metric} counter")
+        for stage, values in sorted(snapshot["stages"].items()):
+            lines.append(f'{metric}{{stage="{stage}"}} {values[key]:g}')
+    lines += [
+        f"# TYPE {prefix}_elapsed_seconds gauge",
+        f"{prefix}_elapsed_seconds {snapshot['elapsed']:g}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+class PrometheusExporter:
+    """Prometheus text file (atomically rewritten) and/or an HTTP `/metrics` endpoint."""
+
+    def __init__(
+        self,
+        *,
+        path: Optional[Path] = None,
+        port: Optional[int] = None,
+        host: str = "127.0.0.1",
+        interval: float = 5.0,
+    ):
+        self.path = Path(path) if path is not None else None
+        self.interval = interval
+        self._last_write = 0.0
+        self._metrics: Optional[Metrics] = None
+        self._httpd = None
+        if port is not None:
+            self._serve(host, port)
+
+    def _serve(self, host: str, port: int) -> None:
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                metrics = exporter._metrics
+                body = prometheus_text(metrics.snapshot()).encode() if metrics else b""
+                self.send_response(200 if self.path.startswith("/metrics") else 404)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+
+    @property
+    def port(self) -> Optional[int]:
+        return self._httpd.server_address[1] if self._httpd is not None else None
+
+    def bind(self, metrics: Metrics) -> None:
+        self._metrics = metrics
+
+    def _write(self, metrics: Metrics) -> None:
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(prometheus_text(metrics.snapshot()), encoding="utf-8")
+        os.replace(tmp, self.path)  # the node-exporter never reads a partial file
+
+    def on_page(self, event: dict, metrics: Metrics) -> None:
+        now = time.monotonic()
+        if self.path is not None and now - self._last_write >= self.interval:
+            self._last_write = now
+            self._write(metrics)
+
+    def close(self, metrics: Metrics) -> None:
+        if self.path is not None:
+            self._write(metrics)
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+
+
+def otel_tracer(name: str = "twitter_extractor"):
+    """OpenTelemetry tracer from the globally configured provider."""
+    try:
+        from opentelemetry import trace
+    except ImportError:  # pragma: no cover - depends on the environment
+        raise RuntimeError(
+            "otel metrics need OpenTelemetry: pip install opentelemetry-api"
+        ) from None
+    return trace.get_tracer(name)
+
+
+def build_metrics(specs: Sequence[str]) -> Metrics:
+    """Metrics with the exporters named by `--metrics` specs (see module notes).
+
+    Every spec is checked before any exporter is opened; if opening one fails,
+    the exporters already opened are closed again.
+    """
+    parsed = []
+    for spec in specs:
+        kind, _, arg = spec.partition(":")
+        host, _, port = arg.rpartition(":")
+        if not (
+            kind == "json"
+            or (kind == "prom" and arg)
+            or (kind == "prom-http" and port.isdigit())
+            or (kind == "otel" and not arg)
+        ):
+            raise ValueError(
+                f"Unknown metrics spec {spec!r}; use json[:PATH], prom:PATH, "
+                "prom-http:[HOST:]PORT or otel"
+            )
+        parsed.append((kind, arg, host, port))
+
+    exporters: list = []
+    tracer = None
+    try:
+        for kind, arg, host, port in parsed:
+            if kind == "json":
+                exporters.append(JsonLinesExporter(Path(arg) if arg else None))
+            elif kind == "prom":
+                exporters.append(PrometheusExporter(path=Path(arg)))
+            elif kind == "prom-http":
+                exporters.append(PrometheusExporter(port=int(port), host=host or "127.0.0.1"))
+            else:
+                tracer = otel_tracer()
+    except Exception:
+        Metrics(exporters).close()
+        raise
+    return Metrics(exporters, tracer=tracer)
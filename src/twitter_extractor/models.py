@@ -1,43 +1,164 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-"""
-===========================================================================
-Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
-File: models.py
-Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
-Created: 2025-10-25
-Updated: 2025-10-25
-License: MIT License (see LICENSE file for details)
-===========================================================================
-
-Description:
-Lightweight dataclasses used to represent flattened tweet rows for CSV/DF export.
-
-Usage:
-from twitter_extractor.models import TweetRow
-
-Notes:
-- Keep models minimal and serializable.
-===========================================================================
-"""
-from __future__ import annotations
-
-from dataclasses import dataclass
-from datetime import datetime
-from typing import Optional
-
-
-@dataclass
-class TweetRow:
-    """Flattened tweet row for CSV/DF."""
-
-    id: str
-    created_at: Optional[datetime]
-    text: str
-    author_id: Optional[str]
-    like_count: Optional[int]
-    retweet_count: Optional[int]
-    reply_count: Optional[int]
-    quote_count: Optional[int]
-    lang: Optional[str]
-    conversation_id: Optional[str]
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: models.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-10-25
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Lightweight dataclasses used to represent flattened tweet rows for CSV/DF export.
+
+Usage:
+from twitter_extractor.models import TweetRow, TweetBatch
+
+Notes:
+- Keep models minimal and serializable.
+- TweetRow is slotted (no per-instance __dict__); TweetBatch stores a page column-wise.
+===========================================================================
+"""
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, get_args, get_type_hints
+
+
+@dataclass(slots=True)
+class TweetRow:
+    """Flattened tweet row for CSV/DF."""
+
+    id: str
+    created_at: Optional[datetime]
+    text: str
+    author_id: Optional[str]
+    like_count: Optional[int]
+    retweet_count: Optional[int]
+    reply_count: Optional[int]
+    quote_count: Optional[int]
+    lang: Optional[str]
+    conversation_id: Optional[str]
+    username: Optional[str] = None
+    name: Optional[str] = None
+    query: Optional[str] = None  # search query that matched the tweet
+    in_reply_to_id: Optional[str] = None  # parent tweet (referenced_tweets "replied_to")
+    # Space-separated entities, filled by the `entities` enrichment transform.
+    hashtags: Optional[str] = None
+    mentions: Optional[str] = None
+    urls: Optional[str] = None
+
+
+TWEET_FIELDS = tuple(f.name for f in fields(TweetRow))
+
+INT_FIELDS = frozenset(
+    name for name, hint in get_type_hints(TweetRow).items() if int in (get_args(hint) or (hint,))
+)
+
+# Columns left empty by flattening and filled by `enrich.extract_entities`.
+ENTITY_FIELDS = ("hashtags", "mentions", "urls")
+
+# Stand-in for None inside the typed int columns (metrics are never negative).
+MISSING_INT = -1
+
+
+class TweetBatch:
+    """Column-oriented batch of tweet rows.
+
+    Each TweetRow field is one column: a list for text/object fields and an
+    ``array("q")`` (8 bytes per value, no int objects) for the int metrics,
+    where None is stored as `MISSING_INT`.
+    """
+
+    __slots__ = ("_columns", "_is_int")
+
+    def __init__(self) -> None:
+        self._columns: Dict[str, list] = {
+            name: array("q") if name in INT_FIELDS else [] for name in TWEET_FIELDS
+        }
+        self._is_int = tuple(name in INT_FIELDS for name in TWEET_FIELDS)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[TweetRow]) -> "TweetBatch":
+        batch = cls()
+        for row in rows:
+            batch.append(row)
+        return batch
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, Sequence]) -> "TweetBatch":
+        """Build a batch from one equal-length sequence per field (see `raw_column`).
+
+        Int columns must already use `MISSING_INT` for missing values; the
+        sequences are adopted as-is, without per-row copying.
+        """
+        if set(columns) != set(TWEET_FIELDS):
+            raise ValueError(f"columns must be exactly {TWEET_FIELDS}")
+        if len({len(col) for col in columns.values()}) > 1:
+            raise ValueError("columns must have equal lengths")
+        batch = cls()
+        for name in TWEET_FIELDS:
+            col = columns[name]
+            if name in INT_FIELDS:
+                batch._columns[name] = col if isinstance(col, array) else array("q", col)
+            else:
+                batch._columns[name] = col if isinstance(col, list) else list(col)
+        return batch
+
+    def __len__(self) -> int:
+        return len(self._columns["id"])
+
+    def __iter__(self) -> Iterator[TweetRow]:
+        return self.rows()
+
+    def append(self, row: TweetRow) -> None:
+        self.append_values([getattr(row, name) for name in TWEET_FIELDS])
+
+    def append_values(self, values: Sequence) -> None:
+        """Append one row given its values in `TWEET_FIELDS` order."""
+        for col, is_int, value in zip(self._columns.values(), self._is_int, values, strict=True):
+            col.append(MISSING_INT if is_int and value is None else value)
+
+    def extend(self, other: "TweetBatch") -> None:
+        for name, col in self._columns.items():
+            col.extend(other._columns[name])
+
+    def take(self, indices: Sequence[int]) -> "TweetBatch":
+        """New batch with the rows at `indices`, in that order."""
+        out = TweetBatch()
+        for name, col in self._columns.items():
+            out._columns[name].extend(col[i] for i in indices)
+        return out
+
+    def set_column(self, name: str, values: Sequence) -> None:
+        """Replace one column in place (an enrichment transform's output)."""
+        if len(values) != len(self):
+            raise ValueError(f"column {name!r} must have {len(self)} values")
+        if name in INT_FIELDS:
+            self._columns[name] = array("q", (MISSING_INT if v is None else v for v in values))
+        else:
+            self._columns[name] = list(values)
+
+    def raw_column(self, name: str):
+        """The stored column (ints keep the `MISSING_INT` sentinel); do not mutate."""
+        return self._columns[name]
+
+    def column(self, name: str) -> list:
+        col = self._columns[name]
+        if name in INT_FIELDS:
+            return [None if v == MISSING_INT else v for v in col]
+        return list(col)
+
+    def columns(self) -> Dict[str, list]:
+        return {name: self.column(name) for name in TWEET_FIELDS}
+
+    def rows(self) -> Iterator[TweetRow]:
+        for values in zip(*(self.column(name) for name in TWEET_FIELDS), strict=True):
+            yield TweetRow(*values)
+
+    def to_rows(self) -> List[TweetRow]:
+        return list(self.rows())
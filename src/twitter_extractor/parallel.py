@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: parallel.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Time-sliced concurrent search: split a start/end window and page each slice on a thread pool.
+
+Usage:
+from twitter_extractor.parallel import search_sliced
+for batch in search_sliced(client, "python", slices=4, workers=4):
+    sink.write(batch)
+
+Notes:
+- Slices are disjoint, so output stays newest-first by concatenating slices in order.
+- Pages stream through a small per-slice queue; no slice is ever held in memory whole.
+- Boundary duplicates are dropped by each slice's [start, end) window, not by an id set.
+===========================================================================
+"""
+from __future__ import annotations
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+
+from .metrics import Metrics, timed
+from .models import TweetBatch
+from .users import UserCache
+from .utils import flatten_page, parse_iso
+
+ISO_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+# Recent search only covers the last 7 days and end_time must trail "now".
+RECENT_WINDOW = timedelta(days=7) - timedelta(minutes=1)
+END_TIME_LAG = timedelta(seconds=30)
+
+
+def format_iso(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime(ISO_FORMAT)
+
+
+def resolve_window(
+    start_time: Optional[str], end_time: Optional[str], *, now: Optional[datetime] = None
+) -> Tuple[datetime, datetime]:
+    """Fill a missing start/end with the widest window recent search accepts."""
+    now = now or datetime.now(timezone.utc)
+    end = parse_iso(end_time) if end_time else now - END_TIME_LAG
+    start = parse_iso(start_time) if start_time else now - RECENT_WINDOW
+    if end <= start:
+        raise ValueError(
+            f"end_time ({format_iso(end)}) must be after start_time ({format_iso(start)})."
+        )
+    return start, end
+
+
+def split_window(
+    start_time: Optional[str], end_time: Optional[str], slices: int
+) -> List[Tuple[str, str]]:
+    """Split [start, end) into up to `slices` contiguous, second-aligned sub-windows."""
+    if slices < 1:
+        raise ValueError("slices must be >= 1")
+    start, end = resolve_window(start_time, end_time)
+    step = (end - start) / slices
+    bounds = [(start + step * i).replace(microsecond=0) for i in range(slices)] + [end]
+    windows = [(format_iso(a), format_iso(b)) for a, b in zip(bounds, bounds[1:], strict=False)]
+    return [(a, b) for a, b in windows if a != b]
+
+
+_DONE = object()
+
+
+def search_sliced(
+    client,
+    query: str,
+    *,
+    start_time: Optional[str] = None,
+    end_time: Optional[str] = None,
+    slices: int = 4,
+    workers: int = 4,
+    max_results: int = 100,
+    limit_pages: Optional[int] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+    users: Optional[UserCache] = None,
+    metrics: Optional[Metrics] = None,
+    windows: Optional[Sequence[Tuple[str, str]]] = None,
+    prefetch_pages: int = 8,
+) -> Iterator[TweetBatch]:
+    """Run one paginator per time slice concurrently and yield one batch per page.
+
+    Slices are yielded newest first and each slice's pages in API order (newest
+    first), so the output has the same order as a serial recent search. Rows
+    outside a slice's [start, end) window are dropped, which removes boundary
+    duplicates without remembering ids. Each slice buffers at most
+    `prefetch_pages` pages ahead of the consumer, so memory stays bounded by
+    `workers * prefetch_pages` pages however large the window is.
+    `limit_pages` applies to every slice; once `should_stop()` returns True each
+    slice stops paging after its current page. Explicit `windows` (oldest first,
+    e.g. `ExtractionPlan.search_windows()`) replace the even split into `slices`.
+    """
+    windows = list(windows) if windows is not None else split_window(start_time, end_time, slices)
+    windows.reverse()
+    pages: List["queue.Queue"] = [queue.Queue(maxsize=max(1, prefetch_pages)) for _ in windows]
+    stop = threading.Event()
+
+    def put(q: "queue.Queue", item) -> bool:
+        # Block while the consumer is behind, but give up once it has gone away.
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def fetch(i: int) -> None:
+        s, e = windows[i]
+        try:
+            for page in client.search(
+                query=query,
+                max_results=max_results,
+                start_time=s,
+                end_time=e,
+                limit_pages=limit_pages,
+            ):
+                with timed(metrics, "flatten"):
+                    batch = flatten_page(page, users=users, query=query)
+                if metrics is not None:
+                    metrics.page(len(batch), query=query, slice=s)
+                if not put(pages[i], batch):
+                    return
+                if should_stop is not None and should_stop():
+                    break
+        except BaseException as exc:  # re-raised in the consumer, in slice order
+            put(pages[i], exc)
+            return
+        put(pages[i], _DONE)
+
+    # Slices are submitted newest first, so the one being consumed is always running
+    # (or done) while the pool's other workers prefetch the next ones.
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [pool.submit(fetch, i) for i in range(len(windows))]
+        try:
+            for (s, e), q in zip(windows, pages, strict=True):
+                lo, hi = parse_iso(s), parse_iso(e)
+                while True:
+                    item = q.get()
+                    if item is _DONE:
+                        break
+                    if isinstance(item, BaseException):
+                        raise item
+                    created = item.raw_column("created_at")
+                    keep = [j for j, t in enumerate(created) if t is None or lo <= t < hi]
+                    if len(keep) < len(item):
+                        item = item.take(keep)
+                    if len(item):
+                        yield item
+        finally:
+            stop.set()
+            for fut in futures:
+                fut.cancel()
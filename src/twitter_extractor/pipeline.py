@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: pipeline.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Search -> flatten -> sink loop shared by the CLI and the GUI, with optional checkpoints.
+
+Usage:
+from twitter_extractor.pipeline import extract
+with open_sink(out) as sink:
+    cp = extract(client, sink, query="python", limit_pages=5)
+
+Notes:
+- With a CheckpointStore, each page is flushed before its checkpoint is saved.
+- `follow` polls with `since_id` at an adaptive interval and appends only new tweets.
+- Pages may be tweepy Responses or raw JSON dicts (TwitterClient(raw=True)).
+- With `metrics`, flattening is timed and every page is reported to the exporters.
+===========================================================================
+"""
+from __future__ import annotations
+
+import time
+from typing import Callable, Optional
+
+from .io_utils import RowSink
+from .metrics import Metrics, timed
+from .state import Checkpoint, CheckpointStore, HighWaterMarkStore
+from .users import UserCache
+from .utils import flatten_page, page_meta
+
+
+def extract(
+    client,
+    sink: RowSink,
+    *,
+    query: str,
+    max_results: int = 100,
+    start_time: Optional[str] = None,
+    end_time: Optional[str] = None,
+    limit_pages: Optional[int] = None,
+    checkpoints: Optional[CheckpointStore] = None,
+    resume_from: Optional[Checkpoint] = None,
+    since_id: Optional[str] = None,
+    until_id: Optional[str] = None,
+    on_page: Optional[Callable[[Checkpoint], None]] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+    users: Optional[UserCache] = None,
+    metrics: Optional[Metrics] = None,
+) -> Checkpoint:
+    """Fetch pages for `query` and write their rows to `sink`.
+
+    When `resume_from` is given, pagination continues from its `next_token` and
+    `limit_pages` counts the pages already fetched. `on_page` is called with the
+    checkpoint after every page; once `should_stop()` returns True pagination
+    stops after the current page, leaving a resumable checkpoint. Returns the
+    final checkpoint.
+    """
+    cp = resume_from or Checkpoint(query=query, start_time=start_time, end_time=end_time)
+    if checkpoints is not None:
+        cp.out = str(sink.path)
+    if cp.done:
+        return cp
+    remaining = None
+    if limit_pages:
+        remaining = limit_pages - cp.pages
+        if remaining <= 0:
+            return cp
+
+    for page in client.search(
+        query=query,
+        max_results=max_results,
+        start_time=start_time,
+        end_time=end_time,
+        limit_pages=remaining,
+        pagination_token=cp.next_token,
+        since_id=since_id,
+        until_id=until_id,
+    ):
+        with timed(metrics, "flatten"):
+            batch = flatten_page(page, users=users, query=query)
+        sink.write(batch)
+
+        meta = page_meta(page)
+        cp.pages += 1
+        cp.rows_written += len(batch)
+        cp.next_token = meta.get("next_token")
+        if cp.newest_id is None:
+            # Pages arrive newest first, so the first page carries the run's newest id.
+            cp.newest_id = meta.get("newest_id") or max(
+                batch.raw_column("id"), key=int, default=None
+            )
+        cp.oldest_id = meta.get("oldest_id") or min(
+            batch.raw_column("id"), key=int, default=cp.oldest_id
+        )
+        if checkpoints is not None:
+            cp.out_offset = sink.tell()
+            checkpoints.save(cp)
+        if metrics is not None:
+            metrics.page(len(batch), query=query, next_token=cp.next_token)
+        if on_page is not None:
+            on_page(cp)
+        if should_stop is not None and should_stop():
+            break
+
+    cp.done = cp.next_token is None
+    if checkpoints is not None:
+        cp.out_offset = sink.tell()
+        checkpoints.save(cp)
+    return cp
+
+
+def extract_since(
+    client,
+    sink: RowSink,
+    marks: HighWaterMarkStore,
+    *,
+    query: str,
+    max_results: int = 100,
+    limit_pages: Optional[int] = None,
+    users: Optional[UserCache] = None,
+    metrics: Optional[Metrics] = None,
+) -> Checkpoint:
+    """Fetch only tweets newer than the stored high-water mark, then advance it.
+
+    The mark only moves once pagination has been exhausted. If `limit_pages`
+    stops the run early, the store keeps a continuation (the run's newest id
+    and the oldest id written); the next run fetches only the older tweets
+    still missing (`until_id`) and never writes the same pages twice.
+    """
+    pending = marks.pending(query)
+    cp = extract(
+        client,
+        sink,
+        query=query,
+        max_results=max_results,
+        limit_pages=limit_pages,
+        since_id=marks.get(query),
+        until_id=pending["until_id"] if pending else None,
+        users=users,
+        metrics=metrics,
+    )
+    sink.flush()
+    newest_id = pending["newest_id"] if pending else cp.newest_id
+    if cp.done:
+        marks.advance(query, newest_id)
+    elif cp.oldest_id is not None:
+        marks.hold(query, newest_id, until_id=cp.oldest_id)
+    return cp
+
+
+def next_poll_interval(
+    current: float, new_rows: int, *, min_interval: float, max_interval: float
+) -> float:
+    """Poll faster while tweets keep arriving, back off (x2) while the query is quiet."""
+    if new_rows:
+        return max(min_interval, current / 2)
+    return min(max_interval, current * 2)
+
+
+def follow(
+    client,
+    sink: RowSink,
+    marks: HighWaterMarkStore,
+    *,
+    query: str,
+    max_results: int = 100,
+    limit_pages: Optional[int] = None,
+    min_interval: float = 15.0,
+    max_interval: float = 900.0,
+    max_polls: Optional[int] = None,
+    sleep: Callable[[float], None] = time.sleep,
+    on_poll: Optional[Callable[[Checkpoint, float], None]] = None,
+    users: Optional[UserCache] = None,
+    metrics: Optional[Metrics] = None,
+) -> int:
+    """Poll `query` incrementally until interrupted (or `max_polls`); return rows written."""
+    interval = min_interval
+    polls = total = 0
+    while max_polls is None or polls < max_polls:
+        cp = extract_since(
+            client,
+            sink,
+            marks,
+            query=query,
+            max_results=max_results,
+            limit_pages=limit_pages,
+            users=users,
+            metrics=metrics,
+        )
+        polls += 1
+        total += cp.rows_written
+        interval = next_poll_interval(
+            interval, cp.rows_written, min_interval=min_interval, max_interval=max_interval
+        )
+        if on_poll is not None:
+            on_poll(cp, interval)
+        if max_polls is not None and polls >= max_polls:
+            break
+        sleep(interval)
+    return total
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: planner.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Counts-driven extraction planning: hourly volume, page budget, request/time estimate and
+volume-balanced sub-windows from GET /2/tweets/counts/recent.
+
+Usage:
+from twitter_extractor.planner import plan_extraction, format_plan
+plan = plan_extraction(client, "python lang:en", slices=4)
+print(format_plan(plan))
+search_sliced(client, plan.query, windows=plan.search_windows(), limit_pages=plan.max_pages)
+
+Notes:
+- Planning costs one counts request; the window is pinned (start/end resolved once)
+  so the extraction that follows covers exactly what was counted.
+- Page budgets are ceil(tweets / max_results) per window. Tweets deleted or posted
+  after counting make the real count differ slightly.
+- Time estimates assume `SEARCH_RATE_LIMIT` requests per 15-minute window per bearer
+  token (app auth) and `latency` seconds per request; adjust them for your API tier.
+- Sub-windows follow hourly bucket boundaries, so one very busy hour is never split.
+===========================================================================
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Mapping, Optional, Sequence, Tuple
+
+from .parallel import format_iso, parse_iso, resolve_window
+
+SEARCH_RATE_LIMIT = 450  # recent search requests per window, per app-auth token
+RATE_LIMIT_WINDOW = 15 * 60.0
+DEFAULT_LATENCY = 0.5  # seconds per search request, excluding rate-limit waits
+
+SPARK = " ▁▂▃▄▅▆▇█"
+
+
+@dataclass
+class VolumeBucket:
+    start: datetime
+    end: datetime
+    tweets: int
+
+
+@dataclass
+class PlanWindow:
+    start: datetime
+    end: datetime
+    tweets: int
+    pages: int
+
+
+@dataclass
+class ExtractionPlan:
+    query: str
+    start: datetime
+    end: datetime
+    max_results: int
+    buckets: List[VolumeBucket]
+    windows: List[PlanWindow]
+    tokens: int = 1
+    workers: int = 1
+    rate_limit: int = SEARCH_RATE_LIMIT
+    latency: float = DEFAULT_LATENCY
+
+    @property
+    def total_tweets(self) -> int:
+        return sum(b.tweets for b in self.buckets)
+
+    @property
+    def requests(self) -> int:
+        """Search requests needed: one per page, summed over the sub-windows."""
+        return sum(w.pages for w in self.windows)
+
+    @property
+    def max_pages(self) -> int:
+        """Per-window page limit that covers every sub-window (`--pages`)."""
+        return max((w.pages for w in self.windows), default=0)
+
+    @property
+    def estimated_seconds(self) -> float:
+        return estimate_seconds(
+            self.requests,
+            parallel=min(self.workers, max(1, len(self.search_windows()))),
+            tokens=self.tokens,
+            rate_limit=self.rate_limit,
+            latency=self.latency,
+        )
+
+    @property
+    def start_time(self) -> str:
+        return format_iso(self.start)
+
+    @property
+    def end_time(self) -> str:
+        return format_iso(self.end)
+
+    def search_windows(self) -> List[Tuple[str, str]]:
+        """(start_time, end_time) of the sub-windows that hold tweets, oldest first."""
+        return [(format_iso(w.start), format_iso(w.end)) for w in self.windows if w.tweets]
+
+
+def volume_histogram(response) -> List[VolumeBucket]:
+    """Buckets from a counts response (raw dict or tweepy.Response), oldest first."""
+    data = response.get("data") if isinstance(response, Mapping) else response.data
+    buckets = [
+        VolumeBucket(parse_iso(d["start"]), parse_iso(d["end"]), int(d["tweet_count"]))
+        for d in data or ()
+    ]
+    buckets.sort(key=lambda b: b.start)
+    return buckets
+
+
+def pages_for(tweets: int, max_results: int) -> int:
+    return math.ceil(tweets / max_results) if tweets > 0 else 0
+
+
+def balanced_windows(
+    buckets: Sequence[VolumeBucket],
+    slices: int,
+    *,
+    start: datetime,
+    end: datetime,
+    max_results: int = 100,
+) -> List[PlanWindow]:
+    """Split [start, end) on bucket boundaries into up to `slices` windows of similar volume."""
+    if slices < 1:
+        raise ValueError("slices must be >= 1")
+    total = sum(b.tweets for b in buckets)
+    target = total / slices
+    windows: List[PlanWindow] = []
+    win_start, acc, cum = start, 0, 0
+    for i, b in enumerate(buckets):
+        acc += b.tweets
+        cum += b.tweets
+        last = i == len(buckets) - 1
+        if not last and len(windows) < slices - 1 and cum >= target * (len(windows) + 1) and acc:
+            windows.append(PlanWindow(win_start, b.end, acc, pages_for(acc, max_results)))
+            win_start, acc = b.end, 0
+    windows.append(PlanWindow(win_start, end, acc, pages_for(acc, max_results)))
+    return windows
+
+
+def estimate_seconds(
+    requests: int,
+    *,
+    parallel: int = 1,
+    tokens: int = 1,
+    rate_limit: int = SEARCH_RATE_LIMIT,
+    window: float = RATE_LIMIT_WINDOW,
+    latency: float = DEFAULT_LATENCY,
+) -> float:
+    """Wall time for `requests` searches: request latency or rate-limit windows, whichever binds.
+
+    Every full budget (`rate_limit` x `tokens`) but the last costs one rate-limit window.
+    """
+    if requests <= 0:
+        return 0.0
+    fetching = requests * latency / max(1, parallel)
+    budget = rate_limit * max(1, tokens)
+    waiting = (math.ceil(requests / budget) - 1) * window
+    return max(fetching, waiting + (requests % budget or budget) * latency / max(1, parallel))
+
+
+def plan_extraction(
+    client,
+    query: str,
+    *,
+    start_time: Optional[str] = None,
+    end_time: Optional[str] = None,
+    max_results: int = 100,
+    slices: int = 1,
+    workers: int = 1,
+    rate_limit: int = SEARCH_RATE_LIMIT,
+    latency: float = DEFAULT_LATENCY,
+    now: Optional[datetime] = None,
+) -> ExtractionPlan:
+    """Count `query` per hour over the window and plan the search that would fetch it all."""
+    start, end = resolve_window(start_time, end_time, now=now)
+    start, end = start.replace(microsecond=0), end.replace(microsecond=0)
+    max_results = min(max(10, max_results), 100)  # what TwitterClient.search sends
+    buckets = volume_histogram(
+        client.counts(query, start_time=format_iso(start), end_time=format_iso(end))
+    )
+    scheduler = getattr(client, "scheduler", None)
+    return ExtractionPlan(
+        query=query,
+        start=start,
+        end=end,
+        max_results=max_results,
+        buckets=buckets,
+        windows=balanced_windows(buckets, slices, start=start, end=end, max_results=max_results),
+        tokens=len(scheduler.tokens) if scheduler is not None else 1,
+        workers=workers,
+        rate_limit=rate_limit,
+        latency=latency,
+    )
+
+
+def _duration(seconds: float) -> str:
+    seconds = round(seconds)
+    h, rem = divmod(seconds, 3600)
+    m, s = divmod(rem, 60)
+    return f"{h}h {m:02d}m" if h else f"{m}m {s:02d}s"
+
+
+def format_plan(plan: ExtractionPlan) -> str:
+    """Human-readable plan: totals, a per-day sparkline of hourly volume and the sub-windows."""
+    lines = [
+        f"Plan for {plan.query!r}: {plan.start_time} -> {plan.end_time}",
+        f"{plan.total_tweets:,} tweets -> {plan.requests:,} requests of {plan.max_results} "
+        f"(~{_duration(plan.estimated_seconds)} at {plan.rate_limit} requests/15 min "
+        f"x {plan.tokens} token{'s' if plan.tokens != 1 else ''})",
+    ]
+    peak = max((b.tweets for b in plan.buckets), default=0)
+    if peak:
+        lines.append("Hourly volume (UTC, one column per hour):")
+        days: dict = {}  # date -> (24 sparkline cells, tweets that day)
+        for b in plan.buckets:
+            cells, total = days.get(b.start.date(), ([" "] * 24, 0))
+            cells[b.start.hour] = SPARK[math.ceil(b.tweets / peak * (len(SPARK) - 1))]
+            days[b.start.date()] = (cells, total + b.tweets)
+        for day, (cells, total) in days.items():
+            lines.append(f"  {day}  {''.join(cells)}  {total:>9,}")
+    if len(plan.windows) > 1:
+        lines.append(f"Sub-windows ({len(plan.windows)}):")
+        for w in plan.windows:
+            lines.append(
+                f"  {format_iso(w.start)} -> {format_iso(w.end)}  "
+                f"{w.tweets:>9,} tweets  {w.pages:>5,} pages"
+            )
+    return "\n".join(lines)
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: ratelimit.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Multi-token rate-limit scheduler that routes each request to the token with the most budget.
+
+Usage:
+from twitter_extractor.ratelimit import TokenScheduler
+scheduler = TokenScheduler([tweepy.Client(bearer_token=t) for t in tokens])
+search = scheduler.method("search_recent_tweets")  # drop-in for tweepy.Paginator
+
+Notes:
+- Budgets are tracked per token *and* endpoint from the x-rate-limit-* headers.
+- The process only sleeps when every token is exhausted for the endpoint.
+- With `metrics`, request latency, 429 retries, sleeps and response bytes are recorded.
+===========================================================================
+"""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence
+
+import tweepy
+
+from .metrics import Metrics, timed
+
+
+@dataclass
+class Budget:
+    """Rate-limit window of one endpoint for one token (None = not seen yet)."""
+
+    limit: Optional[int] = None
+    remaining: Optional[int] = None
+    reset_at: float = 0.0
+
+
+@dataclass
+class TokenState:
+    name: str
+    client: object
+    budgets: Dict[str, Budget] = field(default_factory=dict)
+    requests: int = 0
+    rate_limited: int = 0
+    local: threading.local = field(default_factory=threading.local, repr=False)
+
+
+class TokenScheduler:
+    """Route API calls across several tweepy Clients by remaining rate-limit budget.
+
+    Clients should be created with ``wait_on_rate_limit=False`` so that a 429
+    surfaces here (as `tweepy.TooManyRequests`) and can be retried on another token.
+    """
+
+    def __init__(
+        self,
+        clients: Sequence,
+        *,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+        on_wait: Optional[Callable[[float], None]] = None,
+        metrics: Optional[Metrics] = None,
+    ):
+        if not clients:
+            raise ValueError("TokenScheduler needs at least one client.")
+        self._clock = clock
+        self._sleep = sleep
+        self.on_wait = on_wait
+        self.metrics = metrics
+        self._lock = threading.Lock()
+        self.tokens: List[TokenState] = []
+        for i, client in enumerate(clients, start=1):
+            state = TokenState(name=f"token-{i}", client=client)
+            self._install_header_hook(state)
+            self.tokens.append(state)
+        self.queue_wait_seconds = 0.0
+        self.waits = 0
+
+    @staticmethod
+    def _install_header_hook(state: TokenState) -> None:
+        session = getattr(state.client, "session", None)
+        if session is None:
+            return
+
+        def hook(response, *args, **kwargs):
+            # requests runs hooks on the calling thread; keep headers per thread.
+            state.local.headers = response.headers
+            state.local.size = len(getattr(response, "content", None) or b"")
+
+        session.hooks.setdefault("response", []).append(hook)
+
+    # --- selection ---
+    def _available(self, budget: Budget, now: float) -> float:
+        if budget.remaining is None or now >= budget.reset_at:
+            return float("inf") if budget.limit is None else budget.limit
+        return budget.remaining
+
+    def _acquire(self, endpoint: str) -> TokenState:
+        while True:
+            with self._lock:
+                now = self._clock()
+                best = max(
+                    self.tokens,
+                    key=lambda s: self._available(s.budgets.setdefault(endpoint, Budget()), now),
+                )
+                budget = best.budgets[endpoint]
+                if self._available(budget, now) > 0:
+                    if budget.remaining is not None and now < budget.reset_at:
+                        budget.remaining -= 1  # reserve; corrected from the response headers
+                    best.requests += 1
+                    return best
+                wait = min(s.budgets[endpoint].reset_at for s in self.tokens) - now + 1
+            wait = max(wait, 0.0)
+            if self.on_wait is not None:
+                self.on_wait(wait)
+            with timed(self.metrics, "rate_limit_sleep"):
+                self._sleep(wait)
+            if self.metrics is not None:
+                self.metrics.incr("rate_limit_sleeps")
+            with self._lock:
+                self.queue_wait_seconds += wait
+                self.waits += 1
+
+    def _record(self, state: TokenState, endpoint: str, headers) -> None:
+        if not headers:
+            return
+        try:
+            limit = int(headers["x-rate-limit-limit"])
+            remaining = int(headers["x-rate-limit-remaining"])
+            reset_at = float(headers["x-rate-limit-reset"])
+        except (KeyError, TypeError, ValueError):
+            return
+        with self._lock:
+            state.budgets[endpoint] = Budget(limit=limit, remaining=remaining, reset_at=reset_at)
+
+    # --- calls ---
+    def call(self, endpoint: str, *args, **kwargs):
+        """Call `client.<endpoint>(*args, **kwargs)` on the best token, retrying 429s."""
+        while True:
+            state = self._acquire(endpoint)
+            state.local.headers = None
+            state.local.size = 0
+            try:
+                with timed(self.metrics, "api"):
+                    result = getattr(state.client, endpoint)(*args, **kwargs)
+            except tweepy.TooManyRequests as e:
+                if self.metrics is not None:
+                    self.metrics.incr("retries")
+                with self._lock:
+                    state.rate_limited += 1
+                    budget = state.budgets.setdefault(endpoint, Budget())
+                    budget.remaining = 0
+                    budget.reset_at = max(budget.reset_at, self._clock() + 1)
+                self._record(state, endpoint, getattr(e.response, "headers", None))
+                continue
+            self._record(state, endpoint, state.local.headers)
+            if self.metrics is not None:
+                self.metrics.incr("requests")
+                self.metrics.incr("bytes_received", state.local.size)
+            return result
+
+    def method(self, endpoint: str) -> Callable:
+        """Return a routed callable named like the client method (tweepy.Paginator keys on it)."""
+
+        def routed(*args, **kwargs):
+            return self.call(endpoint, *args, **kwargs)
+
+        routed.__name__ = routed.__qualname__ = endpoint
+        return routed
+
+    # --- metrics ---
+    def stats(self) -> dict:
+        """Snapshot of per-token usage and the total time spent waiting for a budget."""
+        now = self._clock()
+        with self._lock:
+            tokens = {}
+            for s in self.tokens:
+                endpoints = {}
+                for name, b in s.budgets.items():
+                    used = None
+                    if b.limit and b.remaining is not None and now < b.reset_at:
+                        used = round(1 - b.remaining / b.limit, 4)
+                    endpoints[name] = {
+                        "limit": b.limit,
+                        "remaining": b.remaining,
+                        "reset_in": max(0.0, round(b.reset_at - now, 1)),
+                        "utilisation": used,
+                    }
+                tokens[s.name] = {
+                    "requests": s.requests,
+                    "rate_limited": s.rate_limited,
+                    "endpoints": endpoints,
+                }
+            return {
+                "queue_wait_seconds": round(self.queue_wait_seconds, 3),
+                "waits": self.waits,
+                "tokens": tokens,
+            }
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: state.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Small JSON-file state stores used to resume interrupted runs and poll incrementally.
+
+Usage:
+from twitter_extractor.state import CheckpointStore
+store = CheckpointStore(Path("outputs/.checkpoints.json"))
+cp = store.get("python", None, None)
+
+Notes:
+- Writes go to a temporary file first and are moved into place atomically.
+===========================================================================
+"""
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+
+
+def atomic_write_json(path: Path, payload: dict) -> None:
+    """Write `payload` to `path` via a fsynced temporary file and an atomic rename."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as fh:
+        json.dump(payload, fh, indent=2, sort_keys=True)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def read_json(path: Path) -> dict:
+    """The JSON object stored at `path`, or {} when the file does not exist yet."""
+    if not path.exists():
+        return {}
+    with path.open("r", encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+@dataclass
+class Checkpoint:
+    """Pagination state of one (query, time window) extraction.
+
+    `out_offset` is the byte size of the output file after the last page that
+    was fully written; resuming truncates the file back to it so that rows from
+    a partially written page are never duplicated. `out` records that file, so a
+    run with a different output never truncates it at a stale offset.
+    """
+
+    query: str
+    start_time: Optional[str] = None
+    end_time: Optional[str] = None
+    next_token: Optional[str] = None
+    newest_id: Optional[str] = None
+    oldest_id: Optional[str] = None
+    pages: int = 0
+    rows_written: int = 0
+    out_offset: int = 0
+    done: bool = False
+    out: Optional[str] = None
+
+
+class CheckpointStore:
+    """JSON file of checkpoints keyed by query and time window."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._entries: Dict[str, dict] = read_json(self.path)
+
+    @staticmethod
+    def key(query: str, start_time: Optional[str], end_time: Optional[str]) -> str:
+        return json.dumps([query, start_time or "", end_time or ""])
+
+    def get(
+        self, query: str, start_time: Optional[str] = None, end_time: Optional[str] = None
+    ) -> Optional[Checkpoint]:
+        entry = self._entries.get(self.key(query, start_time, end_time))
+        return Checkpoint(**entry) if entry else None
+
+    def save(self, checkpoint: Checkpoint) -> None:
+        k = self.key(checkpoint.query, checkpoint.start_time, checkpoint.end_time)
+        self._entries[k] = asdict(checkpoint)
+        atomic_write_json(self.path, self._entries)
+
+    def discard(
+        self, query: str, start_time: Optional[str] = None, end_time: Optional[str] = None
+    ) -> None:
+        if self._entries.pop(self.key(query, start_time, end_time), None) is not None:
+            atomic_write_json(self.path, self._entries)
+
+
+class HighWaterMarkStore:
+    """JSON file of the newest tweet id seen per query (the next run's `since_id`).
+
+    A run cut short by a page limit leaves a `pending` continuation instead of
+    moving the mark: the newest id it wrote and `until_id`, the oldest. The next
+    run fetches only the gap between the mark and `until_id`, and the mark moves
+    to the pending newest id once that gap is exhausted.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._entries: Dict[str, dict] = read_json(self.path)
+
+    def get(self, query: str) -> Optional[str]:
+        entry = self._entries.get(query)
+        return entry.get("newest_id") if entry else None
+
+    def pending(self, query: str) -> Optional[Dict[str, str]]:
+        """The unfinished catch-up for `query` ({"newest_id", "until_id"}), if any."""
+        entry = self._entries.get(query)
+        return entry.get("pending") if entry else None
+
+    def hold(self, query: str, newest_id: str, until_id: str) -> None:
+        """Record a catch-up stopped at `until_id`, keeping the mark where it is."""
+        entry = {"newest_id": self.get(query), "updated_at": _utc_now()}
+        entry["pending"] = {"newest_id": str(newest_id), "until_id": str(until_id)}
+        self._entries[query] = entry
+        atomic_write_json(self.path, self._entries)
+
+    def advance(self, query: str, newest_id: Optional[str]) -> bool:
+        """Record `newest_id` if it is newer than the stored mark and drop any pending
+        catch-up; return True if the mark moved."""
+        current = self.get(query)
+        moved = bool(newest_id) and (current is None or int(current) < int(newest_id))
+        if not moved and self.pending(query) is None:
+            return False
+        self._entries[query] = {
+            "newest_id": str(newest_id) if moved else current,
+            "updated_at": _utc_now(),
+        }
+        atomic_write_json(self.path, self._entries)
+        return moved
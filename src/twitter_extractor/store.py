@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: store.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Persistent SQLite tweet store: rows are upserted by tweet id, so overlapping runs never duplicate.
+
+Usage:
+from twitter_extractor.store import TweetStore
+with TweetStore(Path("outputs/tweets.db")) as store:
+    store.upsert(batch)
+    for chunk in store.select(start_time="2026-01-01T00:00:00Z", author_id="12"):
+        sink.write(chunk)
+
+Notes:
+- WAL journal; each upsert() call is one transaction (batch rows for throughput).
+- On conflict the public metrics, author username/name and `fetched_at` are refreshed.
+- Secondary indexes on created_at, author_id and conversation_id back `select`.
+- `created_at` is stored as fixed-width UTC text, so it sorts chronologically.
+- `fresh_ids` lets lookups skip tweets whose metrics were refreshed recently.
+===========================================================================
+"""
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Sequence, Set, Union
+
+from .models import ENTITY_FIELDS, INT_FIELDS, TWEET_FIELDS, TweetBatch, TweetRow
+from .utils import parse_iso
+
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+DEFAULT_CHUNK_SIZE = 10_000
+
+_SQL_TYPES = {name: "INTEGER" if name in INT_FIELDS else "TEXT" for name in TWEET_FIELDS}
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS tweets ("
+    + ", ".join(
+        f"{name} {_SQL_TYPES[name]}{' PRIMARY KEY' if name == 'id' else ''}"
+        for name in TWEET_FIELDS
+    )
+    + ", fetched_at TEXT NOT NULL)"
+)
+_INDEXES = ("created_at", "author_id", "conversation_id")
+_REFRESHED = ("like_count", "retweet_count", "reply_count", "quote_count")
+_UPSERT = (
+    f"INSERT INTO tweets ({', '.join(TWEET_FIELDS)}, fetched_at)"
+    f" VALUES ({', '.join('?' * (len(TWEET_FIELDS) + 1))})"
+    " ON CONFLICT(id) DO UPDATE SET "
+    + ", ".join(
+        [
+            f"{c} = COALESCE(excluded.{c}, tweets.{c})"
+            for c in (*_REFRESHED, "username", "name", *ENTITY_FIELDS)
+        ]
+        + ["fetched_at = excluded.fetched_at"]
+    )
+)
+
+
+def _to_text(value: Optional[datetime]) -> Optional[str]:
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime(TIMESTAMP_FORMAT)
+
+
+def _from_text(value: Optional[str]) -> Optional[datetime]:
+    if value is None:
+        return None
+    return datetime.strptime(value, TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc)
+
+
+def _bound(value: Union[str, datetime, None]) -> Optional[str]:
+    if value is None or isinstance(value, datetime):
+        return _to_text(value)
+    return _to_text(parse_iso(value))
+
+
+class TweetStore:
+    """SQLite-backed, id-deduplicated store of tweet rows."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(_SCHEMA)
+        # Stores created before a TweetRow field existed get the column added.
+        present = {row[1] for row in self._db.execute("PRAGMA table_info(tweets)")}
+        for name in TWEET_FIELDS:
+            if name not in present:
+                self._db.execute(f"ALTER TABLE tweets ADD COLUMN {name} {_SQL_TYPES[name]}")
+        for column in _INDEXES:
+            self._db.execute(f"CREATE INDEX IF NOT EXISTS tweets_{column} ON tweets ({column})")
+
+    def upsert(self, rows: Union[TweetBatch, Iterable[TweetRow]]) -> int:
+        """Insert or refresh `rows` in one transaction; return the number of rows given."""
+        batch = rows if isinstance(rows, TweetBatch) else TweetBatch.from_rows(rows)
+        if not len(batch):
+            return 0
+        columns = [batch.column(name) for name in TWEET_FIELDS]
+        i = TWEET_FIELDS.index("created_at")
+        columns[i] = [_to_text(v) for v in columns[i]]
+        fetched_at = [_to_text(datetime.now(timezone.utc))] * len(batch)
+        with self._db:
+            self._db.execute("BEGIN")
+            self._db.executemany(_UPSERT, zip(*columns, fetched_at, strict=True))
+        return len(batch)
+
+    def fresh_ids(self, ids: Sequence[str], max_age: float) -> Set[str]:
+        """The subset of `ids` (at most 999) stored less than `max_age` seconds ago."""
+        if not ids:
+            return set()
+        cutoff = _to_text(datetime.now(timezone.utc) - timedelta(seconds=max_age))
+        sql = (
+            f"SELECT id FROM tweets WHERE id IN ({', '.join('?' * len(ids))})"
+            " AND fetched_at >= ?"
+        )
+        return {row[0] for row in self._db.execute(sql, [*ids, cutoff])}
+
+    def count(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM tweets").fetchone()[0]
+
+    def select(
+        self,
+        *,
+        start_time: Union[str, datetime, None] = None,
+        end_time: Union[str, datetime, None] = None,
+        author_id: Optional[str] = None,
+        conversation_id: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[TweetBatch]:
+        """Yield matching rows newest first, `chunk_size` rows per TweetBatch.
+
+        `start_time` is inclusive and `end_time` exclusive, as in recent search.
+        """
+        where, params = [], []
+        for clause, value in (
+            ("created_at >= ?", _bound(start_time)),
+            ("created_at < ?", _bound(end_time)),
+            ("author_id = ?", author_id),
+            ("conversation_id = ?", conversation_id),
+        ):
+            if value is not None:
+                where.append(clause)
+                params.append(value)
+        sql = f"SELECT {', '.join(TWEET_FIELDS)} FROM tweets"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        # ids are numeric strings: the longer one is the newer tweet.
+        sql += " ORDER BY created_at DESC, length(id) DESC, id DESC"
+        cursor = self._db.execute(sql, params)
+        i = TWEET_FIELDS.index("created_at")
+        while True:
+            records = cursor.fetchmany(chunk_size)
+            if not records:
+                return
+            batch = TweetBatch()
+            for record in records:
+                values = list(record)
+                values[i] = _from_text(values[i])
+                batch.append_values(values)
+            yield batch
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> "TweetStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
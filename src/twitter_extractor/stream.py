@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: stream.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Filtered-stream consumer: rule management and a tweepy StreamingClient whose tweets flow
+through a bounded queue into flatten_page and the row sinks in batches.
+
+Usage:
+from twitter_extractor.stream import FilteredStream, consume, ensure_rules
+stream = FilteredStream(bearer_token)
+ensure_rules(stream, ["python lang:en"])
+stream.start()
+with open_sink(Path("outputs/live.jsonl"), append=True) as sink:
+    consume(stream, sink, duration=600)
+stream.stop()
+
+Notes:
+- The network thread only enqueues raw lines; JSON decoding, flattening and writing
+  happen in `consume`, in batches of `batch_size` or every `flush_seconds`.
+- When the writer falls behind and the queue (`max_queue` lines) is full, new lines
+  are dropped and counted rather than stalling the connection, which X would
+  otherwise close as a slow consumer. `StreamStats` reports drops, queue high-water
+  mark and the worst created_at -> write lag.
+- Reconnects back off exponentially, following X's guidance: from 0.25 s (up to 16 s)
+  after network errors or a closed stream, 5 s after HTTP errors and 60 s after 429s
+  (up to 320 s). A successful connection resets the backoff.
+- The `query` column holds the tags of the rules each tweet matched.
+===========================================================================
+"""
+from __future__ import annotations
+
+import json
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Iterable, List, Optional, Sequence
+
+import tweepy
+
+from .api import DEFAULT_TWEET_FIELDS
+from .io_utils import RowSink
+from .metrics import Metrics, timed
+from .users import UserCache
+from .utils import flatten_page
+
+DEFAULT_MAX_QUEUE = 10_000
+
+
+@dataclass
+class StreamStats:
+    received: int = 0     # lines read from the stream (tweets and error messages)
+    written: int = 0      # rows handed to the sink
+    dropped: int = 0      # lines discarded because the queue was full
+    errors: int = 0       # error messages, undecodable lines and failed connections
+    reconnects: int = 0
+    max_queue: int = 0    # queue high-water mark
+    max_lag: float = 0.0  # worst seconds from a tweet's created_at to its write
+
+
+@dataclass
+class Backoff:
+    """Reconnect delays: `start * 2**attempt` for the kind of failure, capped."""
+
+    network: float = 0.25
+    network_max: float = 16.0
+    http: float = 5.0
+    rate_limit: float = 60.0
+    http_max: float = 320.0
+
+    def delay(self, kind: str, attempt: int) -> float:
+        if kind == "network":
+            return min(self.network_max, self.network * 2**attempt)
+        start = self.rate_limit if kind == "rate_limit" else self.http
+        return min(self.http_max, start * 2**attempt)
+
+
+class FilteredStream(tweepy.StreamingClient):
+    """StreamingClient that queues raw lines and reconnects under its own backoff.
+
+    tweepy's built-in retry loop is cut short in the error callbacks, so `run`
+    decides when (and whether) to reconnect.
+    """
+
+    def __init__(
+        self,
+        bearer_token: str,
+        *,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        backoff: Optional[Backoff] = None,
+        max_reconnects: Optional[int] = None,
+        metrics: Optional[Metrics] = None,
+        **kwargs,
+    ):
+        super().__init__(bearer_token, **kwargs)
+        if max_queue < 1:
+            raise ValueError("max_queue must be >= 1")
+        self.queue: "queue.Queue[bytes]" = queue.Queue(max_queue)
+        self.backoff = backoff or Backoff()
+        self.max_reconnects = max_reconnects
+        self.metrics = metrics
+        self.stats = StreamStats()
+        self.error: Optional[BaseException] = None  # why `run` gave up, if it did
+        self.finished = threading.Event()
+        self._stopping = threading.Event()
+        self._failure: Optional[str] = None
+        self._attempt = 0
+        self._thread: Optional[threading.Thread] = None
+
+    # --- tweepy callbacks (network thread) ---
+    def on_data(self, raw_data: bytes) -> None:
+        stats = self.stats
+        stats.received += 1
+        try:
+            self.queue.put_nowait(raw_data)
+        except queue.Full:
+            stats.dropped += 1
+            if self.metrics is not None:
+                self.metrics.incr("stream_dropped")
+            return
+        depth = self.queue.qsize()
+        if depth > stats.max_queue:
+            stats.max_queue = depth
+
+    def on_connect(self) -> None:
+        self._attempt = 0
+
+    def on_request_error(self, status_code: int) -> None:
+        self._failure = "rate_limit" if status_code in (420, 429) else "http"
+        self.stats.errors += 1
+        if status_code in (400, 401, 403, 404):  # bad parameters or credentials: don't retry
+            self.error = RuntimeError(f"filtered stream refused the connection: HTTP {status_code}")
+        self.disconnect()
+
+    def on_connection_error(self) -> None:
+        self._failure = "network"
+        self.stats.errors += 1
+        self.disconnect()
+
+    def on_closed(self, response) -> None:
+        self._failure = "network"  # X closed the stream (e.g. operational disconnect)
+        self.disconnect()
+
+    def on_exception(self, exception: Exception) -> None:
+        self.error = exception
+        self.disconnect()
+
+    # --- connection supervisor ---
+    def run(self, **params) -> None:
+        """Connect with `params` (tweepy `filter` keywords) and reconnect until `stop()`."""
+        try:
+            while not self._stopping.is_set():
+                self._failure = None
+                self.filter(**params)
+                if self._stopping.is_set() or self.error is not None:
+                    break
+                if self.max_reconnects is not None and self.stats.reconnects >= self.max_reconnects:
+                    self.error = RuntimeError(
+                        f"filtered stream gave up after {self.stats.reconnects} reconnects"
+                    )
+                    break
+                delay = self.backoff.delay(self._failure or "network", self._attempt)
+                self._attempt += 1
+                self.stats.reconnects += 1
+                if self.metrics is not None:
+                    self.metrics.incr("stream_reconnects")
+                self._stopping.wait(delay)
+        finally:
+            self.finished.set()
+
+    def start(
+        self,
+        *,
+        tweet_fields: Sequence[str] = DEFAULT_TWEET_FIELDS,
+        expansions: Optional[Sequence[str]] = ("author_id",),
+        user_fields: Optional[Sequence[str]] = ("id", "name", "username"),
+        backfill_minutes: Optional[int] = None,
+    ) -> threading.Thread:
+        """Run the connection in a daemon thread; tweets arrive on `self.queue`."""
+        params = {
+            "tweet_fields": list(tweet_fields),
+            "expansions": list(expansions) if expansions else None,
+            "user_fields": list(user_fields) if user_fields else None,
+            "backfill_minutes": backfill_minutes,
+        }
+        self._thread = threading.Thread(
+            target=self.run, kwargs=params, name="filtered-stream", daemon=True
+        )
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """Disconnect; the network thread exits at its next line or keep-alive."""
+        self._stopping.set()
+        self.disconnect()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+# --- rules ---
+def list_rules(stream: tweepy.StreamingClient) -> List[tweepy.StreamRule]:
+    return list(stream.get_rules().data or ())
+
+
+def _check(response, action: str) -> None:
+    errors = getattr(response, "errors", None) or []
+    if errors:
+        details = "; ".join(
+            f"{e.get('value', '')}: {e.get('title') or e.get('message', '')}".strip(": ")
+            for e in errors
+        )
+        raise ValueError(f"could not {action} stream rules: {details}")
+
+
+def ensure_rules(stream: tweepy.StreamingClient, values: Iterable[str]) -> List[tweepy.StreamRule]:
+    """Add the rules in `values` that are not active yet (tagged with their value)."""
+    active = {rule.value for rule in list_rules(stream)}
+    missing = [v for v in dict.fromkeys(values) if v not in active]
+    if not missing:
+        return []
+    response = stream.add_rules([tweepy.StreamRule(value=v, tag=v) for v in missing])
+    _check(response, "add")
+    return list(response.data or ())
+
+
+def delete_rules(stream: tweepy.StreamingClient, ids: Iterable[str]) -> int:
+    """Delete rules by id; "all" deletes every active rule. Returns how many were deleted."""
+    ids = list(dict.fromkeys(ids))
+    if "all" in ids:
+        ids = [rule.id for rule in list_rules(stream)]
+    if not ids:
+        return 0
+    response = stream.delete_rules(ids)
+    _check(response, "delete")
+    return int(((response.meta or {}).get("summary") or {}).get("deleted", len(ids)))
+
+
+# --- consumer ---
+def _rule_tags(message: dict) -> Optional[str]:
+    rules = message.get("matching_rules") or ()
+    return ",".join(r.get("tag") or r.get("id", "") for r in rules) or None
+
+
+def consume(
+    stream: FilteredStream,
+    sink: RowSink,
+    *,
+    batch_size: int = 100,
+    flush_seconds: float = 1.0,
+    limit: Optional[int] = None,
+    duration: Optional[float] = None,
+    users: Optional[UserCache] = None,
+    metrics: Optional[Metrics] = None,
+    on_flush: Optional[Callable[[StreamStats], None]] = None,
+    clock: Callable[[], float] = time.monotonic,
+) -> StreamStats:
+    """Drain `stream.queue` into `sink` until `limit` rows, `duration` seconds, the stream
+    giving up, or Ctrl+C. Rows are written every `batch_size` tweets or `flush_seconds`.
+    """
+    stats = stream.stats
+    deadline = None if duration is None else clock() + duration
+    tweets: List[dict] = []
+    page_users: List[dict] = []
+    tags: List[Optional[str]] = []
+    last_flush = clock()
+
+    def write() -> None:
+        if limit is not None:
+            keep = max(0, limit - stats.written)
+            del tweets[keep:], tags[keep:]
+        if not tweets:
+            return
+        with timed(metrics, "flatten"):
+            batch = flatten_page({"data": tweets, "includes": {"users": page_users}}, users=users)
+        batch.set_column("query", tags)
+        sink.write(batch)
+        stats.written += len(batch)
+        created = [t for t in batch.raw_column("created_at") if t is not None]
+        if created:
+            lag = (datetime.now(timezone.utc) - min(created)).total_seconds()
+            stats.max_lag = max(stats.max_lag, lag)
+            if metrics is not None:
+                metrics.observe("stream_lag", lag)
+        if metrics is not None:
+            metrics.incr("stream_tweets", len(batch))
+        tweets.clear()
+        page_users.clear()
+        tags.clear()
+
+    try:
+        while True:
+            now = clock()
+            if deadline is not None and now >= deadline:
+                break
+            if limit is not None and stats.written + len(tweets) >= limit:
+                break
+            try:
+                wait = max(0.0, last_flush + flush_seconds - now)
+                if deadline is not None:
+                    wait = min(wait, deadline - now)
+                raw = stream.queue.get(timeout=wait)
+            except queue.Empty:
+                raw = None
+                if stream.finished.is_set():
+                    break
+            if raw is not None:
+                try:
+                    message = json.loads(raw)
+                except ValueError:  # a truncated or garbled line must not end the run
+                    message = None
+                if not isinstance(message, dict):
+                    stats.errors += 1
+                    message = {}
+                if "data" in message:
+                    tweets.append(message["data"])
+                    page_users.extend((message.get("includes") or {}).get("users") or ())
+                    tags.append(_rule_tags(message))
+                elif "errors" in message:
+                    stats.errors += 1  # e.g. an operational-disconnect notice
+            if len(tweets) >= batch_size:
+                write()
+            if clock() - last_flush >= flush_seconds:
+                write()
+                sink.flush()
+                last_flush = clock()
+                if on_flush is not None:
+                    on_flush(stats)
+    except KeyboardInterrupt:
+        pass
+    write()
+    return stats
@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: threads.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Conversation thread assembly: an incremental conversation_id -> ordered tweet ids index,
+optional fetching of missing thread members and nested JSONL export.
+
+Usage:
+from twitter_extractor.threads import ThreadSink
+with ThreadSink(open_sink(out), Path("outputs/threads.jsonl"), client=client) as sink:
+    extract(client, sink, query="python")
+
+Notes:
+- Tweets are kept in id order (snowflake ids are time ordered) with one insort each;
+  replies nest under their `in_reply_to_id` parent in the exported tree.
+- Memory is bounded: a conversation is finished and written once it has been idle
+  for `idle_seconds`, or when `max_conversations`/`max_tweets` would be exceeded
+  (least recently updated first). A conversation that gets more tweets after being
+  written is written again with just those tweets.
+- With a client, finished conversations missing their root or a reply parent are
+  searched with `conversation_id:` queries, OR-ed together up to `max_query_chars`;
+  tweets already held are not added twice. Recent search only reaches back 7 days.
+===========================================================================
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+from bisect import insort
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .io_utils import (
+    PART_SUFFIX,
+    Rows,
+    RowSink,
+    as_batch,
+    format_timestamp,
+    open_text,
+    split_compression,
+)
+from .metrics import Metrics, timed
+from .models import TWEET_FIELDS
+from .users import UserCache
+from .utils import flatten_page
+
+_ID = TWEET_FIELDS.index("id")
+_CONVERSATION = TWEET_FIELDS.index("conversation_id")
+_PARENT = TWEET_FIELDS.index("in_reply_to_id")
+_CREATED = TWEET_FIELDS.index("created_at")
+# Fields of each tweet node in the export (the conversation id is on the thread).
+_NODE_FIELDS = [(i, name) for i, name in enumerate(TWEET_FIELDS) if name != "conversation_id"]
+
+MAX_QUERY_CHARS = 512  # recent search query length limit on the basic tiers
+
+
+@dataclass
+class ThreadStats:
+    threads: int = 0     # conversations written
+    complete: int = 0    # ... with their root and every reply parent present
+    tweets: int = 0
+    fetched: int = 0     # tweets added by conversation_id searches
+    requests: int = 0
+
+
+class Conversation:
+    """The tweets of one conversation, keyed by id and kept in id order."""
+
+    __slots__ = ("conversation_id", "tweets", "order", "updated")
+
+    def __init__(self, conversation_id: str):
+        self.conversation_id = conversation_id
+        self.tweets: Dict[str, tuple] = {}  # id -> values in TWEET_FIELDS order
+        self.order: List[int] = []
+        self.updated = 0.0
+
+    def __len__(self) -> int:
+        return len(self.tweets)
+
+    def add(self, values: tuple) -> bool:
+        """Add (or refresh) one tweet; True when the id is new to the conversation."""
+        tweet_id = values[_ID]
+        is_new = tweet_id not in self.tweets
+        self.tweets[tweet_id] = values
+        if is_new:
+            insort(self.order, int(tweet_id))
+        return is_new
+
+    def ordered_ids(self) -> List[str]:
+        return [str(i) for i in self.order]
+
+    def missing(self) -> bool:
+        """True when the root or some reply's parent has not been seen."""
+        if self.conversation_id not in self.tweets:
+            return True
+        return any(v[_PARENT] is not None and v[_PARENT] not in self.tweets
+                   for v in self.tweets.values())
+
+    def to_record(self) -> dict:
+        """Nested thread: the root with `replies` under each tweet, plus detached subtrees."""
+        nodes: Dict[str, dict] = {}
+        for tweet_id in self.ordered_ids():
+            values = self.tweets[tweet_id]
+            node = {name: values[i] for i, name in _NODE_FIELDS}
+            node["created_at"] = format_timestamp(values[_CREATED]) or None
+            node["replies"] = []
+            nodes[tweet_id] = node
+        tops = []
+        for node in nodes.values():
+            parent = nodes.get(node["in_reply_to_id"] or "")
+            if parent is not None and parent is not node:
+                parent["replies"].append(node)
+            else:
+                tops.append(node)
+        root = nodes.get(self.conversation_id)
+        return {
+            "conversation_id": self.conversation_id,
+            "tweet_count": len(nodes),
+            "complete": not self.missing(),
+            "tweet_ids": list(nodes),
+            "root": root,
+            "detached": [node for node in tops if node is not root],
+        }
+
+
+def _tweet_values(rows: Rows) -> Iterator[tuple]:
+    batch = as_batch(rows)
+    return zip(*(batch.column(name) for name in TWEET_FIELDS), strict=True)
+
+
+class ThreadIndex:
+    """Incremental conversation_id -> Conversation index with bounded memory.
+
+    `add` returns the conversations it evicted (finished); `drain` returns the rest.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_conversations: int = 100_000,
+        max_tweets: int = 1_000_000,
+        idle_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_conversations < 1 or max_tweets < 1:
+            raise ValueError("max_conversations and max_tweets must be >= 1")
+        self.max_conversations = max_conversations
+        self.max_tweets = max_tweets
+        self.idle_seconds = idle_seconds
+        self._clock = clock
+        self._conversations: "OrderedDict[str, Conversation]" = OrderedDict()
+        self.tweets = 0
+
+    def __len__(self) -> int:
+        return len(self._conversations)
+
+    def __contains__(self, conversation_id: str) -> bool:
+        return conversation_id in self._conversations
+
+    def ordered_ids(self, conversation_id: str) -> List[str]:
+        return self._conversations[conversation_id].ordered_ids()
+
+    def add(self, rows: Rows) -> List[Conversation]:
+        now = self._clock()
+        conversations = self._conversations
+        for values in _tweet_values(rows):
+            # A tweet without a conversation id (older payloads) is its own thread.
+            cid = values[_CONVERSATION] or values[_ID]
+            conv = conversations.get(cid)
+            if conv is None:
+                conv = conversations[cid] = Conversation(cid)
+            else:
+                conversations.move_to_end(cid)
+            if conv.add(values):
+                self.tweets += 1
+            conv.updated = now
+        return self.expire(now)
+
+    def expire(self, now: Optional[float] = None) -> List[Conversation]:
+        """Evict idle conversations and any beyond the size bounds, oldest update first."""
+        now = self._clock() if now is None else now
+        finished = []
+        while self._conversations:
+            conv = next(iter(self._conversations.values()))
+            idle = self.idle_seconds is not None and now - conv.updated >= self.idle_seconds
+            over = (
+                len(self._conversations) > self.max_conversations
+                or self.tweets > self.max_tweets
+            )
+            if not (idle or over):
+                break
+            self._conversations.popitem(last=False)
+            self.tweets -= len(conv)
+            finished.append(conv)
+        return finished
+
+    def drain(self) -> List[Conversation]:
+        finished = list(self._conversations.values())
+        self._conversations.clear()
+        self.tweets = 0
+        return finished
+
+
+def conversation_queries(
+    conversation_ids: Iterable[str], *, max_chars: int = MAX_QUERY_CHARS
+) -> Iterator[Tuple[List[str], str]]:
+    """De-duplicated `conversation_id:` terms OR-ed into queries of at most `max_chars`."""
+    group: List[str] = []
+    query = ""
+    for cid in dict.fromkeys(conversation_ids):
+        term = f"conversation_id:{cid}"
+        candidate = f"{query} OR {term}" if query else term
+        if query and len(candidate) > max_chars:
+            yield group, query
+            group, candidate = [], term
+        group.append(cid)
+        query = candidate
+    if group:
+        yield group, query
+
+
+def fetch_members(
+    client,
+    conversations: Sequence[Conversation],
+    *,
+    max_query_chars: int = MAX_QUERY_CHARS,
+    limit_pages: Optional[int] = 10,
+    users: Optional[UserCache] = None,
+    stats: Optional[ThreadStats] = None,
+    metrics: Optional[Metrics] = None,
+) -> int:
+    """Search for the members of `conversations` and add the tweets they lack; return how many."""
+    by_id = {c.conversation_id: c for c in conversations}
+    added = 0
+    for _, query in conversation_queries(by_id, max_chars=max_query_chars):
+        for page in client.search(query=query, limit_pages=limit_pages):
+            with timed(metrics, "flatten"):
+                batch = flatten_page(page, users=users, query=query)
+            if stats is not None:
+                stats.requests += 1
+            if metrics is not None:
+                metrics.page(len(batch), query=query)
+            for values in _tweet_values(batch):
+                conv = by_id.get(values[_CONVERSATION])
+                if conv is not None and conv.add(values):
+                    added += 1
+    if stats is not None:
+        stats.fetched += added
+    return added
+
+
+class ThreadSink:
+    """Sink wrapper that also assembles the rows into threads written as nested JSONL.
+
+    Rows pass through to `sink` unchanged. Finished conversations are written to
+    `path` (one thread per line; a .gz/.zst suffix compresses it), which is
+    renamed into place from `<path>.part` on close.
+    """
+
+    def __init__(
+        self,
+        sink: RowSink,
+        path: Path,
+        *,
+        client=None,
+        max_conversations: int = 100_000,
+        max_tweets: int = 1_000_000,
+        idle_seconds: Optional[float] = None,
+        max_query_chars: int = MAX_QUERY_CHARS,
+        fetch_pages: Optional[int] = 10,
+        fetch_batch: int = 50,
+        users: Optional[UserCache] = None,
+        metrics: Optional[Metrics] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.sink = sink
+        self.threads_path = Path(path)
+        self.client = client
+        self.index = ThreadIndex(
+            max_conversations=max_conversations,
+            max_tweets=max_tweets,
+            idle_seconds=idle_seconds,
+            clock=clock,
+        )
+        self.stats = ThreadStats()
+        self.max_query_chars = max_query_chars
+        self.fetch_pages = fetch_pages
+        self.fetch_batch = fetch_batch
+        self.users = users
+        self.metrics = metrics
+        self.path = sink.path
+        self._awaiting: List[Conversation] = []  # finished but incomplete, to be fetched
+        self._write_path = self.threads_path.with_name(self.threads_path.name + PART_SUFFIX)
+        self.threads_path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = open_text(self._write_path, "w", compression=split_compression(path)[1])
+        self._encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+        self._closed = False
+
+    @property
+    def rows_written(self) -> int:
+        return self.sink.rows_written
+
+    @property
+    def byte_offsets(self) -> bool:
+        return self.sink.byte_offsets
+
+    def write(self, rows: Rows) -> None:
+        if self._closed:
+            raise RuntimeError(f"Sink for {self.path} is closed.")
+        batch = as_batch(rows)
+        self.sink.write(batch)
+        self._finish(self.index.add(batch))
+
+    def _finish(self, conversations: List[Conversation], *, final: bool = False) -> None:
+        if self.client is not None:
+            ready = []
+            for conv in conversations:
+                (self._awaiting if conv.missing() else ready).append(conv)
+            self._emit(ready)
+            if self._awaiting and (final or len(self._awaiting) >= self.fetch_batch):
+                awaiting, self._awaiting = self._awaiting, []
+                fetch_members(
+                    self.client,
+                    awaiting,
+                    max_query_chars=self.max_query_chars,
+                    limit_pages=self.fetch_pages,
+                    users=self.users,
+                    stats=self.stats,
+                    metrics=self.metrics,
+                )
+                self._emit(awaiting)
+        else:
+            self._emit(conversations)
+
+    def _emit(self, conversations: List[Conversation]) -> None:
+        if not conversations:
+            return
+        stats = self.stats
+        for conv in conversations:  # one record at a time: drain() may hold every thread
+            record = conv.to_record()
+            self._fh.write(self._encode(record) + "\n")
+            stats.threads += 1
+            stats.complete += record["complete"]
+            stats.tweets += record["tweet_count"]
+
+    def flush(self) -> None:
+        self.sink.flush()
+        self._finish(self.index.expire())  # idle conversations during quiet polls
+        self._fh.flush()
+
+    def tell(self) -> int:
+        return self.sink.tell()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._finish(self.index.drain(), final=True)
+            self._fh.close()
+            os.replace(self._write_path, self.threads_path)
+        finally:
+            self.sink.close()
+
+    def abort(self) -> None:
+        """Close after a failure: the unfinished `.part` threads file is removed."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._fh.close()
+            os.remove(self._write_path)
+        finally:
+            self.sink.abort()
+
+    def __enter__(self) -> "ThreadSink":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: users.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Bounded LRU cache of author id -> (username, name), fed by the `includes["users"]` expansion.
+
+Usage:
+from twitter_extractor.users import UserCache
+users = UserCache(capacity=50_000, path=Path("outputs/.users.json"))
+rows = flatten_tweets(page.data, includes=page.includes, users=users)
+users.save(); print(users.stats())
+
+Notes:
+- One cache is shared by every page (and slice/query) of a run; with `path`
+  it is loaded on start and saved atomically, so it also carries across runs.
+- Thread-safe: sliced searches flatten pages on worker threads.
+===========================================================================
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Tuple
+
+from .state import atomic_write_json, read_json
+
+User = Tuple[Optional[str], Optional[str]]  # (username, name)
+
+DEFAULT_CAPACITY = 100_000
+
+
+def _field(user, name: str):
+    return user.get(name) if isinstance(user, Mapping) else getattr(user, name, None)
+
+
+def user_index(includes: Optional[dict]) -> Dict[str, User]:
+    """Per-page author id -> (username, name) from Tweepy `includes["users"]`."""
+    users = (includes or {}).get("users") or ()
+    return {str(_field(u, "id")): (_field(u, "username"), _field(u, "name")) for u in users}
+
+
+class UserCache:
+    """LRU of resolved authors; least recently used entries are evicted beyond `capacity`."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, path: Optional[Path] = None):
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.capacity = capacity
+        self.path = Path(path) if path is not None else None
+        self._users: "OrderedDict[str, User]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if self.path is not None:
+            # Saved oldest first, so replaying keeps the recency order.
+            for user_id, username, name in read_json(self.path).get("users", []):
+                self._put(user_id, (username, name))
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def _put(self, user_id: str, user: User) -> None:
+        self._users[user_id] = user
+        self._users.move_to_end(user_id)
+        while len(self._users) > self.capacity:
+            self._users.popitem(last=False)
+            self.evictions += 1
+
+    def resolve(self, user_id: str, page_users: Mapping[str, User]) -> Optional[User]:
+        """Return the cached user, else take it from this page's includes and cache it."""
+        with self._lock:
+            user = self._users.get(user_id)
+            if user is not None:
+                self.hits += 1
+                self._users.move_to_end(user_id)
+                return user
+            self.misses += 1
+            user = page_users.get(user_id)
+            if user is not None:
+                self._put(user_id, user)
+            return user
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        with self._lock:
+            users = [[user_id, *user] for user_id, user in self._users.items()]
+        atomic_write_json(self.path, {"users": users})
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._users),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+        }
@@ -1,55 +1,176 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-"""
-===========================================================================
-Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
-File: utils.py
-Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
-Created: 2025-10-25
-Updated: 2025-10-25
-License: MIT License (see LICENSE file for details)
-===========================================================================
-
-Description:
-Utility functions to flatten Tweepy Tweet objects into CSV-friendly records.
-
-Usage:
-from twitter_extractor.utils import flatten_tweets
-
-Notes:
-- Public metrics are optional; defaults are handled safely.
-===========================================================================
-"""
-from __future__ import annotations
-
-from typing import Iterable, List
-
-from .models import TweetRow
-
-
-def flatten_tweets(tweets: Iterable, includes: dict | None = None) -> List[TweetRow]:
-    """Convert Tweepy Tweet objects to flat rows.
-
-    Parameters
-    ----------
-    tweets: Iterable of tweepy.Tweet
-    includes: Optional includes dict returned by Tweepy (users, etc.)
-    """
-    rows: List[TweetRow] = []
-    for t in tweets:
-        public_metrics = getattr(t, "public_metrics", None) or {}
-        rows.append(
-            TweetRow(
-                id=str(getattr(t, "id", "")),
-                created_at=getattr(t, "created_at", None),
-                text=getattr(t, "text", ""),
-                author_id=str(getattr(t, "author_id", "")) or None,
-                like_count=public_metrics.get("like_count"),
-                retweet_count=public_metrics.get("retweet_count"),
-                reply_count=public_metrics.get("reply_count"),
-                quote_count=public_metrics.get("quote_count"),
-                lang=getattr(t, "lang", None),
-                conversation_id=str(getattr(t, "conversation_id", "")) or None,
-            )
-        )
-    return rows
\ No newline at end of file
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: utils.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-10-25
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Utility functions to flatten Tweepy Tweet objects (or raw JSON pages) into CSV-friendly records.
+
+Usage:
+from twitter_extractor.utils import flatten_page, flatten_tweets
+batch = flatten_page(page, users=users)  # tweepy.Response or raw dict page
+
+Notes:
+- Public metrics are optional; defaults are handled safely.
+- `as_batch=True` fills a columnar TweetBatch without creating TweetRow objects.
+- Author username/name come from `includes["users"]`, through a UserCache when given.
+- `flatten_payload` reads raw JSON pages (TwitterClient(raw=True)) column by column,
+  skipping tweepy.Tweet construction and per-row getattr calls.
+===========================================================================
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Iterable, List, Mapping, Optional, Union
+
+from .models import ENTITY_FIELDS, INT_FIELDS, MISSING_INT, TweetBatch, TweetRow
+from .users import UserCache, user_index
+
+_NO_METRICS: Mapping[str, int] = {}
+
+
+def _str_or_none(value) -> Optional[str]:
+    # tweepy.Tweet leaves fields the API omitted as None; keep them None, not "None".
+    return None if value is None or value == "" else str(value)
+
+
+def _replied_to(referenced) -> Optional[str]:
+    """Id of the tweet this one replies to, from `referenced_tweets` (dicts or tweepy objects)."""
+    for ref in referenced or ():
+        if isinstance(ref, Mapping):
+            kind, ref_id = ref.get("type"), ref.get("id")
+        else:
+            kind, ref_id = getattr(ref, "type", None), getattr(ref, "id", None)
+        if kind == "replied_to":
+            return _str_or_none(ref_id)
+    return None
+
+
+def flatten_tweets(
+    tweets: Iterable,
+    includes: dict | None = None,
+    *,
+    as_batch: bool = False,
+    users: Optional[UserCache] = None,
+    query: Optional[str] = None,
+) -> Union[List[TweetRow], TweetBatch]:
+    """Convert Tweepy Tweet objects to flat rows.
+
+    Parameters
+    ----------
+    tweets: Iterable of tweepy.Tweet
+    includes: Optional includes dict returned by Tweepy (users, etc.)
+    as_batch: Return a columnar TweetBatch instead of a list of TweetRow
+    users: Optional UserCache consulted before the page's includes
+    query: Search query recorded in each row's `query` column
+    """
+    batch = TweetBatch() if as_batch else None
+    rows: List[TweetRow] = []
+    page_users = user_index(includes)
+    for t in tweets:
+        public_metrics = getattr(t, "public_metrics", None) or {}
+        author_id = _str_or_none(getattr(t, "author_id", None))
+        user = None
+        if author_id is not None:
+            if users is not None:
+                user = users.resolve(author_id, page_users)
+            else:
+                user = page_users.get(author_id)
+        username, name = user or (None, None)
+        # Values in TweetRow field order.
+        values = (
+            str(getattr(t, "id", "")),
+            getattr(t, "created_at", None),
+            getattr(t, "text", ""),
+            author_id,
+            public_metrics.get("like_count"),
+            public_metrics.get("retweet_count"),
+            public_metrics.get("reply_count"),
+            public_metrics.get("quote_count"),
+            getattr(t, "lang", None),
+            _str_or_none(getattr(t, "conversation_id", None)),
+            username,
+            name,
+            query,
+            _replied_to(getattr(t, "referenced_tweets", None)),
+            None,  # hashtags/mentions/urls are left to enrichment
+            None,
+            None,
+        )
+        if batch is not None:
+            batch.append_values(values)
+        else:
+            rows.append(TweetRow(*values))
+    return batch if batch is not None else rows
+
+
+def _parse_created_at(value: Optional[str]) -> Optional[datetime]:
+    # Same instant tweepy.Tweet parses from "2026-01-01T00:00:00.000Z".
+    return datetime.fromisoformat(value.replace("Z", "+00:00")) if value else None
+
+
+def parse_iso(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp (accepts a trailing 'Z'); naive values are UTC."""
+    dt = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def flatten_payload(
+    payload: Mapping,
+    *,
+    users: Optional[UserCache] = None,
+    query: Optional[str] = None,
+) -> TweetBatch:
+    """Flatten a raw v2 JSON page (`data`/`includes`) into a TweetBatch, one column at a time.
+
+    Produces the same rows as `flatten_tweets` on the parsed page.
+    """
+    data = payload.get("data") or ()
+    page_users = user_index(payload.get("includes"))
+    authors = [t.get("author_id") for t in data]
+    if users is not None:
+        resolved = [None if a is None else users.resolve(a, page_users) for a in authors]
+    else:
+        resolved = [page_users.get(a) for a in authors]
+    metrics = [t.get("public_metrics") or _NO_METRICS for t in data]
+    columns = {
+        "id": [t["id"] for t in data],
+        "created_at": [_parse_created_at(t.get("created_at")) for t in data],
+        "text": [t.get("text", "") for t in data],
+        "author_id": authors,
+        "lang": [t.get("lang") for t in data],
+        "conversation_id": [t.get("conversation_id") for t in data],
+        "username": [u[0] if u else None for u in resolved],
+        "name": [u[1] if u else None for u in resolved],
+        "query": [query] * len(data),
+        "in_reply_to_id": [_replied_to(t.get("referenced_tweets")) for t in data],
+    }
+    for name in ENTITY_FIELDS:
+        columns[name] = [None] * len(data)
+    for name in INT_FIELDS:
+        columns[name] = [m.get(name, MISSING_INT) for m in metrics]
+    return TweetBatch.from_columns(columns)
+
+
+def flatten_page(
+    page, *, users: Optional[UserCache] = None, query: Optional[str] = None
+) -> TweetBatch:
+    """TweetBatch for one search/lookup page, raw dict or tweepy.Response."""
+    if isinstance(page, Mapping):
+        return flatten_payload(page, users=users, query=query)
+    return flatten_tweets(
+        page.data or [], includes=page.includes, as_batch=True, users=users, query=query
+    )
+
+
+def page_meta(page) -> dict:
+    """The `meta` block of a raw dict or tweepy.Response page ({} when absent)."""
+    meta = page.get("meta") if isinstance(page, Mapping) else getattr(page, "meta", None)
+    return meta or {}
\ No newline at end of file
@@ -1,23 +1,23 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-"""
-===========================================================================
-Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
-File: tests/__init__.py
-Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
-Created: 2025-10-25
-Updated: 2025-10-25
-License: MIT License (see LICENSE file for details)
-===========================================================================
-
-Description:
-Test package initializer.
-
-Usage:
-- Internal to pytest discovery.
-
-Notes:
-- Intentionally empty.
-===========================================================================
-"""
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: tests/__init__.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-10-25
+Updated: 2025-10-25
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Test package initializer.
+
+Usage:
+- Internal to pytest discovery.
+
+Notes:
+- Intentionally empty.
+===========================================================================
+"""
 # Empty init to make tests a package.
\ No newline at end of file
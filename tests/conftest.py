@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: tests/conftest.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Shared fixtures: a fake raw-JSON search client and a CLI runner that uses it.
+
+Usage:
+def test_cli(run_cli, tmp_path):
+    assert run_cli(["python", "--out", str(tmp_path / "t.csv")], per_page=5) == 0
+
+Notes:
+- `run_cli` patches `cli._make_client`, so no credentials or network are needed.
+===========================================================================
+"""
+from __future__ import annotations
+
+from typing import Callable, Optional, Sequence
+from unittest.mock import patch
+
+import pytest
+
+from twitter_extractor.cli import main
+
+
+class RawPageClient:
+    """Recent search over raw JSON pages: `limit_pages` pages (default 2) of `per_page`
+    tweets, newest first, always with a next_token. `text(page, i)` sets each text."""
+
+    cache = None
+    scheduler = None
+
+    def __init__(self, per_page: int = 3, text: Callable[[int, int], str] = lambda n, i: "t"):
+        self.per_page = per_page
+        self.text = text
+
+    def search(self, *, limit_pages=None, **kwargs):
+        for n in range(limit_pages or 2):
+            data = [
+                {"id": str(1000 - self.per_page * n - i), "text": self.text(n, i),
+                 "author_id": str(i % 3), "lang": "en", "created_at": "2026-10-17T09:30:00.000Z",
+                 "public_metrics": {"like_count": 2}}
+                for i in range(self.per_page)
+            ]
+            yield {"data": data, "meta": {"next_token": f"p{n + 1}"}}
+
+
+@pytest.fixture
+def run_cli():
+    """Run `cli.main(argv)` against `client`, by default a RawPageClient(**options)."""
+
+    def run(argv: Sequence[str], client: Optional[object] = None, **options) -> int:
+        client = client or RawPageClient(**options)
+        with patch("twitter_extractor.cli._make_client", return_value=client):
+            return main(list(argv))
+
+    return run
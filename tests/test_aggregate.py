@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: tests/test_aggregate.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Unit tests for streaming aggregation: sketches, rollup tables, the summary sink and CLI flags.
+
+Usage:
+pytest -q
+
+Notes:
+- Exact rollups are checked against a pandas groupby over the same rows.
+===========================================================================
+"""
+from __future__ import annotations
+
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from twitter_extractor.aggregate import (
+    AggregatingSink,
+    HyperLogLog,
+    Rollup,
+    SpaceSaving,
+    hash64,
+)
+from twitter_extractor.cli import parse_args
+from twitter_extractor.io_utils import open_sink
+from twitter_extractor.models import TweetBatch, TweetRow
+
+T0 = datetime(2026, 10, 17, 9, 30, tzinfo=timezone.utc)
+
+
+def row(i: int, *, minutes: int = 0, author="1", lang="en", likes=1, username=None) -> TweetRow:
+    created = None if minutes is None else T0 + timedelta(minutes=minutes)
+    return TweetRow(str(i), created, "t", author, likes, 2, 0, None, lang, str(i),
+                    username=username)
+
+
+def random_batch(n: int, seed: int = 3) -> TweetBatch:
+    rng = random.Random(seed)
+    return TweetBatch.from_rows(
+        row(i, minutes=rng.randint(0, 600), author=str(rng.randint(1, 300)),
+            lang=rng.choice(["en", "de", None]), likes=rng.choice([0, 5, None]))
+        for i in range(n)
+    )
+
+
+def test_hyperloglog_estimates_and_merges():
+    ids = [str(10**18 + i) for i in range(50_000)]
+    a, b = HyperLogLog(), HyperLogLog()
+    a.add_hashes(hash64(ids[:30_000]))
+    b.add_hashes(hash64(ids[20_000:]))
+    assert abs(len(a) - 30_000) < 600
+    a.merge(b)
+    assert abs(len(a) - 50_000) < 1_000
+    small = HyperLogLog(10)
+    small.add_hashes(hash64(["alice", "bob", "alice"]))  # non-numeric keys are hashed
+    assert len(small) == 2
+    with pytest.raises(ValueError):
+        a.merge(small)
+
+
+def test_space_saving_keeps_heavy_hitters_with_error_bounds():
+    rng = random.Random(1)
+    sketch, true = SpaceSaving(20), {}
+    for _ in range(20_000):
+        key = int(rng.paretovariate(1.1))
+        true[key] = true.get(key, 0) + 1
+        sketch.update(key)
+    assert len(sketch) == 20
+    top = sketch.top(5)
+    assert [k for k, _, _ in top] == sorted(true, key=true.get, reverse=True)[:5]
+    for key, count, error in sketch.top():
+        assert count - error <= true[key] <= count
+
+
+def test_rollup_buckets_langs_and_authors():
+    rollup = Rollup(top_k=2)
+    rollup.add(TweetBatch.from_rows([
+        row(1, minutes=0, author="7", username="ann"),
+        row(2, minutes=29, author="7", likes=None),
+        row(3, minutes=31, author="8", lang=None),
+        row(4, minutes=None, author=None),
+    ]))
+    rollup.add(TweetBatch())
+    summary = json.loads(json.dumps(rollup.summary()))
+    assert summary["start"] == "2026-10-17T09:00:00Z" and summary["end"] == "2026-10-17T11:00:00Z"
+    assert summary["totals"] == {
+        "tweets": 4, "like_count": 3, "retweet_count": 8, "reply_count": 0, "quote_count": 0
+    }
+    assert [(b["start"], b["tweets"], b["distinct_authors"]) for b in summary["buckets"]] == [
+        ("2026-10-17T09:00:00Z", 2, 1), ("2026-10-17T10:00:00Z", 1, 1), (None, 1, 0)
+    ]
+    assert [(g["lang"], g["tweets"]) for g in summary["langs"]] == [("en", 3), (None, 1)]
+    assert summary["top_authors"][0] == {
+        "author_id": "7", "username": "ann", "tweets": 2, "error": 0,
+        "like_count": 1, "retweet_count": 4, "reply_count": 0, "quote_count": 0,
+    }
+    assert summary["distinct_authors"] == 2
+
+
+def test_rollup_matches_pandas_groupby():
+    batch = random_batch(5_000)
+    rollup = Rollup(bucket="day", capacity=1000)
+    for start in range(0, len(batch), 700):
+        rollup.add(batch.take(range(start, min(start + 700, len(batch)))))
+    summary = rollup.summary()
+
+    df = pd.DataFrame(batch.columns())
+    by_lang = df.fillna({"lang": "?"}).groupby("lang")["like_count"].agg(["size", "sum"])
+    got = {(g["lang"] or "?"): (g["tweets"], g["like_count"]) for g in summary["langs"]}
+    assert got == {k: (int(v["size"]), int(v["sum"])) for k, v in by_lang.iterrows()}
+    per_author = df.groupby("author_id").size()
+    # With capacity above the number of authors, the counters are exact.
+    top = summary["top_authors"]
+    assert all(a["tweets"] == per_author[a["author_id"]] and not a["error"] for a in top)
+    assert top[-1]["tweets"] == per_author.sort_values(ascending=False).iloc[19]
+    assert abs(summary["distinct_authors"] - df["author_id"].nunique()) <= 6
+
+
+def test_aggregating_sink_alongside_and_instead_of_rows(tmp_path: Path):
+    now = [0.0]
+    summary = tmp_path / "summary.json"
+    with AggregatingSink(open_sink(tmp_path / "t.csv"), summary, clock=lambda: now[0]) as sink:
+        sink.write([row(1), row(2)])
+        sink.flush()
+        assert not summary.exists()  # not due yet
+        now[0] = 61
+        sink.flush()
+        assert json.loads(summary.read_text(encoding="utf-8"))["tweets"] == 2
+        sink.write(TweetBatch.from_rows([row(3)]))
+    assert json.loads(summary.read_text(encoding="utf-8"))["tweets"] == 3
+    assert len(pd.read_csv(tmp_path / "t.csv")) == 3
+
+    with AggregatingSink(None, tmp_path / "only.json") as sink:
+        sink.write([row(1)])
+    assert sink.rows_written == sink.tell() == 1 and not sink.byte_offsets
+    assert json.loads((tmp_path / "only.json").read_text(encoding="utf-8"))["tweets"] == 1
+
+
+def test_cli_aggregate_and_aggregate_only(tmp_path: Path, capsys, run_cli):
+    out, summary = tmp_path / "t.csv", tmp_path / "summary.json"
+    argv = ["python", "--out", str(out), "--pages", "2", "--aggregate", str(summary)]
+    assert run_cli(argv, per_page=5) == 0
+    assert len(pd.read_csv(out)) == 10
+    data = json.loads(summary.read_text(encoding="utf-8"))
+    assert data["totals"]["like_count"] == 20 and data["distinct_authors"] == 3
+    assert "Summary: 10 tweets in 1 hour buckets, ~3 authors" in capsys.readouterr().out
+
+    out.unlink()
+    argv += ["--aggregate-only", "--aggregate-bucket", "minute"]
+    assert run_cli(argv, per_page=5) == 0
+    assert not out.exists()
+    assert json.loads(summary.read_text(encoding="utf-8"))["bucket"] == "minute"
+    assert f"Saved 10 rows to {summary}" in capsys.readouterr().out
+
+    for bad in (["--aggregate-only"], ["--aggregate", "s.json", "--aggregate-only", "--resume"],
+                ["--aggregate", "s.json", "--top-authors", "0"]):
+        with pytest.raises(SystemExit):
+            parse_args(["python"] + bad)
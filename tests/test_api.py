@@ -1,51 +1,79 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-"""
-===========================================================================
-Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
-File: tests/test_api.py
-Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
-Created: 2025-10-25
-Updated: 2025-10-25
-License: MIT License (see LICENSE file for details)
-===========================================================================
-
-Description:
-Unit tests for the TwitterClient wrapper using mocks.
-
-Usage:
-pytest -q
-
-Notes:
-- Uses unittest.mock patching for Tweepy and credentials loader.
-===========================================================================
-"""
-from __future__ import annotations
-
-from unittest.mock import MagicMock, patch
-
-from twitter_extractor.api import TwitterClient
-
-
-@patch("twitter_extractor.api.load_credentials")
-@patch("tweepy.Client")
-def test_client_init_readonly(mock_client, mock_load):
-    mock_load.return_value = type("C", (), {"bearer_token": "BT"})()
-    c = TwitterClient()
-    assert hasattr(c, "client")
-    mock_client.assert_called_once()
-
-
-@patch("twitter_extractor.api.load_credentials")
-@patch("tweepy.Client")
-def test_search_generates_pages(mock_client, mock_load):
-    mock_load.return_value = type("C", (), {"bearer_token": "BT"})()
-
-    # Fake Tweepy paginator pages
-    fake_page = type("P", (), {"data": [MagicMock()], "includes": {}})()
-    mock_client.return_value.search_recent_tweets.return_value = [fake_page]
-
-    c = TwitterClient()
-    gen = c.search("python", limit_pages=1)
-    first = next(gen)
-    assert hasattr(first, "data")
\ No newline at end of file
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: tests/test_api.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-10-25
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Unit tests for the TwitterClient/AsyncTwitterClient wrappers using mocks.
+
+Usage:
+pytest -q
+
+Notes:
+- Uses unittest.mock patching for Tweepy and credentials loader.
+===========================================================================
+"""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from twitter_extractor.api import AsyncTwitterClient, TwitterClient
+
+
+@patch("twitter_extractor.api.load_credentials")
+@patch("tweepy.Client")
+def test_client_init_readonly(mock_client, mock_load):
+    mock_load.return_value = type("C", (), {"bearer_token": "BT"})()
+    c = TwitterClient()
+    assert hasattr(c, "client")
+    mock_client.assert_called_once()
+
+
+@patch("twitter_extractor.api.load_credentials")
+@patch("tweepy.Client")
+def test_search_generates_pages(mock_client, mock_load):
+    mock_load.return_value = type("C", (), {"bearer_token": "BT"})()
+
+    # Fake Tweepy paginator pages
+    fake_page = type("P", (), {"data": [MagicMock()], "includes": {}})()
+    mock_client.return_value.search_recent_tweets.return_value = [fake_page]
+
+    c = TwitterClient()
+    gen = c.search("python", limit_pages=1)
+    first = next(gen)
+    assert hasattr(first, "data")
+
+
+@patch("twitter_extractor.api.load_credentials")
+def test_async_search_shares_one_session(mock_load):
+    pytest.importorskip("aiohttp")
+    import tweepy
+
+    mock_load.return_value = type("C", (), {"bearer_token": "BT"})()
+    calls = []
+
+    async def search_recent_tweets(query, *, next_token=None, **params):
+        calls.append(next_token)
+        meta = {"next_token": "t2"} if next_token is None else {}
+        return tweepy.Response([MagicMock()], {}, [], meta)
+
+    async def run():
+        async with AsyncTwitterClient() as c:
+            c.client.search_recent_tweets = search_recent_tweets
+            pages = [p async for p in c.search("python", limit_pages=5)]
+            session = c.client.session
+        return pages, session
+
+    pages, session = asyncio.run(run())
+    assert len(pages) == 2 and calls == [None, "t2"]
+    assert session.closed
\ No newline at end of file
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: tests/test_batch.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Unit tests for concurrent multi-query extraction.
+
+Usage:
+pytest -q
+
+Notes:
+- A fake async client records how many searches are in flight at once.
+===========================================================================
+"""
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from twitter_extractor.batch import (
+    QueryResult,
+    format_summary,
+    read_queries,
+    read_query_specs,
+    run_batch,
+)
+from twitter_extractor.cli import main
+
+
+class FakeAsyncClient:
+    def __init__(self, fail=(), **options):
+        self.in_flight = 0
+        self.peak = 0
+        self.fail = set(fail)
+        self.calls = {}
+
+    async def search(self, query, **kwargs):
+        self.calls[query] = kwargs
+        if query in self.fail:
+            raise RuntimeError("boom")
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            for p in range(2):
+                await asyncio.sleep(0.01)
+                tweet = SimpleNamespace(id=p, text=query, created_at=None, author_id=1,
+                                        public_metrics={}, lang="en", conversation_id=p)
+                yield SimpleNamespace(data=[tweet], includes={}, meta={})
+        finally:
+            self.in_flight -= 1
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return None
+
+
+def test_queries_file_respects_concurrency_cap(tmp_path: Path, capsys):
+    qfile = tmp_path / "queries.txt"
+    qfile.write_text("# tracked keywords\npython\n\nrust\ngo\ntweepy\n", encoding="utf-8")
+    assert read_queries(qfile) == ["python", "rust", "go", "tweepy"]
+
+    client = FakeAsyncClient()
+    argv = ["--queries-file", str(qfile), "--out", str(tmp_path / "out.csv"), "--concurrency", "2"]
+    with patch("twitter_extractor.api.AsyncTwitterClient", return_value=client):
+        assert main(argv) == 0
+
+    summary = capsys.readouterr().out.splitlines()
+    assert [line.split()[1] for line in summary[1:5]] == ["2", "2", "2", "2"]
+    assert client.peak == 2
+    assert (tmp_path / "out-001-python.csv").exists()
+    assert len(list(tmp_path.glob("out-*.csv"))) == 4
+
+
+def test_read_query_specs_yaml_defaults_and_overrides(tmp_path: Path):
+    qfile = tmp_path / "queries.yaml"
+    qfile.write_text(
+        "defaults:\n  pages: 3\n"
+        "queries:\n"
+        "  - python\n"
+        "  - query: rust lang:en\n    start_time: 2026-01-01T00:00:00Z\n"
+        "    pages: 1\n    name: rust\n",
+        encoding="utf-8",
+    )
+    py, rust = read_query_specs(qfile)
+    assert (py.query, py.limit_pages, py.start_time) == ("python", 3, None)
+    assert (rust.query, rust.limit_pages, rust.name) == ("rust lang:en", 1, "rust")
+    assert rust.start_time.startswith("2026-01-01T00:00:00")
+
+
+def test_read_query_specs_json_and_txt(tmp_path: Path):
+    jfile = tmp_path / "queries.json"
+    jfile.write_text('[{"query": "go", "max_results": 10}, "tweepy"]', encoding="utf-8")
+    specs = read_query_specs(jfile)
+    assert [(s.query, s.max_results) for s in specs] == [("go", 10), ("tweepy", None)]
+    tfile = tmp_path / "queries.txt"
+    tfile.write_text("python\n# skipped\nrust\n", encoding="utf-8")
+    assert [s.query for s in read_query_specs(tfile)] == ["python", "rust"]
+    jfile.write_text('[{"query": "go", "until": "x"}]', encoding="utf-8")
+    with pytest.raises(ValueError):
+        read_query_specs(jfile)
+
+
+def test_run_batch_combined_output_with_query_column(tmp_path: Path):
+    jfile = tmp_path / "queries.json"
+    jfile.write_text(
+        '{"defaults": {"max_results": 50}, "queries": ["python", {"query": "rust", "pages": 1}]}',
+        encoding="utf-8",
+    )
+    client = FakeAsyncClient()
+    out = tmp_path / "all.csv"
+    results = asyncio.run(
+        run_batch(client, read_query_specs(jfile), out=out, combined=True, limit_pages=5)
+    )
+
+    assert [(r.query, r.rows, r.pages, r.error) for r in results] == [
+        ("python", 2, 2, None), ("rust", 2, 2, None)
+    ]
+    assert client.calls["python"]["limit_pages"] == 5 and client.calls["rust"]["limit_pages"] == 1
+    assert client.calls["rust"]["max_results"] == 50
+    df = pd.read_csv(out)
+    assert sorted(df["query"].unique()) == ["python", "rust"]
+    assert list(tmp_path.glob("all-*.csv")) == []
+
+
+def test_run_batch_isolates_failing_query(tmp_path: Path):
+    client = FakeAsyncClient(fail={"rust"})
+    results = asyncio.run(run_batch(client, ["python", "rust"], out=tmp_path / "out.csv"))
+    assert results[0].error is None and results[0].rows == 2
+    assert results[1].error == "RuntimeError: boom" and results[1].rows == 0
+
+    summary = format_summary(results)
+    assert "python" in summary and "error: RuntimeError: boom" in summary
+    assert summary.splitlines()[-1].split()[:3] == ["total", "2", "2"]
+
+
+def test_queries_file_reports_failed_queries_and_outputs(tmp_path: Path, capsys):
+    qfile = tmp_path / "queries.txt"
+    qfile.write_text("python\nrust\ngo\n", encoding="utf-8")
+    (tmp_path / "out-003-go.csv").mkdir()  # cannot be opened as the go output
+    argv = ["--queries-file", str(qfile), "--out", str(tmp_path / "out.csv")]
+    with patch("twitter_extractor.api.AsyncTwitterClient",
+               return_value=FakeAsyncClient(fail={"rust"})):
+        assert main(argv) == 1
+
+    status = {line.split()[0]: line.split(maxsplit=4)[-1]
+              for line in capsys.readouterr().out.splitlines()[1:4]}
+    assert status["python"] == "ok" and status["rust"] == "error: RuntimeError: boom"
+    assert status["go"].startswith("error: IsADirectoryError")
+    assert len(pd.read_csv(tmp_path / "out-001-python.csv")) == 2
+
+
+def test_format_summary_truncates_long_queries():
+    long = "x" * 80
+    summary = format_summary([QueryResult(query=long, path=Path("o.csv"), rows=1, pages=1)])
+    assert "x" * 50 in summary and "x" * 51 not in summary
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: tests/test_cache.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Unit tests for the SQLite response cache and cached/offline TwitterClient searches.
+
+Usage:
+pytest -q
+
+Notes:
+- The token scheduler is replaced by a fake that serves raw JSON payloads.
+===========================================================================
+"""
+from __future__ import annotations
+
+import zlib
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from twitter_extractor.api import TwitterClient
+from twitter_extractor.cache import CacheMiss, ResponseCache
+from twitter_extractor.utils import flatten_tweets
+
+
+def _payload(token):
+    n = 0 if token is None else int(token[3:])
+    meta = {"result_count": 1}
+    if n < 2:
+        meta["next_token"] = f"tok{n + 1}"
+    tweet = {"id": str(100 - n), "text": f"t{n}", "author_id": "1", "edit_history_tweet_ids": []}
+    users = [{"id": "1", "name": "A", "username": "a"}]
+    return {"data": [tweet], "includes": {"users": users}, "meta": meta}
+
+
+class FakeScheduler:
+    def __init__(self):
+        self.calls = []
+
+    def call(self, endpoint, **params):
+        self.calls.append(params.get("next_token"))
+        return _payload(params.get("next_token"))
+
+
+def _search(client):
+    pages = client.search("python", start_time="2026-01-01T00:00:00Z", limit_pages=None)
+    return [r for p in pages for r in flatten_tweets(p.data or [], includes=p.includes)]
+
+
+@patch("twitter_extractor.api.load_credentials")
+def test_repeat_search_is_served_from_cache_and_replays_offline(mock_load, tmp_path: Path):
+    mock_load.return_value = type("C", (), {"bearer_token": "BT"})()
+    with ResponseCache(tmp_path / "responses.sqlite") as cache:
+        client = TwitterClient(cache=cache)
+        client.scheduler = FakeScheduler()
+        first = _search(client)
+        assert client.scheduler.calls == [None, "tok1", "tok2"]
+        assert _search(client) == first
+        assert client.scheduler.calls == [None, "tok1", "tok2"]
+        assert cache.stats()["hits"] == 3
+
+    with ResponseCache(tmp_path / "responses.sqlite") as cache:
+        offline = TwitterClient(cache=cache, offline=True)
+        rows = _search(offline)
+        assert [r.id for r in rows] == ["100", "99", "98"] and rows[0].username == "a"
+        with pytest.raises(CacheMiss):
+            list(offline.search("other query"))
+
+
+def test_ttl_and_size_eviction(tmp_path: Path):
+    now = [1000.0]
+    cache = ResponseCache(tmp_path / "c.sqlite", ttl=60, max_bytes=10**9, clock=lambda: now[0])
+    cache.put("a", "search", {"data": []})
+    now[0] += 61
+    assert cache.get("a") is None
+
+    cache.max_bytes = 2 * len(zlib.compress(b'{"data":"xx"}'))
+    for key in ("k1", "k2", "k3"):
+        now[0] += 1
+        cache.put(key, "search", {"data": "xx"})
+    assert cache.get("k1") is None and cache.get("k3") == {"data": "xx"}
+    assert cache.stats()["entries"] == 2
+    assert ResponseCache.key("s", {"a": 1, "b": None}) == ResponseCache.key("s", {"a": 1})
+    cache.close()
+
+
+@patch("twitter_extractor.api.load_credentials")
+def test_raw_mode_yields_json_pages(mock_load, tmp_path: Path):
+    mock_load.return_value = type("C", (), {"bearer_token": "BT"})()
+    with ResponseCache(tmp_path / "responses.sqlite") as cache:
+        client = TwitterClient(cache=cache, raw=True)
+        client.scheduler = FakeScheduler()
+        pages = list(client.search("python", limit_pages=None))
+    assert all(isinstance(p, dict) for p in pages)
+    assert [p["data"][0]["id"] for p in pages] == ["100", "99", "98"]
+    with pytest.raises(ValueError):
+        TwitterClient(raw=True, bearer_only=False)
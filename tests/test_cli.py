@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: tests/test_cli.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Unit tests for CLI argument handling and its import footprint.
+
+Usage:
+pytest -q
+
+Notes:
+- Import checks run in a fresh interpreter so modules loaded by other tests don't leak in.
+===========================================================================
+"""
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from twitter_extractor.cli import parse_args
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+HEAVY = ("tweepy", "pandas", "pyarrow", "dotenv", "aiohttp", "asyncio", "requests")
+
+
+def _loaded_after(code: str) -> list:
+    probe = (
+        "import sys\n"
+        f"{code}\n"
+        f"print('loaded:' + ','.join(m for m in {HEAVY!r} if m in sys.modules))"
+    )
+    path = os.pathsep.join([str(SRC), os.environ.get("PYTHONPATH", "")])
+    env = {**os.environ, "PYTHONPATH": path}
+    out = subprocess.run(
+        [sys.executable, "-c", probe], env=env, capture_output=True, text=True, check=True
+    )
+    loaded = out.stdout.strip().splitlines()[-1].removeprefix("loaded:")
+    return [m for m in loaded.split(",") if m]
+
+
+def test_help_and_validation_do_not_import_heavy_modules():
+    assert _loaded_after("import twitter_extractor.cli") == []
+    code = (
+        "from twitter_extractor.cli import parse_args\n"
+        "for argv in (['--help'], [], ['q', '--slices', '0']):\n"
+        "    try:\n"
+        "        parse_args(argv)\n"
+        "    except SystemExit:\n"
+        "        pass"
+    )
+    assert _loaded_after(code) == []
+
+
+def test_parse_args_defaults_and_errors():
+    args = parse_args(["python"])
+    assert args.pages == 2 and args.out == Path("outputs/tweets.csv")
+    assert parse_args(["python", "--incremental"]).pages == 0
+    with pytest.raises(SystemExit):
+        parse_args(["python", "--follow", "--slices", "2"])
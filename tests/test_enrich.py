@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: tests/test_enrich.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Unit tests for the enrichment stage: built-in transforms, the process pool and the CLI flag.
+
+Usage:
+pytest -q
+
+Notes:
+- Custom transforms live at module level here so worker processes can import them.
+===========================================================================
+"""
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from twitter_extractor.enrich import (
+    EnrichingSink,
+    apply_transforms,
+    check_lang,
+    extract_entities,
+    normalize_text,
+    resolve_transforms,
+)
+from twitter_extractor.io_utils import open_sink
+from twitter_extractor.models import TweetBatch, TweetRow
+
+
+def make_batch(texts, start: int = 0) -> TweetBatch:
+    return TweetBatch.from_rows(
+        TweetRow(str(start + i), None, t, "1", i, 0, 0, 0, "en", None)
+        for i, t in enumerate(texts)
+    )
+
+
+def drop_odd_ids(batch: TweetBatch) -> TweetBatch:
+    return batch.take([i for i, v in enumerate(batch.raw_column("id")) if int(v) % 2 == 0])
+
+
+def slow_upper(batch: TweetBatch) -> TweetBatch:
+    time.sleep(0.02 if int(batch.raw_column("id")[0]) % 20 else 0.1)  # finish out of order
+    batch.set_column("text", [t.upper() for t in batch.raw_column("text")])
+    return batch
+
+
+def test_entities_normalize_and_lang():
+    batch = make_batch([
+        "Hi @Alice and @bob: #Python #python https://t.co/x1, see a@b.c #1",
+        "ｆｕｌｌｗｉｄｔｈ  \n text",
+    ])
+    batch.set_column("lang", ["EN", "und"])
+    rows = apply_transforms([extract_entities, normalize_text, check_lang], batch).to_rows()
+    assert (rows[0].hashtags, rows[0].mentions) == ("python 1", "alice bob")
+    assert rows[0].urls == "https://t.co/x1"
+    assert rows[1].hashtags is rows[1].mentions is rows[1].urls is None
+    assert rows[1].text == "fullwidth text"
+    assert [r.lang for r in rows] == ["en", None]
+
+
+def test_resolve_transforms_names_and_paths():
+    assert resolve_transforms(["entities", "tests.test_enrich:drop_odd_ids"]) == [
+        extract_entities,
+        drop_odd_ids,
+    ]
+    for bad in ("nope", "tests.test_enrich:missing", "no_such_module:fn"):
+        with pytest.raises(ValueError):
+            resolve_transforms([bad])
+
+
+def test_process_pool_keeps_order_and_bounds_in_flight(tmp_path: Path):
+    out = tmp_path / "t.csv"
+    with EnrichingSink(
+        open_sink(out), [slow_upper, drop_odd_ids], workers=2, max_pending=3, chunk_size=10
+    ) as sink:
+        for n in range(10):
+            sink.write(make_batch([f"t{n}"] * 10, start=n * 10))
+            assert len(sink._pending) <= 3
+        assert sink.rows_written < 50  # still in flight until flushed
+    assert sink.rows_written == 50
+    df = pd.read_csv(out, dtype={"id": str})
+    assert list(df["id"]) == [str(i) for i in range(0, 100, 2)]
+    assert set(df["text"].str[:1]) == {"T"}
+
+
+def test_inline_mode_and_tell_drain(tmp_path: Path):
+    sink = EnrichingSink(open_sink(tmp_path / "t.jsonl"), [extract_entities], workers=0)
+    sink.write(make_batch(["#a"]))
+    assert sink.tell() > 0 and sink.rows_written == 1
+    sink.close()
+    with pytest.raises(RuntimeError):
+        sink.write(make_batch(["x"]))
+
+
+def test_cli_enrich(tmp_path: Path, run_cli):
+    def text(page: int, i: int) -> str:
+        return f"#tag{i} @u{page}"
+
+    out = tmp_path / "t.csv"
+    argv = ["python", "--out", str(out), "--pages", "2", "--enrich", "entities,lang",
+            "--enrich-workers", "2"]
+    assert run_cli(argv, text=text) == 0
+    df = pd.read_csv(out)
+    assert list(df["hashtags"]) == ["tag0", "tag1", "tag2"] * 2
+    assert list(df["mentions"]) == ["u0"] * 3 + ["u1"] * 3
+
+    assert run_cli(["python", "--out", str(out), "--enrich", "bogus"]) == 2
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: tests/test_gui_worker.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Unit tests for the GUI's background fetch worker (no Tk display needed).
+
+Usage:
+pytest -q
+
+Notes:
+- The fake client blocks in the scheduler-style `sleep` to simulate a rate-limit wait.
+===========================================================================
+"""
+from __future__ import annotations
+
+import csv
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+from twitter_extractor.gui.worker import FetchWorker
+
+
+class WaitingClient:
+    """Serves one page, then waits out a 'rate limit' before the next one."""
+
+    def __init__(self, *, on_rate_limit_wait, sleep):
+        self.on_wait = on_rate_limit_wait
+        self.sleep = sleep
+        self.first_page = threading.Event()
+
+    def search(self, **kwargs):
+        for n in range(3):
+            if n:
+                self.on_wait(60.0)
+                self.sleep(60.0)
+            data = [
+                SimpleNamespace(id=n * 10 + i, text="t", created_at=None, author_id=1,
+                                public_metrics={}, lang="en", conversation_id=1)
+                for i in range(2)
+            ]
+            yield SimpleNamespace(data=data, includes={}, meta={"next_token": f"tok{n + 1}"})
+
+
+def _events(worker: FetchWorker) -> list:
+    events = []
+    while True:
+        kind, data = worker.events.get(timeout=5)
+        events.append((kind, data))
+        if kind in ("done", "error"):
+            return events
+
+
+def test_cancel_interrupts_rate_limit_wait_and_keeps_rows(tmp_path: Path):
+    out = tmp_path / "t.csv"
+    worker = FetchWorker(out, {"query": "q", "limit_pages": 3}, client_factory=WaitingClient)
+    worker.start()
+    assert worker.events.get(timeout=5) == ("progress", {"pages": 1, "rows": 2})
+    assert worker.events.get(timeout=5) == ("wait", {"seconds": 60.0})
+    worker.cancel()
+    assert _events(worker)[-1] == ("done", {"rows": 2, "cancelled": True})
+    worker.join(timeout=5)
+    with out.open(newline="", encoding="utf-8") as fh:
+        assert [r["id"] for r in csv.DictReader(fh)] == ["0", "1"]
+
+
+def test_errors_are_reported_as_events(tmp_path: Path):
+    def broken(**kwargs):
+        raise RuntimeError("Missing BEARER token.")
+
+    worker = FetchWorker(tmp_path / "t.csv", {"query": "q"}, client_factory=broken)
+    worker.start()
+    assert _events(worker) == [("error", {"message": "Missing BEARER token."})]
@@ -1,41 +1,269 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-"""
-===========================================================================
-Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
-File: tests/test_io_utils.py
-Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
-Created: 2025-10-25
-Updated: 2025-10-25
-License: MIT License (see LICENSE file for details)
-===========================================================================
-
-Description:
-Unit tests for DataFrame conversion and CSV saving utilities.
-
-Usage:
-pytest -q
-
-Notes:
-- Writes to tmp_path; asserts output exists.
-===========================================================================
-"""
-from __future__ import annotations
-
-from pathlib import Path
-
-import pandas as pd
-
-from twitter_extractor.io_utils import to_dataframe, save_csv
-from twitter_extractor.models import TweetRow
-
-
-def test_to_dataframe_and_save(tmp_path: Path):
-    rows = [
-        TweetRow(id="1", created_at=None, text="hi", author_id="2", like_count=1, retweet_count=0, reply_count=0, quote_count=0, lang="en", conversation_id="1"),
-        TweetRow(id="2", created_at=None, text="hey", author_id="3", like_count=2, retweet_count=1, reply_count=0, quote_count=0, lang="en", conversation_id="2"),
-    ]
-    df = to_dataframe(rows)
-    assert isinstance(df, pd.DataFrame)
-    out = save_csv(df, tmp_path / "out.csv")
-    assert out.exists()
\ No newline at end of file
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: tests/test_io_utils.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-10-25
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Unit tests for DataFrame conversion, CSV saving and streaming sink utilities.
+
+Usage:
+pytest -q
+
+Notes:
+- Writes to tmp_path; asserts output exists.
+===========================================================================
+"""
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from twitter_extractor.batch import query_output_path
+from twitter_extractor.cli import parse_args
+from twitter_extractor.io_utils import (
+    RotatingSink,
+    open_sink,
+    save_csv,
+    sink_class,
+    to_dataframe,
+    tweet_arrow_schema,
+)
+from twitter_extractor.models import TweetRow
+
+
+def test_to_dataframe_and_save(tmp_path: Path):
+    rows = [
+        TweetRow(id="1", created_at=None, text="hi", author_id="2", like_count=1,
+                 retweet_count=0, reply_count=0, quote_count=0, lang="en", conversation_id="1"),
+        TweetRow(id="2", created_at=None, text="hey", author_id="3", like_count=2,
+                 retweet_count=1, reply_count=0, quote_count=0, lang="en", conversation_id="2"),
+    ]
+    df = to_dataframe(rows)
+    assert isinstance(df, pd.DataFrame)
+    out = save_csv(df, tmp_path / "out.csv")
+    assert out.exists()
+
+
+def _row(i: int) -> TweetRow:
+    return TweetRow(id=str(i), created_at=None, text=f"t{i}", author_id="9", like_count=i,
+                    retweet_count=0, reply_count=0, quote_count=0, lang="en",
+                    conversation_id=str(i))
+
+
+def test_streaming_sink_flushes_in_batches(tmp_path: Path):
+    out = tmp_path / "out.csv"
+    with open_sink(out, batch_size=10) as sink:
+        sink.write(_row(i) for i in range(25))
+        assert sink.rows_written == 20  # two full batches flushed, five still buffered
+    assert sink.rows_written == 25
+    df = pd.read_csv(out)
+    assert len(df) == 25
+    assert list(df["like_count"][:3]) == [0, 1, 2]
+
+
+def test_jsonl_sink_and_unknown_extension(tmp_path: Path):
+    out = tmp_path / "out.jsonl"
+    with open_sink(out, batch_size=2) as sink:
+        sink.write([_row(1), _row(2), _row(3)])
+    assert len(out.read_text(encoding="utf-8").splitlines()) == 3
+
+    with pytest.raises(ValueError):
+        open_sink(tmp_path / "out.xlsx")
+
+
+def _mixed_rows() -> list:
+    cest = timezone(timedelta(hours=2))
+    return [
+        TweetRow(id="1", created_at=datetime(2026, 10, 17, 11, 30, tzinfo=cest),
+                 text='a, "b"\nc', author_id="2", like_count=None, retweet_count=3,
+                 reply_count=0, quote_count=None, lang="en", conversation_id="1"),
+        TweetRow(id="2", created_at=None, text="é", author_id="3", like_count=1,
+                 retweet_count=None, reply_count=None, quote_count=0, lang=None,
+                 conversation_id=None),
+    ]
+
+
+def test_text_sinks_write_iso_timestamps_and_missing_metrics(tmp_path: Path):
+    with open_sink(tmp_path / "t.csv") as sink:
+        sink.write(_mixed_rows())
+    lines = (tmp_path / "t.csv").read_text(encoding="utf-8").splitlines()
+    assert lines[1:3] == ['1,2026-10-17T09:30:00+00:00,"a, ""b""', 'c",2,,3,0,,en,1,,,,,,,']
+    assert lines[3] == "2,,é,3,1,,,0,,,,,,,,,"
+
+    with open_sink(tmp_path / "t.jsonl") as sink:
+        sink.write(_mixed_rows())
+    first, second = map(json.loads, (tmp_path / "t.jsonl").read_text("utf-8").splitlines())
+    assert first["created_at"] == "2026-10-17T09:30:00+00:00"
+    assert (first["like_count"], first["retweet_count"], first["quote_count"]) == (None, 3, None)
+    assert second["created_at"] is None and second["text"] == "é" and second["lang"] is None
+
+
+def test_text_sinks_read_back_like_the_old_pandas_output(tmp_path: Path):
+    rows = _mixed_rows()
+    df = to_dataframe(rows)
+    df.to_csv(tmp_path / "old.csv", index=False)
+    df.to_json(tmp_path / "old.jsonl", orient="records", lines=True, date_format="iso")
+    for ext, read in (("csv", pd.read_csv),
+                      ("jsonl", lambda p, **kw: pd.read_json(p, lines=True, **kw))):
+        with open_sink(tmp_path / f"new.{ext}") as sink:
+            sink.write(rows)
+        old, new = (read(tmp_path / f"{name}.{ext}", dtype={"id": str, "author_id": str,
+                                                            "conversation_id": str})
+                    for name in ("old", "new"))
+        for frame in (old, new):
+            frame["created_at"] = pd.to_datetime(frame["created_at"], utc=True)
+        pd.testing.assert_frame_equal(new, old)
+
+
+def test_csv_append_refuses_a_header_from_another_version(tmp_path: Path):
+    out = tmp_path / "old.csv"
+    out.write_text("id,created_at,text\n1,,hi\n", encoding="utf-8")  # before username etc.
+    with pytest.raises(ValueError, match=r"missing \['author_id'"):
+        open_sink(out, append=True)
+    assert out.read_text(encoding="utf-8") == "id,created_at,text\n1,,hi\n"
+
+    gz = tmp_path / "t.csv.gz"
+    with open_sink(gz) as sink:
+        sink.write([_row(1)])
+    with open_sink(gz, append=True) as sink:  # the current header is read back through gzip
+        sink.write([_row(2)])
+    assert list(pd.read_csv(gz)["id"]) == [1, 2]
+
+
+def test_parquet_schema_is_typed_and_partitions_by_date_and_lang(tmp_path: Path):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.dataset as ds
+
+    schema = tweet_arrow_schema()
+    assert schema.field("like_count").type == pa.int64()
+    assert schema.field("created_at").type == pa.timestamp("us", tz="UTC")
+    assert pa.types.is_dictionary(schema.field("lang").type)
+
+    rows = [_row(i) for i in range(4)]
+    for i, r in enumerate(rows):
+        r.created_at = datetime(2026, 1, 1 + i % 2, tzinfo=timezone.utc)
+        r.lang = "en" if i < 3 else "fr"
+    out = tmp_path / "tweets.parquet"
+    with open_sink(out, batch_size=2, partition_by=("date", "lang")) as sink:
+        sink.write(rows)
+    with open_sink(out, append=True, partition_by=("date", "lang")) as sink:
+        sink.write([_row(9)])
+
+    assert (out / "date=2026-01-01" / "lang=en").is_dir()
+    assert (out / "date=__HIVE_DEFAULT_PARTITION__").is_dir()
+    table = ds.dataset(out, format="parquet", partitioning="hive").to_table()
+    assert table.num_rows == 5
+    assert sorted(table.column("lang").to_pylist(), key=str) == ["en", "en", "en", "en", "fr"]
+
+    with open_sink(out, partition_by=("lang",)) as sink:  # a fresh run replaces the parts
+        sink.write([_row(7)])
+    assert [p.relative_to(out).parent.as_posix() for p in out.rglob("*.parquet")] == ["lang=en"]
+
+
+def test_partitioned_parquet_refuses_a_directory_it_did_not_write(tmp_path: Path):
+    mistyped = tmp_path / "data.parquet"
+    (mistyped / "date=2026-01-01").mkdir(parents=True)
+    (mistyped / "notes.txt").write_text("keep me", encoding="utf-8")
+    (tmp_path / "file.parquet").write_bytes(b"PAR1")
+    for out in (mistyped, tmp_path / "file.parquet"):
+        for append in (False, True):
+            with pytest.raises(ValueError, match="partitioned Parquet|needs a directory"):
+                open_sink(out, append=append, partition_by=("date",))
+    assert (mistyped / "notes.txt").read_text(encoding="utf-8") == "keep me"
+
+
+def test_gzip_sink_is_written_atomically(tmp_path: Path):
+    out = tmp_path / "out.csv.gz"
+    with open_sink(out, batch_size=10, compress_level=1) as sink:
+        sink.write(_row(i) for i in range(25))
+        assert not out.exists() and (tmp_path / "out.csv.gz.part").exists()
+        assert not sink.byte_offsets
+    assert out.exists() and not (tmp_path / "out.csv.gz.part").exists()
+    assert len(pd.read_csv(out)) == 25
+
+    with open_sink(out, append=True) as sink:  # appends a second gzip member
+        sink.write([_row(99)])
+    assert list(pd.read_csv(out)["id"])[-1] == 99
+
+
+def test_failed_run_never_publishes_a_partial_file(tmp_path: Path):
+    out = tmp_path / "out.csv.gz"
+    with pytest.raises(ConnectionError):
+        with open_sink(out, batch_size=10) as sink:
+            sink.write(_row(i) for i in range(25))
+            raise ConnectionError("boom")
+    assert not out.exists() and not (tmp_path / "out.csv.gz.part").exists()
+
+    rotating = RotatingSink(tmp_path / "r.csv", rotate_bytes=1, batch_size=1)
+    with pytest.raises(ConnectionError):
+        with rotating:
+            rotating.write([_row(1), _row(2)])  # the first file is complete once rolled
+            raise ConnectionError("boom")
+    assert [p.name for p in tmp_path.glob("r-*")] == [rotating.files[0].name]
+
+    with pytest.raises(ValueError, match="only supported for .parquet"):
+        open_sink(tmp_path / "t.csv.gz", partition_by=("date",))
+
+
+def test_zstd_jsonl_sink(tmp_path: Path):
+    zstd = pytest.importorskip("zstandard")
+    out = tmp_path / "out.jsonl.zst"
+    with open_sink(out) as sink:
+        sink.write(_row(i) for i in range(5))
+    with zstd.open(out, "rt", encoding="utf-8") as fh:
+        assert [json.loads(line)["id"] for line in fh] == ["0", "1", "2", "3", "4"]
+
+
+def test_compression_is_limited_to_text_formats(tmp_path: Path):
+    assert sink_class(tmp_path / "t.jsonl.gz").__name__ == "JsonlSink"
+    with pytest.raises(ValueError):
+        sink_class(tmp_path / "t.parquet.gz")
+    assert query_output_path(tmp_path / "t.csv.gz", "py thon", 2).name == "t-002-py_thon.csv.gz"
+    with pytest.raises(SystemExit):
+        parse_args(["q", "--out", str(tmp_path / "t.csv.gz"), "--resume"])
+
+
+def test_rotating_sink_rolls_over_by_hour_and_size(tmp_path: Path):
+    now = [datetime(2026, 10, 18, 11, 59, tzinfo=timezone.utc)]
+    sink = RotatingSink(
+        tmp_path / "tweets.csv.gz", batch_size=5, rotate_every="hour", rotate_bytes=400,
+        clock=lambda: now[0],
+    )
+    with sink:
+        sink.write(_row(i) for i in range(5))
+        assert list(tmp_path.glob("*.gz")) == []  # only the .part file so far
+        now[0] += timedelta(minutes=2)
+        sink.write(_row(i) for i in range(5, 10))
+        for i in range(10, 200, 5):  # grows past rotate_bytes within the 12:00 hour
+            sink.write(_row(j) for j in range(i, i + 5))
+    names = [p.name for p in sink.files]
+    assert names[:3] == [
+        "tweets-2026101811.csv.gz", "tweets-2026101812.csv.gz", "tweets-2026101812-1.csv.gz"
+    ]
+    assert not list(tmp_path.glob("*.part"))
+    ids = [i for p in sink.files for i in pd.read_csv(p)["id"]]
+    assert ids == list(range(200))
+
+
+def test_rotating_sink_never_overwrites_and_rejects_store(tmp_path: Path):
+    clock = lambda: datetime(2026, 1, 1, tzinfo=timezone.utc)  # noqa: E731
+    for _ in range(2):
+        with open_sink(tmp_path / "t.jsonl", rotate_every="day") as sink:
+            sink.write([_row(1)])
+    names = sorted(p.name for p in tmp_path.glob("t-*.jsonl"))
+    assert len(names) == 2 and names[0].endswith("-1.jsonl")
+    with pytest.raises(ValueError):
+        RotatingSink(tmp_path / "t.db", rotate_every="day", clock=clock)
+    with pytest.raises(ValueError):
+        RotatingSink(tmp_path / "t.csv")
\ No newline at end of file
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: tests/test_lookup.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Unit tests for id hydration: batching, ordering, freshness skipping and the CLI mode.
+
+Usage:
+pytest -q
+
+Notes:
+- A fake client answers lookups locally; ids ending in 7 are treated as deleted.
+===========================================================================
+"""
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from twitter_extractor.api import TwitterClient
+from twitter_extractor.cli import main
+from twitter_extractor.lookup import LookupStats, lookup_tweets, read_ids
+from twitter_extractor.store import TweetStore
+
+
+class FakeLookupClient:
+    def __init__(self):
+        self.batches = []
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, ids):
+        with self._lock:
+            self.batches.append(list(ids))
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(0.01 if int(ids[0]) % 200 else 0.03)  # complete out of order
+        with self._lock:
+            self.in_flight -= 1
+        data = [
+            SimpleNamespace(id=i, text=f"t{i}", created_at=None, author_id="1", lang="en",
+                            conversation_id=i, public_metrics={"like_count": int(i) % 5})
+            for i in ids if not i.endswith("7")
+        ]
+        users = [{"id": "1", "username": "a", "name": "A"}]
+        return SimpleNamespace(data=data, includes={"users": users})
+
+    cache = None
+    scheduler = None
+
+
+def test_read_ids_streams_plain_and_csv(tmp_path: Path):
+    f = tmp_path / "ids.csv"
+    f.write_text('id,text\n# comment\n"123",x\n456\n\nabc\n', encoding="utf-8")
+    assert list(read_ids(f)) == ["123", "456"]
+
+
+def test_lookup_batches_by_100_concurrently_in_input_order():
+    ids = [str(i) for i in range(1, 451)]
+    client = FakeLookupClient()
+    stats = LookupStats()
+    rows = [r for batch in lookup_tweets(client, iter(ids), workers=3, stats=stats) for r in batch]
+
+    assert sorted(len(b) for b in client.batches) == [50, 100, 100, 100, 100]
+    assert 1 < client.peak <= 3
+    assert [r.id for r in rows] == [i for i in ids if not i.endswith("7")]
+    assert rows[0].username == "a"
+    assert (stats.requested, stats.requests, stats.found) == (450, 5, len(rows))
+
+
+def test_lookup_skips_ids_refreshed_recently(tmp_path: Path):
+    client = FakeLookupClient()
+    with TweetStore(tmp_path / "t.db") as store:
+        store.upsert([r for b in lookup_tweets(client, [str(i) for i in range(1, 101)]) for r in b])
+        assert store.fresh_ids(["1", "2", "7", "999"], max_age=60) == {"1", "2"}
+
+        client.batches.clear()
+        stats = LookupStats()
+        ids = [str(i) for i in range(1, 151)]
+        list(lookup_tweets(client, ids, store=store, max_age=60, stats=stats))
+        # Only unseen ids (101..150) and the missing *7 ids are requested, regrouped into one call.
+        assert len(client.batches) == 1 and "1" not in client.batches[0]
+        assert "17" in client.batches[0] and "150" in client.batches[0]
+        assert stats.skipped == 90
+
+        list(lookup_tweets(client, ["1"], store=store, max_age=0, stats=LookupStats()))
+        assert client.batches[-1] == ["1"]
+
+
+@patch("twitter_extractor.api.load_credentials")
+def test_client_lookup_validates_and_routes_get_tweets(mock_load):
+    mock_load.return_value = type("C", (), {"bearer_token": "BT"})()
+    client = TwitterClient()
+    calls = []
+    client.scheduler = SimpleNamespace(method=lambda ep: lambda **kw: calls.append((ep, kw)))
+    client.lookup(["1", "2"])
+    assert calls[0][0] == "get_tweets" and calls[0][1]["ids"] == ["1", "2"]
+    with pytest.raises(ValueError):
+        client.lookup([str(i) for i in range(101)])
+
+
+def test_cli_lookup_mode(tmp_path: Path, capsys):
+    ids = tmp_path / "ids.txt"
+    ids.write_text("\n".join(str(i) for i in range(1, 21)), encoding="utf-8")
+    out = tmp_path / "hydrated.csv"
+    with patch("twitter_extractor.cli._make_client", return_value=FakeLookupClient()):
+        assert main(["--lookup-ids", str(ids), "--out", str(out)]) == 0
+    assert len(pd.read_csv(out)) == 18
+    assert "Looked up 20 ids" in capsys.readouterr().out
+    with patch("twitter_extractor.cli._make_client", return_value=FakeLookupClient()):
+        assert main(["--lookup-ids", str(ids), "--out", str(out), "--refresh-after", "60"]) == 2
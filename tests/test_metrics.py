@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: tests/test_metrics.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Unit tests for run metrics: timers, exporters and the CLI --metrics/--profile flags.
+
+Usage:
+pytest -q
+
+Notes:
+- The CLI test replaces the API client with one serving raw JSON pages.
+===========================================================================
+"""
+from __future__ import annotations
+
+import json
+import socket
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+from twitter_extractor.metrics import (
+    JsonLinesExporter,
+    Metrics,
+    PrometheusExporter,
+    build_metrics,
+    prometheus_text,
+)
+
+
+def test_timers_counters_and_json_lines(tmp_path: Path):
+    out = tmp_path / "metrics.jsonl"
+    metrics = Metrics([JsonLinesExporter(out)])
+    with metrics.timer("api"):
+        pass
+    with metrics.timer("api"):
+        pass
+    metrics.incr("bytes_received", 512)
+    metrics.page(100, query="python")
+    metrics.close()
+    metrics.close()  # idempotent
+
+    page, summary = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert page["event"] == "page" and page["tweets"] == 100 and page["query"] == "python"
+    assert page["totals"] == {"bytes_received": 512, "pages": 1, "tweets": 100}
+    assert summary["event"] == "summary" and summary["stages"]["api"]["calls"] == 2
+
+
+def test_prometheus_text_file_and_http_endpoint(tmp_path: Path):
+    prom = tmp_path / "extractor.prom"
+    http = PrometheusExporter(port=0)
+    metrics = Metrics([PrometheusExporter(path=prom, interval=0), http])
+    metrics.observe("write", 0.25)
+    metrics.page(10)
+    text = prom.read_text(encoding="utf-8")
+    assert "twitter_extractor_pages_total 1" in text
+    assert 'twitter_extractor_stage_seconds_total{stage="write"} 0.25' in text
+
+    with urllib.request.urlopen(f"http://127.0.0.1:{http.port}/metrics", timeout=5) as resp:
+        assert "twitter_extractor_tweets_total 10" in resp.read().decode()
+    metrics.close()
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_prometheus_text_sanitises_names():
+    snap = {"elapsed": 1.5, "counters": {"cache-hits": 2}, "stages": {}}
+    assert "twitter_extractor_cache_hits_total 2" in prometheus_text(snap)
+
+
+def test_build_metrics_rejects_unknown_specs(tmp_path: Path):
+    assert len(build_metrics(["json", f"prom:{tmp_path / 'x.prom'}"]).exporters) == 2
+    for bad in ("statsd", "prom", "otel:x", "prom-http:host"):
+        with pytest.raises(ValueError):
+            build_metrics([bad])
+
+    log = tmp_path / "m.jsonl"
+    with pytest.raises(ValueError):  # checked before the json exporter opens its file
+        build_metrics([f"json:{log}", "statsd"])
+    assert not log.exists()
+
+    with socket.socket() as taken:
+        taken.bind(("127.0.0.1", 0))
+        taken.listen()
+        with pytest.raises(OSError):
+            build_metrics([f"json:{log}", f"prom-http:127.0.0.1:{taken.getsockname()[1]}"])
+    assert json.loads(log.read_text(encoding="utf-8"))["event"] == "summary"  # closed again
+
+
+def test_cli_metrics_and_profile(tmp_path: Path, capsys, run_cli):
+    log = tmp_path / "metrics.jsonl"
+    argv = ["python", "--out", str(tmp_path / "t.csv"), "--pages", "3", "--batch-size", "2",
+            "--metrics", f"json:{log}", "--profile", "5"]
+    assert run_cli(argv) == 0
+    events = [json.loads(line) for line in log.read_text(encoding="utf-8").splitlines()]
+    assert [e["event"] for e in events] == ["page", "page", "page", "summary"]
+    summary = events[-1]
+    assert summary["counters"]["tweets"] == summary["counters"]["rows_written"] == 9
+    assert {"flatten", "write"} <= set(summary["stages"])
+    assert "function calls" in capsys.readouterr().err
+
+    assert run_cli(["python", "--out", str(tmp_path / "t.csv"), "--metrics", "bogus"]) == 2
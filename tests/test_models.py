@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: tests/test_models.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Unit tests for the slotted TweetRow and the columnar TweetBatch.
+
+Usage:
+pytest -q
+
+Notes:
+- Sinks must accept a TweetBatch exactly like a list of rows.
+===========================================================================
+"""
+from __future__ import annotations
+
+import csv
+from array import array
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+import tweepy
+
+from twitter_extractor.io_utils import open_sink
+from twitter_extractor.models import MISSING_INT, TWEET_FIELDS, TweetBatch, TweetRow
+from twitter_extractor.users import UserCache
+from twitter_extractor.utils import flatten_page, flatten_payload, flatten_tweets, page_meta
+
+
+def _row(i: int, likes=None) -> TweetRow:
+    ts = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return TweetRow(str(i), ts, f"t{i}", "1", likes, 0, 0, 0, "en", str(i))
+
+
+def test_tweet_row_is_slotted():
+    assert not hasattr(_row(1), "__dict__")
+
+
+def test_batch_round_trips_rows_and_missing_ints():
+    rows = [_row(1, likes=5), _row(2)]
+    batch = TweetBatch.from_rows(rows)
+    assert len(batch) == 2
+    assert isinstance(batch.raw_column("like_count"), array)
+    assert list(batch.raw_column("like_count")) == [5, MISSING_INT]
+    assert batch.column("like_count") == [5, None]
+    assert batch.to_rows() == rows
+    assert batch.take([1]).to_rows() == rows[1:]
+
+
+def test_flatten_as_batch_matches_rows():
+    tweet = SimpleNamespace(
+        id=7, created_at=None, text="hi", author_id=3, public_metrics={"like_count": 2},
+        lang="en", conversation_id=7,
+    )
+    assert flatten_tweets([tweet], as_batch=True).to_rows() == flatten_tweets([tweet])
+
+
+def test_sinks_accept_batches(tmp_path: Path):
+    out = tmp_path / "t.csv"
+    with open_sink(out, batch_size=2) as sink:
+        sink.write(TweetBatch.from_rows(_row(i) for i in range(3)))
+        sink.write([_row(3)])
+    assert sink.rows_written == 4
+    with out.open(newline="", encoding="utf-8") as fh:
+        data = list(csv.DictReader(fh))
+    assert [r["id"] for r in data] == ["0", "1", "2", "3"]
+    assert data[0]["like_count"] == ""
+
+
+def _raw_page() -> dict:
+    return {
+        "data": [
+            {"id": "9", "text": "a", "author_id": "1", "created_at": "2026-01-02T03:04:05.000Z",
+             "lang": "en", "conversation_id": "9", "edit_history_tweet_ids": ["9"],
+             "public_metrics": {"like_count": 4, "retweet_count": 1, "reply_count": 0,
+                                "quote_count": 2}},
+            {"id": "8", "text": "b", "author_id": "2", "edit_history_tweet_ids": ["8"]},
+        ],
+        "includes": {"users": [{"id": "1", "username": "a", "name": "A"}]},
+        "meta": {"next_token": "t2"},
+    }
+
+
+def test_flatten_payload_matches_tweepy_path():
+    payload = _raw_page()
+    parsed = tweepy.Client()._construct_response(payload, data_type=tweepy.Tweet)
+    expected = flatten_tweets(parsed.data, includes=parsed.includes, query="q")
+    batch = flatten_payload(payload, query="q")
+    assert isinstance(batch.raw_column("like_count"), array)
+    assert batch.to_rows() == expected
+    assert expected[0].created_at == datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    assert expected[1].like_count is None and expected[1].username is None
+    assert flatten_page(parsed, query="q").to_rows() == expected
+    assert page_meta(payload) == page_meta(parsed) == {"next_token": "t2"}
+
+
+def test_flatten_payload_uses_user_cache_and_empty_pages():
+    users = UserCache()
+    flatten_payload(_raw_page(), users=users)
+    page = _raw_page()
+    del page["includes"]
+    assert flatten_payload(page, users=users).column("username") == ["a", None]
+    assert len(flatten_payload({"meta": {"result_count": 0}})) == 0
+
+
+def test_batch_from_columns_validates():
+    batch = flatten_payload(_raw_page())
+    raw = {name: batch.raw_column(name) for name in TWEET_FIELDS}
+    restored = TweetBatch.from_columns(raw | {"like_count": [4, MISSING_INT]})
+    assert restored.to_rows() == batch.to_rows()
+    with pytest.raises(ValueError):
+        TweetBatch.from_columns({"id": ["1"]})
+    with pytest.raises(ValueError):
+        TweetBatch.from_columns(raw | {"id": ["1"]})
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: tests/test_parallel.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Unit tests for time-window slicing and the concurrent sliced search.
+
+Usage:
+pytest -q
+
+Notes:
+- The fake client pages one tweet per minute, with a duplicate on each boundary.
+===========================================================================
+"""
+from __future__ import annotations
+
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+
+from twitter_extractor.models import TweetBatch
+from twitter_extractor.parallel import parse_iso, search_sliced, split_window
+
+
+def test_split_window_is_contiguous():
+    windows = split_window("2026-01-01T00:00:00Z", "2026-01-01T01:00:00Z", 4)
+    assert windows[0] == ("2026-01-01T00:00:00Z", "2026-01-01T00:15:00Z")
+    assert windows[-1][1] == "2026-01-01T01:00:00Z"
+    assert all(a[1] == b[0] for a, b in zip(windows, windows[1:], strict=False))
+
+
+def tweet(t) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=int(t.timestamp()), created_at=t, text="", author_id=1, public_metrics={},
+        lang="en", conversation_id=1,
+    )
+
+
+class SliceClient:
+    """One tweet per minute, served newest first in pages of `page_size`."""
+
+    def __init__(self, page_size: int = 100):
+        self.page_size = page_size
+        self.served = 0
+
+    def search(self, *, start_time, end_time, **kwargs):
+        start, end = parse_iso(start_time), parse_iso(end_time)
+        minutes = int((end - start).total_seconds() // 60)
+        # The tweet at `end` belongs to the next slice; recent search can repeat it.
+        times = [end] + [start + timedelta(minutes=m) for m in reversed(range(minutes))]
+        for i in range(0, len(times), self.page_size):
+            self.served += 1
+            yield SimpleNamespace(
+                data=[tweet(t) for t in times[i:i + self.page_size]], includes={}, meta={}
+            )
+
+
+def test_search_sliced_merges_newest_first_without_duplicates():
+    batches = list(search_sliced(
+        SliceClient(page_size=4), "q", start_time="2026-01-01T00:00:00Z",
+        end_time="2026-01-01T00:40:00Z", slices=4, workers=4,
+    ))
+    assert all(isinstance(b, TweetBatch) and len(b) <= 4 for b in batches)
+    ids = [int(i) for b in batches for i in b.raw_column("id")]
+    assert ids == sorted(ids, reverse=True)
+    assert len(ids) == len(set(ids)) == 40
+
+
+def test_search_sliced_prefetches_a_bounded_number_of_pages():
+    client = SliceClient(page_size=1)
+    batches = search_sliced(
+        client, "q", start_time="2026-01-01T00:00:00Z", end_time="2026-01-02T00:00:00Z",
+        slices=4, workers=4, prefetch_pages=3,
+    )
+    next(batches)
+    time.sleep(0.3)  # let every slice fill its queue
+    # Per slice: 3 queued, 1 waiting to be queued and 1 handed out; not all 1,444 pages.
+    assert client.served <= 4 * (3 + 2)
+    batches.close()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: tests/test_pipeline.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Unit tests for the extraction pipeline, checkpoint/resume and since_id polling.
+
+Usage:
+pytest -q
+
+Notes:
+- Uses a fake paginator that fails at a chosen page to simulate interruptions.
+===========================================================================
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from twitter_extractor.cli import main
+from twitter_extractor.io_utils import open_sink
+from twitter_extractor.pipeline import extract, extract_since, follow, next_poll_interval
+from twitter_extractor.state import CheckpointStore, HighWaterMarkStore
+
+
+def _page(n: int, per_page: int = 3, last: int = 4) -> SimpleNamespace:
+    ids = [1000 - n * per_page - i for i in range(per_page)]
+    data = [
+        SimpleNamespace(id=i, text=f"t{i}", created_at=None, author_id=1, public_metrics={},
+                        lang="en", conversation_id=i)
+        for i in ids
+    ]
+    meta = {"newest_id": str(ids[0]), "oldest_id": str(ids[-1])}
+    if n < last:
+        meta["next_token"] = f"tok{n + 1}"
+    return SimpleNamespace(data=data, includes={}, meta=meta)
+
+
+class FakeClient:
+    """Serves pages 0..4; raises when asked for page `fail_at`."""
+
+    def __init__(self, fail_at: int | None = None):
+        self.fail_at = fail_at
+        self.requested = []
+
+    def search(self, *, pagination_token=None, limit_pages=None, **kwargs):
+        n = int(pagination_token[3:]) if pagination_token else 0
+        fetched = 0
+        while True:
+            if n == self.fail_at:
+                raise ConnectionError("boom")
+            self.requested.append(n)
+            page = _page(n)
+            yield page
+            fetched += 1
+            if "next_token" not in page.meta or (limit_pages and fetched >= limit_pages):
+                return
+            n += 1
+
+
+def test_resume_after_failure_does_not_refetch_or_duplicate(tmp_path: Path):
+    out = tmp_path / "out.csv"
+    store = CheckpointStore(tmp_path / "cp.json")
+
+    with pytest.raises(ConnectionError):
+        with open_sink(out) as sink:
+            extract(FakeClient(fail_at=3), sink, query="q", checkpoints=store)
+
+    cp = CheckpointStore(tmp_path / "cp.json").get("q")
+    assert cp.pages == 3 and cp.next_token == "tok3" and not cp.done
+    assert cp.out == str(out)
+    assert cp.newest_id == "1000" and cp.oldest_id == "992"
+
+    client = FakeClient()
+    with open_sink(out, append=True) as sink:
+        cp = extract(client, sink, query="q", checkpoints=store, resume_from=cp)
+
+    assert client.requested == [3, 4]
+    assert cp.done and cp.rows_written == 15
+    df = pd.read_csv(out)
+    assert len(df) == 15
+    assert df["id"].is_unique
+
+
+def test_limit_pages_counts_pages_already_fetched(tmp_path: Path):
+    store = CheckpointStore(tmp_path / "cp.json")
+    with open_sink(tmp_path / "out.jsonl") as sink:
+        cp = extract(FakeClient(), sink, query="q", limit_pages=2, checkpoints=store)
+    assert cp.pages == 2 and not cp.done
+
+    client = FakeClient()
+    with open_sink(tmp_path / "out.jsonl", append=True) as sink:
+        cp = extract(client, sink, query="q", limit_pages=2, resume_from=cp)
+    assert client.requested == []
+
+
+def test_resume_never_truncates_an_output_it_cannot_continue(tmp_path: Path, capsys):
+    store = CheckpointStore(tmp_path / ".checkpoints.json")
+    parquet, other = tmp_path / "t.parquet", tmp_path / "other.csv"
+    with open_sink(parquet) as sink:
+        extract(FakeClient(fail_at=2), sink, query="q", checkpoints=store, limit_pages=2)
+    size = parquet.stat().st_size
+    other.write_text("unrelated\n", encoding="utf-8")
+
+    with patch("twitter_extractor.cli._make_client", return_value=FakeClient()):
+        assert main(["q", "--out", str(parquet), "--resume"]) == 2
+        assert "does not support appending" in capsys.readouterr().err
+        assert main(["q", "--out", str(other), "--resume"]) == 2
+    assert f"was written to {parquet}, not {other}" in capsys.readouterr().err
+    assert parquet.stat().st_size == size and len(pd.read_parquet(parquet)) == 6
+    assert other.read_text(encoding="utf-8") == "unrelated\n"
+
+
+def test_should_stop_ends_after_current_page(tmp_path: Path):
+    seen = []
+    with open_sink(tmp_path / "out.csv") as sink:
+        cp = extract(
+            FakeClient(),
+            sink,
+            query="q",
+            on_page=lambda cp: seen.append(cp.pages),
+            should_stop=lambda: len(seen) >= 2,
+        )
+    assert seen == [1, 2]
+    assert cp.rows_written == 6 and cp.next_token == "tok2" and not cp.done
+
+
+class GrowingClient:
+    """Recent search over a growing timeline that honours since_id."""
+
+    def __init__(self):
+        self.newest = 0
+        self.since_ids = []
+
+    def search(self, *, since_id=None, **kwargs):
+        self.since_ids.append(since_id)
+        ids = [i for i in range(self.newest, 0, -1) if since_id is None or i > int(since_id)]
+        if ids:
+            data = [
+                SimpleNamespace(id=i, text="", created_at=None, author_id=1, public_metrics={},
+                                lang="en", conversation_id=i)
+                for i in ids
+            ]
+            yield SimpleNamespace(data=data, includes={}, meta={"newest_id": str(ids[0])})
+
+
+def test_incremental_runs_append_only_new_tweets(tmp_path: Path):
+    out = tmp_path / "out.csv"
+    marks = HighWaterMarkStore(tmp_path / "since.json")
+    client = GrowingClient()
+
+    client.newest = 3
+    with open_sink(out, append=True) as sink:
+        extract_since(client, sink, marks, query="q")
+    client.newest = 5
+    with open_sink(out, append=True) as sink:
+        cp = extract_since(client, sink, marks, query="q")
+
+    assert client.since_ids == [None, "3"]
+    assert cp.rows_written == 2
+    assert HighWaterMarkStore(tmp_path / "since.json").get("q") == "5"
+    assert list(pd.read_csv(out)["id"]) == [3, 2, 1, 5, 4]
+
+
+class PagedTimeline(GrowingClient):
+    """GrowingClient that also pages (2 tweets per page) and honours until_id."""
+
+    def search(self, *, since_id=None, until_id=None, pagination_token=None,
+               limit_pages=None, **kwargs):
+        self.since_ids.append((since_id, until_id))
+        ids = [i for i in range(self.newest, 0, -1)
+               if (since_id is None or i > int(since_id))
+               and (until_id is None or i < int(until_id))]
+        start = int(pagination_token or 0)
+        for n, i in enumerate(range(start, len(ids), 2)):
+            if limit_pages and n >= limit_pages:
+                return
+            page = ids[i:i + 2]
+            meta = {"newest_id": str(page[0]), "oldest_id": str(page[-1])}
+            if i + 2 < len(ids):
+                meta["next_token"] = str(i + 2)
+            data = [SimpleNamespace(id=t, text="", created_at=None, author_id=1,
+                                    public_metrics={}, lang="en", conversation_id=t)
+                    for t in page]
+            yield SimpleNamespace(data=data, includes={}, meta=meta)
+
+
+def test_incremental_page_limit_continues_without_duplicates(tmp_path: Path):
+    out = tmp_path / "out.csv"
+    client, marks_path = PagedTimeline(), tmp_path / "since.json"
+    client.newest = 10
+    done = []
+    for newest in (10, 12, 12, 12):
+        client.newest = newest  # tweets keep arriving between runs
+        with open_sink(out, append=True) as sink:
+            done.append(extract_since(
+                client, sink, HighWaterMarkStore(marks_path), query="q", limit_pages=2
+            ).done)
+
+    assert done == [False, False, True, True]
+    assert client.since_ids == [(None, None), (None, "7"), (None, "3"), ("10", None)]
+    assert list(pd.read_csv(out)["id"]) == [10, 9, 8, 7, 6, 5, 4, 3, 2, 1, 12, 11]
+    marks = HighWaterMarkStore(marks_path)
+    assert marks.get("q") == "12" and marks.pending("q") is None
+
+
+def test_follow_backs_off_when_quiet(tmp_path: Path):
+    client = GrowingClient()
+    client.newest = 2
+    slept = []
+    with open_sink(tmp_path / "out.jsonl") as sink:
+        total = follow(
+            client, sink, HighWaterMarkStore(tmp_path / "since.json"), query="q",
+            min_interval=10, max_interval=30, max_polls=4, sleep=slept.append,
+        )
+    assert total == 2
+    assert slept == [10, 20, 30]
+    assert next_poll_interval(30, 5, min_interval=10, max_interval=30) == 15
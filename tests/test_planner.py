@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: tests/test_planner.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Unit tests for the counts-driven planner, its CLI flags and the GUI preview worker.
+
+Usage:
+pytest -q
+
+Notes:
+- A stub client answers the counts endpoint with a fixed hourly histogram.
+===========================================================================
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from twitter_extractor.api import TwitterClient
+from twitter_extractor.cli import main
+from twitter_extractor.gui.worker import PlanWorker
+from twitter_extractor.planner import (
+    balanced_windows,
+    estimate_seconds,
+    format_plan,
+    plan_extraction,
+    volume_histogram,
+)
+
+START = datetime(2026, 10, 17, 0, tzinfo=timezone.utc)
+HOURLY = [0, 0, 250, 40, 5, 0, 120, 300, 0, 35]  # tweets per hour from START
+
+
+def counts_payload(hourly=HOURLY) -> dict:
+    fmt = "%Y-%m-%dT%H:%M:%S.000Z"
+    data = [
+        {"start": (START + timedelta(hours=h)).strftime(fmt),
+         "end": (START + timedelta(hours=h + 1)).strftime(fmt), "tweet_count": n}
+        for h, n in enumerate(hourly)
+    ]
+    return {"data": data, "meta": {"total_tweet_count": sum(hourly)}}
+
+
+class StubClient:
+    """Counts from `counts_payload`; every search page serves two tweets."""
+
+    scheduler = None
+    cache = None
+
+    def __init__(self, *args, **kwargs):
+        self.counted = []
+        self.searches = []
+
+    def counts(self, query, *, start_time=None, end_time=None):
+        self.counted.append((query, start_time, end_time))
+        return counts_payload()
+
+    def search(self, *, query, start_time=None, end_time=None, limit_pages=None, **kwargs):
+        self.searches.append((start_time, end_time, limit_pages))
+        for n in range(limit_pages):
+            data = [{"id": f"{start_time[11:13]}{n}{i}", "text": "t", "author_id": "1"}
+                    for i in range(2)]
+            yield {"data": data, "meta": {"next_token": f"p{n + 1}"}}
+
+
+def test_histogram_accepts_raw_and_tweepy_responses():
+    raw = counts_payload()
+    assert [b.tweets for b in volume_histogram(raw)] == HOURLY
+    parsed = SimpleNamespace(data=list(reversed(raw["data"])))
+    assert volume_histogram(parsed)[0].start == START
+
+
+def test_balanced_windows_split_volume_on_hour_boundaries():
+    buckets = volume_histogram(counts_payload())
+    end = START + timedelta(hours=len(HOURLY))
+    windows = balanced_windows(buckets, 3, start=START, end=end, max_results=100)
+    # The 300-tweet hour cannot be split, so the middle window runs long.
+    assert [w.tweets for w in windows] == [250, 465, 35]
+    assert [w.pages for w in windows] == [3, 5, 1]
+    assert windows[0].start == START and windows[-1].end == end
+    assert all(a.end == b.start for a, b in zip(windows, windows[1:], strict=False))
+    assert sum(w.tweets for w in balanced_windows(buckets, 50, start=START, end=end)) == 750
+
+
+def test_estimate_switches_to_rate_limit_windows():
+    assert estimate_seconds(0) == 0
+    assert estimate_seconds(100, latency=0.5) == 50
+    assert estimate_seconds(100, latency=0.5, parallel=4) == 12.5
+    # 1,000 requests at 450/15 min: two full windows of waiting, then 100 more requests.
+    assert estimate_seconds(1000, latency=0.5) == 2 * 900 + 50
+    assert estimate_seconds(1000, latency=0.5, tokens=3) == 500
+
+
+def test_plan_extraction_pins_window_and_budgets_pages():
+    client = StubClient()
+    now = START + timedelta(hours=10, seconds=45)
+    plan = plan_extraction(client, "python", max_results=50, slices=2, workers=2, now=now)
+    assert client.counted == [("python", "2026-10-10T10:01:45Z", "2026-10-17T10:00:15Z")]
+    assert plan.total_tweets == 750
+    assert [w.tweets for w in plan.windows] == [415, 335]
+    assert (plan.requests, plan.max_pages) == (9 + 7, 9)
+    assert plan.start_time == "2026-10-10T10:01:45Z"
+    text = format_plan(plan)
+    assert "750 tweets -> 16 requests of 50" in text
+    assert "2026-10-17  " in text and "Sub-windows (2)" in text
+
+
+def test_cli_dry_run_and_plan(tmp_path: Path, capsys):
+    out = tmp_path / "t.csv"
+    base = ["python", "--out", str(out), "--start-time", "2026-10-17T00:00:00Z",
+            "--end-time", "2026-10-17T10:00:00Z"]
+    stub = StubClient()
+    with patch("twitter_extractor.cli._make_client", return_value=stub):
+        assert main(base + ["--dry-run"]) == 0
+    assert not out.exists() and not stub.searches
+    assert "750 tweets -> 8 requests of 100" in capsys.readouterr().out
+
+    stub = StubClient()
+    with patch("twitter_extractor.cli._make_client", return_value=stub):
+        assert main(base + ["--plan", "--slices", "2"]) == 0
+    assert stub.searches == [
+        ("2026-10-17T07:00:00Z", "2026-10-17T10:00:00Z", 5),
+        ("2026-10-17T00:00:00Z", "2026-10-17T07:00:00Z", 5),
+    ]
+    assert len(pd.read_csv(out)) == 20
+
+    with pytest.raises(SystemExit):
+        main(["--queries-file", "q.txt", "--plan"])
+
+
+@patch("twitter_extractor.api.load_credentials")
+def test_client_counts_routes_recent_counts(mock_load):
+    mock_load.return_value = type("C", (), {"bearer_token": "BT"})()
+    client = TwitterClient()
+    calls = []
+    client.scheduler = SimpleNamespace(method=lambda ep: lambda **kw: calls.append((ep, kw)))
+    client.counts("python", start_time="2026-10-17T00:00:00Z")
+    assert calls == [("get_recent_tweets_count", {
+        "query": "python", "start_time": "2026-10-17T00:00:00Z", "end_time": None,
+        "granularity": "hour"})]
+
+
+def test_plan_worker_reports_plan():
+    worker = PlanWorker(
+        {"query": "python", "start_time": "2026-10-17T00:00:00Z",
+         "end_time": "2026-10-17T10:00:00Z", "max_results": 100},
+        client_factory=StubClient,
+    )
+    worker.start()
+    kind, data = worker.events.get(timeout=5)
+    assert kind == "plan" and data["plan"].requests == 8
+    assert data["text"].startswith("Plan for 'python'")
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: tests/test_ratelimit.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Unit tests for the multi-token rate-limit scheduler.
+
+Usage:
+pytest -q
+
+Notes:
+- Fake clients fire requests-style response hooks with x-rate-limit-* headers.
+===========================================================================
+"""
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import tweepy
+
+from twitter_extractor.ratelimit import TokenScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class FakeClient:
+    def __init__(self, name: str, clock: FakeClock, remaining: int, limit: int = 450):
+        self.name = name
+        self.clock = clock
+        self.remaining = remaining
+        self.limit = limit
+        self.reset_at = clock.now + 60
+        self.session = SimpleNamespace(hooks={"response": []})
+
+    def search_recent_tweets(self, **kwargs):
+        if self.clock.now >= self.reset_at:
+            self.remaining, self.reset_at = self.limit, self.clock.now + 900
+        headers = {
+            "x-rate-limit-limit": str(self.limit),
+            "x-rate-limit-remaining": str(max(self.remaining - 1, 0)),
+            "x-rate-limit-reset": str(int(self.reset_at)),
+        }
+        response = SimpleNamespace(headers=headers, status_code=200 if self.remaining else 429)
+        for hook in self.session.hooks["response"]:
+            hook(response)
+        if not self.remaining:
+            raise tweepy.TooManyRequests(MagicMock(headers=headers, status_code=429))
+        self.remaining -= 1
+        return self.name
+
+
+def test_routes_to_token_with_most_budget_and_waits_only_when_all_exhausted():
+    clock = FakeClock()
+    a, b = FakeClient("a", clock, remaining=1), FakeClient("b", clock, remaining=3)
+    waits = []
+    sched = TokenScheduler([a, b], clock=clock, sleep=clock.sleep, on_wait=waits.append)
+    search = sched.method("search_recent_tweets")
+    assert search.__name__ == "search_recent_tweets"
+
+    served = [search(query="q") for _ in range(4)]
+    # First two calls learn each token's budget; afterwards "b" has more left.
+    assert served == ["a", "b", "b", "b"]
+    assert clock.slept == []
+
+    assert search(query="q") == "a"  # both exhausted: sleep until the earliest reset
+    assert len(clock.slept) == 1 and waits == clock.slept
+    stats = sched.stats()
+    assert stats["waits"] == 1 and stats["queue_wait_seconds"] > 0
+    assert stats["tokens"]["token-2"]["requests"] == 3
+
+
+def test_429_is_retried_on_another_token():
+    clock = FakeClock()
+    a, b = FakeClient("a", clock, remaining=0), FakeClient("b", clock, remaining=5)
+    sched = TokenScheduler([a, b], clock=clock, sleep=clock.sleep)
+    assert sched.call("search_recent_tweets", query="q") == "b"
+    assert sched.stats()["tokens"]["token-1"]["rate_limited"] == 1
+    assert clock.slept == []
+
+
+def test_metrics_record_requests_retries_and_sleeps():
+    from twitter_extractor.metrics import Metrics
+
+    clock = FakeClock()
+    metrics = Metrics()
+    a = FakeClient("a", clock, remaining=0)
+    sched = TokenScheduler([a], clock=clock, sleep=clock.sleep, metrics=metrics)
+    assert sched.call("search_recent_tweets", query="q") == "a"
+    snap = metrics.snapshot()
+    assert snap["counters"]["retries"] == 1 and snap["counters"]["requests"] == 1
+    assert snap["counters"]["rate_limit_sleeps"] == 1
+    assert snap["stages"]["api"]["calls"] == 2 and "rate_limit_sleep" in snap["stages"]
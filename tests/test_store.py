@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: tests/test_store.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Unit tests for the SQLite tweet store, its sink and the CLI export.
+
+Usage:
+pytest -q
+
+Notes:
+- Overlapping writes must never duplicate a tweet id.
+===========================================================================
+"""
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from twitter_extractor.cli import main
+from twitter_extractor.io_utils import open_sink
+from twitter_extractor.models import TweetRow
+from twitter_extractor.store import TweetStore
+
+BASE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _row(i: int, likes: int = 0, author: str = "1") -> TweetRow:
+    return TweetRow(str(i), BASE + timedelta(hours=i), f"t{i}", author, likes, 0, 0, 0, "en", "c1")
+
+
+def test_upsert_deduplicates_and_refreshes_metrics(tmp_path: Path):
+    with TweetStore(tmp_path / "t.db") as store:
+        store.upsert([_row(1), _row(2)])
+        store.upsert([_row(2, likes=9), _row(3)])
+        assert store.count() == 3
+        rows = [r for b in store.select() for r in b]
+    assert [r.id for r in rows] == ["3", "2", "1"]  # newest first
+    assert rows[1].like_count == 9 and rows[1].created_at == BASE + timedelta(hours=2)
+
+
+def test_select_filters_use_window_and_author(tmp_path: Path):
+    with TweetStore(tmp_path / "t.db") as store:
+        store.upsert([_row(i, author="a" if i % 2 else "b") for i in range(10)])
+        window = store.select(start_time="2026-01-01T02:00:00Z", end_time="2026-01-01T05:00:00Z")
+        assert [r.id for b in window for r in b] == ["4", "3", "2"]
+        chunks = list(store.select(author_id="a", chunk_size=2))
+        assert [len(c) for c in chunks] == [2, 2, 1]
+
+
+def test_select_breaks_created_at_ties_by_numeric_id(tmp_path: Path):
+    rows = [_row(0), _row(0), _row(0)]
+    for row, tweet_id in zip(rows, ("999", "1000", "99"), strict=True):
+        row.id = tweet_id
+    with TweetStore(tmp_path / "t.db") as store:
+        store.upsert(rows)
+        assert [r.id for b in store.select() for r in b] == ["1000", "999", "99"]
+
+
+def test_db_sink_and_cli_export(tmp_path: Path):
+    db = tmp_path / "tweets.db"
+    for _ in range(2):  # the same run twice: still no duplicates
+        with open_sink(db, batch_size=3) as sink:
+            sink.write([_row(i) for i in range(5)])
+    out = tmp_path / "slice.jsonl"
+    argv = ["--export-from", str(db), "--out", str(out), "--start-time", "2026-01-01T03:00:00Z"]
+    assert main(argv) == 0
+    lines = [json.loads(ln) for ln in out.read_text(encoding="utf-8").splitlines()]
+    assert [ln["id"] for ln in lines] == ["4", "3"]
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: tests/test_stream.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Unit tests for the filtered-stream consumer: backoff, reconnects, drops, rules and --stream.
+
+Usage:
+pytest -q
+
+Notes:
+- `filter` is replaced by scripted connections, so no socket is opened.
+===========================================================================
+"""
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+import tweepy
+
+from twitter_extractor.cli import main, parse_args
+from twitter_extractor.io_utils import open_sink
+from twitter_extractor.stream import (
+    Backoff,
+    FilteredStream,
+    consume,
+    delete_rules,
+    ensure_rules,
+    list_rules,
+)
+
+FAST = Backoff(network=0.001, network_max=0.004, http=0.002, rate_limit=0.003, http_max=0.01)
+
+
+def line(i: int, tag: str = "python") -> bytes:
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+    return json.dumps({
+        "data": {"id": str(i), "text": f"t{i}", "author_id": str(i % 3), "created_at": now},
+        "includes": {"users": [{"id": str(i % 3), "username": f"u{i % 3}", "name": "U"}]},
+        "matching_rules": [{"id": "1", "tag": tag}],
+    }).encode()
+
+
+class ScriptedStream(FilteredStream):
+    """Each `filter` call plays the next connection: ("data", n) or a failure."""
+
+    def __init__(self, script, **kwargs):
+        super().__init__("token", backoff=FAST, **kwargs)
+        self.script = list(script)
+        self.sent = 0
+        self.rules = {}
+
+    def filter(self, **params):
+        if not self.script:
+            self._stopping.set()
+            return
+        kind, arg = self.script.pop(0)
+        if kind == "status":
+            return self.on_request_error(arg)
+        self.on_connect()
+        for _ in range(arg):
+            self.on_data(line(self.sent))
+            self.sent += 1
+        if kind == "closed":
+            self.on_closed(None)
+        elif kind == "error":
+            self.on_connection_error()
+
+    # rule endpoints, kept in memory
+    def get_rules(self, **params):
+        rules = [tweepy.StreamRule(v, t, i) for i, (v, t) in self.rules.items()]
+        return SimpleNamespace(data=rules)
+
+    def add_rules(self, add, **params):
+        added = []
+        for rule in add:
+            if "(" in rule.value:
+                return SimpleNamespace(data=None, errors=[{"value": rule.value, "title": "bad"}])
+            rule_id = str(len(self.rules) + 1)
+            self.rules[rule_id] = (rule.value, rule.tag)
+            added.append(tweepy.StreamRule(rule.value, rule.tag, rule_id))
+        return SimpleNamespace(data=added, errors=[])
+
+    def delete_rules(self, ids, **params):
+        for rule_id in ids:
+            self.rules.pop(rule_id, None)
+        return SimpleNamespace(data=None, errors=[], meta={"summary": {"deleted": len(ids)}})
+
+
+def test_backoff_grows_per_failure_kind_and_caps():
+    b = Backoff()
+    assert [b.delay("network", a) for a in (0, 1, 2, 10)] == [0.25, 0.5, 1.0, 16.0]
+    assert [b.delay("http", a) for a in (0, 1, 10)] == [5.0, 10.0, 320.0]
+    assert [b.delay("rate_limit", a) for a in (0, 1, 3)] == [60.0, 120.0, 320.0]
+
+
+def test_run_reconnects_until_the_script_ends(tmp_path: Path):
+    stream = ScriptedStream(
+        [("closed", 30), ("status", 503), ("status", 429), ("error", 20), ("closed", 50)]
+    )
+    stream.start()
+    with open_sink(tmp_path / "t.csv") as sink:
+        stats = consume(stream, sink, batch_size=16, flush_seconds=0.05)
+    stream.stop()
+    assert stream.finished.is_set() and stream.error is None
+    assert (stats.received, stats.written, stats.dropped) == (100, 100, 0)
+    assert stats.reconnects == 5 and stats.errors == 3
+    df = pd.read_csv(tmp_path / "t.csv", dtype={"id": str})
+    assert df["id"].tolist() == [str(i) for i in range(100)]
+    assert set(df["query"]) == {"python"} and set(df["username"]) == {"u0", "u1", "u2"}
+    assert 0 <= stats.max_lag < 60
+
+
+def test_fatal_status_and_reconnect_cap_stop_the_stream():
+    stream = ScriptedStream([("status", 401), ("closed", 1)])
+    stream.run()
+    assert "HTTP 401" in str(stream.error) and stream.stats.reconnects == 0
+
+    stream = ScriptedStream([("closed", 1)] * 5, max_reconnects=2)
+    stream.run()
+    assert "after 2 reconnects" in str(stream.error) and stream.sent == 3
+
+
+def test_full_queue_drops_instead_of_blocking(tmp_path: Path):
+    stream = ScriptedStream([("closed", 50)], max_queue=10)
+    stream.run()  # nobody consumes while the connection delivers
+    assert (stream.stats.received, stream.stats.dropped, stream.stats.max_queue) == (50, 40, 10)
+    with open_sink(tmp_path / "t.jsonl") as sink:
+        stats = consume(stream, sink, flush_seconds=0.01)
+    assert stats.written == 10
+
+
+def test_consume_stops_at_limit_and_flushes_on_time(tmp_path: Path):
+    stream = ScriptedStream([("data", 25)])
+    stream.run()
+    flushes = []
+    with open_sink(tmp_path / "t.jsonl") as sink:
+        stats = consume(stream, sink, batch_size=100, limit=7, flush_seconds=0,
+                        on_flush=lambda s: flushes.append(s.written))
+    assert stats.written == 7 and flushes and flushes[-1] <= 7
+    assert len((tmp_path / "t.jsonl").read_text(encoding="utf-8").splitlines()) == 7
+
+
+def test_consume_skips_malformed_lines(tmp_path: Path):
+    stream = ScriptedStream([("data", 3)])
+    stream.run()
+    stream.queue.put(b'{"data": {"id": "9", "te')  # cut off mid-line
+    stream.queue.put(b"\xff not json")
+    stream.queue.put(b"[]")
+    stream.queue.put(line(10))
+    with open_sink(tmp_path / "t.jsonl") as sink:
+        stats = consume(stream, sink, flush_seconds=0.01)
+    assert stats.written == 4 and stats.errors == 3
+    ids = [json.loads(r)["id"] for r in (tmp_path / "t.jsonl").read_text("utf-8").splitlines()]
+    assert ids == ["0", "1", "2", "10"]
+
+
+def test_rule_helpers():
+    stream = ScriptedStream([])
+    added = ensure_rules(stream, ["python", "rust", "python"])
+    assert [r.value for r in added] == ["python", "rust"]
+    assert ensure_rules(stream, ["rust"]) == []
+    assert {(r.value, r.tag) for r in list_rules(stream)} == {("python", "python"),
+                                                              ("rust", "rust")}
+    with pytest.raises(ValueError, match=r"could not add stream rules: bad \(: bad"):
+        ensure_rules(stream, ["bad ("])
+    assert delete_rules(stream, ["1"]) == 1
+    assert delete_rules(stream, ["all"]) == 1 and list_rules(stream) == []
+    assert delete_rules(stream, ["all"]) == 0
+
+
+def test_cli_stream_and_rule_flags(tmp_path: Path, capsys):
+    stream = ScriptedStream([("closed", 40), ("data", 40)])
+    out = tmp_path / "live.jsonl"
+    argv = ["python lang:en", "--stream", "--out", str(out), "--stream-limit", "60",
+            "--stream-flush", "0.05", "--aggregate", str(tmp_path / "summary.json")]
+    with patch("twitter_extractor.cli._make_stream", return_value=stream):
+        assert main(argv) == 0
+    printed = capsys.readouterr().out
+    assert "Added stream rule 1: python lang:en" in printed
+    assert f"Streamed 60 rows to {out} (dropped 0, reconnects" in printed
+    assert len(out.read_text(encoding="utf-8").splitlines()) == 60
+    assert json.loads((tmp_path / "summary.json").read_text(encoding="utf-8"))["tweets"] == 60
+
+    with patch("twitter_extractor.cli._make_stream", return_value=stream):
+        assert main(["--add-rule", "rust", "--delete-rule", "1", "--list-rules"]) == 0
+    assert capsys.readouterr().out.splitlines() == [
+        "Deleted 1 stream rules", "Added stream rule 1: rust", "1\trust\trust"
+    ]
+
+    for bad in (["q", "--list-rules"], ["q", "--stream", "--resume"],
+                ["--stream", "--queries-file", "q.txt"], ["--stream", "--stream-queue", "0"]):
+        with pytest.raises(SystemExit):
+            parse_args(bad)
+    assert parse_args(["--stream"]).query is None  # streams the rules already active
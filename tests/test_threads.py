@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: tests/test_threads.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Unit tests for thread assembly: ordering, bounded eviction, member fetching and nested export.
+
+Usage:
+pytest -q
+
+Notes:
+- Conversation 100 is: 100 <- 101 <- 103, 100 <- 102; search serves the missing members.
+===========================================================================
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from twitter_extractor.cli import main
+from twitter_extractor.io_utils import open_sink
+from twitter_extractor.models import TweetBatch, TweetRow
+from twitter_extractor.threads import ThreadIndex, ThreadSink, conversation_queries
+from twitter_extractor.utils import flatten_payload
+
+CONVERSATION = {"100": None, "101": "100", "102": "100", "103": "101"}
+
+
+def tweet(tweet_id: str, conversation_id: str = "100", parent=None) -> TweetRow:
+    return TweetRow(tweet_id, None, f"t{tweet_id}", "1", 0, 0, 0, 0, "en", conversation_id,
+                    in_reply_to_id=parent)
+
+
+def raw(tweet_id: str) -> dict:
+    t = {"id": tweet_id, "text": f"t{tweet_id}", "author_id": "1", "conversation_id": "100"}
+    if CONVERSATION[tweet_id]:
+        t["referenced_tweets"] = [{"type": "quoted", "id": "9"},
+                                  {"type": "replied_to", "id": CONVERSATION[tweet_id]}]
+    return t
+
+
+class ThreadClient:
+    cache = None
+    scheduler = None
+
+    def __init__(self):
+        self.queries = []
+
+    def search(self, *, query, limit_pages=None, **kwargs):
+        self.queries.append(query)
+        if query.startswith("conversation_id:"):
+            yield {"data": [raw(i) for i in CONVERSATION], "meta": {}}
+            return
+        yield {"data": [raw("103"), raw("102")], "meta": {"next_token": "p1"}}
+
+
+def test_flatten_reads_replied_to_reference():
+    batch = flatten_payload({"data": [raw("100"), raw("103")]})
+    assert batch.column("in_reply_to_id") == [None, "101"]
+
+
+def test_index_orders_ids_and_deduplicates():
+    index = ThreadIndex()
+    index.add([tweet("103", parent="101"), tweet("100")])
+    index.add([tweet("101", parent="100"), tweet("103", parent="101"), tweet("7", "7")])
+    assert index.ordered_ids("100") == ["100", "101", "103"]
+    assert (len(index), index.tweets) == (2, 4)
+
+
+def test_index_evicts_least_recent_and_idle_conversations():
+    now = [0.0]
+    index = ThreadIndex(max_conversations=2, idle_seconds=60, clock=lambda: now[0])
+    assert index.add([tweet("1", "1"), tweet("2", "2")]) == []
+    index.add([tweet("11", "1")])  # conversation 1 is now the most recent
+    evicted = index.add([tweet("3", "3")])
+    assert [c.conversation_id for c in evicted] == ["2"]
+    now[0] = 61
+    assert [c.conversation_id for c in index.expire()] == ["1", "3"]
+    assert len(index) == index.tweets == 0
+
+
+def test_conversation_queries_batch_and_deduplicate():
+    ids = [str(10**18 + i) for i in range(30)] + [str(10**18)]
+    groups = list(conversation_queries(ids, max_chars=200))
+    assert sum(len(g) for g, _ in groups) == 30
+    assert all(len(q) <= 200 and q.count("conversation_id:") == len(g) for g, q in groups)
+
+
+def test_thread_sink_fetches_missing_members_and_nests(tmp_path: Path):
+    client = ThreadClient()
+    threads = tmp_path / "threads.jsonl"
+    with ThreadSink(open_sink(tmp_path / "t.csv"), threads, client=client) as sink:
+        sink.write(TweetBatch.from_rows([tweet("103", parent="101"), tweet("102", parent="100")]))
+        assert not threads.exists()  # written on close, renamed from .part
+    assert client.queries == ["conversation_id:100"]
+    (record,) = [json.loads(line) for line in threads.read_text(encoding="utf-8").splitlines()]
+    assert record["complete"] and record["tweet_ids"] == ["100", "101", "102", "103"]
+    root = record["root"]
+    assert [r["id"] for r in root["replies"]] == ["101", "102"]
+    assert root["replies"][0]["replies"][0]["id"] == "103"
+    assert record["detached"] == []
+    assert sink.stats.fetched == 2 and sink.rows_written == 2
+    assert len(pd.read_csv(tmp_path / "t.csv")) == 2  # the main output is unchanged
+
+
+def test_thread_sink_without_client_exports_partial_threads(tmp_path: Path):
+    threads = tmp_path / "threads.jsonl.gz"
+    with ThreadSink(open_sink(tmp_path / "t.csv"), threads, max_conversations=1) as sink:
+        sink.write([tweet("103", parent="101"), tweet("5", "5")])
+        sink.write([tweet("6", "6")])
+    records = pd.read_json(threads, lines=True)
+    assert list(records["conversation_id"]) == [100, 5, 6]
+    assert list(records["complete"]) == [False, True, True]
+
+    # A run that fails publishes neither the threads nor a compressed row file.
+    out = tmp_path / "failed.csv.gz"
+    with pytest.raises(ConnectionError):
+        with ThreadSink(open_sink(out), tmp_path / "failed.jsonl") as sink:
+            sink.write([tweet("5", "5")])
+            raise ConnectionError("boom")
+    assert not list(tmp_path.glob("failed*"))
+
+
+def test_cli_threads_with_fetch(tmp_path: Path, capsys):
+    threads = tmp_path / "threads.jsonl"
+    argv = ["python", "--out", str(tmp_path / "t.csv"), "--pages", "1",
+            "--threads", str(threads), "--fetch-threads"]
+    with patch("twitter_extractor.cli._make_client", return_value=ThreadClient()):
+        assert main(argv) == 0
+    assert json.loads(threads.read_text(encoding="utf-8"))["tweet_count"] == 4
+    assert "Threads: 1 conversations (1 complete, 4 tweets; 2 fetched" in capsys.readouterr().out
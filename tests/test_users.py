@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Twitter Extractor (Tweepy v2 — CLI & GUI)
+File: tests/test_users.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Unit tests for the author LRU cache and the includes["users"] join.
+
+Usage:
+pytest -q
+
+Notes:
+- Users are given both as attribute objects (tweepy.User) and as plain dicts.
+===========================================================================
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+
+from twitter_extractor.users import UserCache, user_index
+from twitter_extractor.utils import flatten_tweets
+
+
+def _tweet(i: int, author: int) -> SimpleNamespace:
+    return SimpleNamespace(id=i, text="t", created_at=None, author_id=author, public_metrics={},
+                           lang="en", conversation_id=i)
+
+
+def test_flatten_joins_authors_from_includes():
+    includes = {"users": [SimpleNamespace(id=1, username="ada", name="Ada L."),
+                          {"id": "2", "username": "bob", "name": "Bob"}]}
+    rows = flatten_tweets([_tweet(10, 1), _tweet(11, 2), _tweet(12, 3)], includes=includes)
+    assert [(r.username, r.name) for r in rows] == [("ada", "Ada L."), ("bob", "Bob"), (None, None)]
+    batch = flatten_tweets([_tweet(10, 1)], includes=includes, as_batch=True)
+    assert batch.column("username") == ["ada"]
+
+
+def test_cache_serves_repeat_authors_across_pages_and_counts_hits():
+    users = UserCache(capacity=10)
+    includes = {"users": [{"id": 1, "username": "ada", "name": "Ada"}]}
+    flatten_tweets([_tweet(1, 1), _tweet(2, 1)], includes=includes, users=users)
+    # Second page without includes: the author is still resolved from the cache.
+    rows = flatten_tweets([_tweet(3, 1)], includes={}, users=users)
+    assert rows[0].username == "ada"
+    assert users.stats()["hits"] == 2 and users.stats()["misses"] == 1
+    assert users.stats()["hit_rate"] == round(2 / 3, 4)
+
+
+def test_lru_eviction_and_persistence(tmp_path: Path):
+    path = tmp_path / "users.json"
+    users = UserCache(capacity=2, path=path)
+    page = user_index({"users": [{"id": i, "username": f"u{i}", "name": None} for i in (1, 2, 3)]})
+    users.resolve("1", page)
+    users.resolve("2", page)
+    users.resolve("1", page)  # 1 is now most recent
+    users.resolve("3", page)  # evicts 2
+    assert users.stats()["evictions"] == 1
+    users.save()
+
+    reloaded = UserCache(capacity=2, path=path)
+    assert len(reloaded) == 2
+    assert reloaded.resolve("1", {}) == ("u1", None)
+    assert reloaded.resolve("2", {}) is None